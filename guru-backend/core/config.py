@@ -6,6 +6,7 @@ This allows OpenWebUI to serve as Guru's native backend.
 """
 
 import logging
+import os
 from typing import Optional
 
 log = logging.getLogger(__name__)
@@ -111,12 +112,17 @@ class GuruBackendConfig:
     
     # Model configuration
     DEFAULT_REASONING_MODEL = "phi-3-mini"
-    DEFAULT_EMBEDDING_MODEL = "phi-3-mini"
+    DEFAULT_EMBEDDING_MODEL = os.getenv("GURU_EMBEDDING_MODEL", "phi-3-mini")
     FALLBACK_MODEL = "tinyllama"
     
     # Vector DB configuration
     VECTOR_DB_TYPE = "chroma"  # Options: chroma, qdrant, milvus, weaviate, pinecone
-    VECTOR_DB_PATH = "/data/chroma"
+    VECTOR_DB_PATH = os.getenv("GURU_VECTOR_DB_PATH", "/data/chroma")
+    
+    # OpenAI-compatible embedding endpoint (e.g. Ollama's http://localhost:11434/v1),
+    # used when Guru runs standalone instead of inside Open WebUI
+    EMBEDDING_URL = os.getenv("GURU_EMBEDDING_URL", "")
+    EMBEDDING_API_KEY = os.getenv("GURU_EMBEDDING_API_KEY", "")
     
     # Privacy & Ownership
     REQUIRE_CONSENT_FOR_UPLOADS = True
@@ -127,6 +133,23 @@ class GuruBackendConfig:
     INFERENCE_TIMEOUT_SECONDS = 30
     INFERENCE_BATCH_SIZE = 5
     
+    # Retrieval pipeline scheduling
+    RETRIEVAL_STAGE_TIMEOUT_SECONDS = 10.0  # Hard cap per agent stage
+    RETRIEVAL_SOURCE_TIMEOUT_SECONDS = 5.0  # Slow sources degrade to partial results
+    RETRIEVAL_MAX_CONCURRENCY = 4  # Parallel lookups per stage
+    
+    # Mentor loop session storage
+    SESSION_STORE = os.getenv("GURU_SESSION_STORE", "memory")  # Options: memory, sqlite, redis
+    SESSION_STORE_PATH = os.getenv("GURU_SESSION_STORE_PATH", "/data/guru_sessions.db")
+    SESSION_REDIS_URL = os.getenv("GURU_SESSION_REDIS_URL", "redis://localhost:6379/0")
+    SESSION_TTL_SECONDS = int(os.getenv("GURU_SESSION_TTL_SECONDS", "86400"))
+    SESSION_MAX_IN_MEMORY = int(os.getenv("GURU_SESSION_MAX_IN_MEMORY", "10000"))
+    
+    # Vector indexing of completed sessions (backward retrieval)
+    SESSION_INDEX_COLLECTION = "guru-mentor-sessions"
+    SESSION_INDEX_BATCH_SIZE = 32  # Sessions embedded per batch
+    SESSION_INDEX_FLUSH_SECONDS = 2.0  # Max wait before a partial batch is indexed
+    
     @classmethod
     def to_dict(cls) -> dict:
         """Export config as dictionary."""
@@ -140,11 +163,22 @@ class GuruBackendConfig:
             "FALLBACK_MODEL": cls.FALLBACK_MODEL,
             "VECTOR_DB_TYPE": cls.VECTOR_DB_TYPE,
             "VECTOR_DB_PATH": cls.VECTOR_DB_PATH,
+            "EMBEDDING_URL": cls.EMBEDDING_URL,
             "REQUIRE_CONSENT_FOR_UPLOADS": cls.REQUIRE_CONSENT_FOR_UPLOADS,
             "BLOCK_EXTERNAL_API_CALLS": cls.BLOCK_EXTERNAL_API_CALLS,
             "MAX_TOKENS_PER_SESSION": cls.MAX_TOKENS_PER_SESSION,
             "INFERENCE_TIMEOUT_SECONDS": cls.INFERENCE_TIMEOUT_SECONDS,
             "INFERENCE_BATCH_SIZE": cls.INFERENCE_BATCH_SIZE,
+            "RETRIEVAL_STAGE_TIMEOUT_SECONDS": cls.RETRIEVAL_STAGE_TIMEOUT_SECONDS,
+            "RETRIEVAL_SOURCE_TIMEOUT_SECONDS": cls.RETRIEVAL_SOURCE_TIMEOUT_SECONDS,
+            "RETRIEVAL_MAX_CONCURRENCY": cls.RETRIEVAL_MAX_CONCURRENCY,
+            "SESSION_STORE": cls.SESSION_STORE,
+            "SESSION_STORE_PATH": cls.SESSION_STORE_PATH,
+            "SESSION_TTL_SECONDS": cls.SESSION_TTL_SECONDS,
+            "SESSION_MAX_IN_MEMORY": cls.SESSION_MAX_IN_MEMORY,
+            "SESSION_INDEX_COLLECTION": cls.SESSION_INDEX_COLLECTION,
+            "SESSION_INDEX_BATCH_SIZE": cls.SESSION_INDEX_BATCH_SIZE,
+            "SESSION_INDEX_FLUSH_SECONDS": cls.SESSION_INDEX_FLUSH_SECONDS,
         }
 
 
@@ -170,6 +204,13 @@ def initialize_guru_backend(app):
     # Inject services
     inject_guru_services(app)
     
+    # Index completed mentor sessions with Open WebUI's embedding function
+    try:
+        from guru_backend.core.mentor_loop import initialize_mentor_loop
+        initialize_mentor_loop(app)
+    except ImportError as e:
+        log.warning(f"Mentor loop not available: {e}")
+    
     # Log config
     log.info("Configuration:")
     for key, value in GuruBackendConfig.to_dict().items():
@@ -15,9 +15,16 @@ Integrates with OpenWebUI's RAG pipeline for history retrieval.
 import logging
 from typing import Dict, List, Any, Optional
 from enum import Enum
-import json
 from datetime import datetime
 
+from core.config import GuruBackendConfig
+from core.session_store import SessionStore, create_session_store
+from core.session_indexer import (
+    ChromaSessionVectorClient,
+    SessionIndexer,
+    create_endpoint_embedding_function,
+)
+
 log = logging.getLogger(__name__)
 
 
@@ -34,6 +41,12 @@ class MentorStage(str, Enum):
 class DiagnosticSession:
     """Represents a single user diagnostic session."""
     
+    __slots__ = (
+        "session_id", "user_id", "domain", "stage", "created_at", "updated_at",
+        "observation", "baseline", "questions", "answers", "frame", "guidance",
+        "reflection", "past_problems", "relevant_docs", "model_reasoning",
+    )
+    
     def __init__(self, session_id: str, user_id: str, domain: str):
         self.session_id = session_id
         self.user_id = user_id
@@ -55,6 +68,26 @@ class DiagnosticSession:
         self.past_problems: List[Dict] = []
         self.relevant_docs: List[Dict] = []
         self.model_reasoning: Dict[str, Any] = {}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-safe dict for the session store."""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["stage"] = self.stage.value
+        data["created_at"] = self.created_at.isoformat()
+        data["updated_at"] = self.updated_at.isoformat()
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DiagnosticSession":
+        """Rebuild a session from DiagnosticSession.to_dict() output."""
+        session = cls(data["session_id"], data["user_id"], data["domain"])
+        for name in cls.__slots__:
+            if name in data:
+                setattr(session, name, data[name])
+        session.stage = MentorStage(data.get("stage", MentorStage.OBSERVE))
+        session.created_at = datetime.fromisoformat(data["created_at"])
+        session.updated_at = datetime.fromisoformat(data["updated_at"])
+        return session
 
 
 class MentorLoopOrchestrator:
@@ -71,7 +104,9 @@ class MentorLoopOrchestrator:
     def __init__(self, 
                  diagnostic_service=None,
                  retrieval_service=None,
-                 model_service=None):
+                 model_service=None,
+                 session_store: Optional[SessionStore] = None,
+                 session_indexer: Optional[SessionIndexer] = None):
         """
         Initialize the mentor loop.
         
@@ -79,13 +114,25 @@ class MentorLoopOrchestrator:
             diagnostic_service: DiagnosticService instance
             retrieval_service: RetrievalService instance
             model_service: LocalModelService instance
+            session_store: Where sessions live between requests
+                (defaults to the store named in GuruBackendConfig)
+            session_indexer: Background indexer for completed sessions
         """
         self.diagnostic_service = diagnostic_service
         self.retrieval_service = retrieval_service
         self.model_service = model_service
-        
-        # Session storage (TODO: replace with database)
-        self.sessions: Dict[str, DiagnosticSession] = {}
+        self.session_indexer = session_indexer
+        
+        # Session storage (shared across workers unless using the memory store)
+        if session_store is None:
+            session_store = create_session_store(
+                backend=GuruBackendConfig.SESSION_STORE,
+                ttl_seconds=GuruBackendConfig.SESSION_TTL_SECONDS,
+                max_sessions=GuruBackendConfig.SESSION_MAX_IN_MEMORY,
+                path=GuruBackendConfig.SESSION_STORE_PATH,
+                redis_url=GuruBackendConfig.SESSION_REDIS_URL
+            )
+        self.sessions: SessionStore = session_store
     
     # ========================================================================
     # STAGE 1: OBSERVE
@@ -129,6 +176,7 @@ class MentorLoopOrchestrator:
         
         # Move to next stage
         session.stage = MentorStage.BASELINE
+        self.save_session(session)
         
         return {
             "stage": "observe",
@@ -177,6 +225,7 @@ class MentorLoopOrchestrator:
         
         # Move to next stage
         session.stage = MentorStage.QUESTIONS
+        self.save_session(session)
         
         return {
             "stage": "baseline",
@@ -230,6 +279,7 @@ class MentorLoopOrchestrator:
         
         if should_move_to_frame:
             session.stage = MentorStage.FRAME
+            self.save_session(session)
             return {
                 "status": "answered",
                 "nextAction": "frame",
@@ -238,6 +288,7 @@ class MentorLoopOrchestrator:
         else:
             # Get next question
             next_question = session.questions[len(session.answers)] if len(session.answers) < len(session.questions) else None
+            self.save_session(session)
             return {
                 "status": "answered",
                 "nextAction": "ask",
@@ -282,6 +333,7 @@ class MentorLoopOrchestrator:
         
         # Move to next stage
         session.stage = MentorStage.GUIDE
+        self.save_session(session)
         
         return {
             "stage": "frame",
@@ -327,6 +379,7 @@ class MentorLoopOrchestrator:
         
         # Move to next stage (when user reports back)
         session.stage = MentorStage.REFLECT
+        self.save_session(session)
         
         return {
             "stage": "guide",
@@ -374,6 +427,7 @@ class MentorLoopOrchestrator:
         # Store session for future retrieval (backward loop)
         # This enriches getSimilarPastProblems for next user with same issue
         await self._store_session(session)
+        self.save_session(session)
         
         return {
             "stage": "reflect",
@@ -390,41 +444,31 @@ class MentorLoopOrchestrator:
     async def _store_session(self, session: DiagnosticSession):
         """
         Store completed session in vector DB for future retrieval.
+        
+        Only queues the session: chunking, embedding and the vector DB write
+        happen in batches on the SessionIndexer's background task.
         """
-        if not self.retrieval_service:
+        if not self.session_indexer:
             return
         
-        # Chunk the session into retrievable pieces
-        chunks = [
-            {
-                "type": "problem",
-                "content": session.observation,
-                "metadata": {"sessionId": session.session_id, "domain": session.domain}
-            },
-            {
-                "type": "solution",
-                "content": json.dumps(session.guidance),
-                "metadata": {"sessionId": session.session_id, "domain": session.domain}
-            },
-            {
-                "type": "principle",
-                "content": session.reflection,
-                "metadata": {"sessionId": session.session_id, "domain": session.domain}
-            }
-        ]
-        
-        # TODO: Call retrievalService.upsertSession(chunks)
-        log.info(f"[{session.session_id}] Session stored for future retrieval")
+        if self.session_indexer.enqueue(session):
+            log.info(f"[{session.session_id}] Session queued for future retrieval")
     
     def get_session(self, session_id: str) -> Optional[DiagnosticSession]:
         """Get session by ID."""
-        return self.sessions.get(session_id)
+        data = self.sessions.get(session_id)
+        return DiagnosticSession.from_dict(data) if data is not None else None
+    
+    def save_session(self, session: DiagnosticSession):
+        """Persist session state so any worker can pick up the next stage."""
+        session.updated_at = datetime.now()
+        self.sessions.put(session.session_id, session.to_dict())
     
     def create_session(self, user_id: str, domain: str) -> DiagnosticSession:
         """Create a new diagnostic session."""
         session_id = f"{user_id}-{domain}-{datetime.now().timestamp()}"
         session = DiagnosticSession(session_id, user_id, domain)
-        self.sessions[session_id] = session
+        self.save_session(session)
         return session
 
 
@@ -451,12 +495,81 @@ def get_mentor_orchestrator(
     return _mentor_orchestrator
 
 
+def _get_session_embedding_function(app):
+    """
+    Open WebUI's embedding function when mounted inside it, else the
+    configured embedding endpoint.
+    """
+    if getattr(app.state, "EMBEDDING_FUNCTION", None) is not None:
+        try:
+            from open_webui.config import RAG_EMBEDDING_CONTENT_PREFIX
+        except ImportError:
+            RAG_EMBEDDING_CONTENT_PREFIX = None
+        
+        async def embed(texts):
+            # Resolved per batch so an embedding model switch is picked up
+            return await app.state.EMBEDDING_FUNCTION(texts, prefix=RAG_EMBEDDING_CONTENT_PREFIX)
+        
+        return embed
+    
+    if GuruBackendConfig.EMBEDDING_URL:
+        return create_endpoint_embedding_function(
+            GuruBackendConfig.EMBEDDING_URL,
+            GuruBackendConfig.DEFAULT_EMBEDDING_MODEL,
+            api_key=GuruBackendConfig.EMBEDDING_API_KEY,
+            timeout_seconds=GuruBackendConfig.INFERENCE_TIMEOUT_SECONDS
+        )
+    return None
+
+
+def _get_session_vector_client():
+    """Open WebUI's vector DB client when mounted inside it, else a local Chroma store."""
+    try:
+        from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+        return VECTOR_DB_CLIENT
+    except ImportError:
+        pass
+    
+    try:
+        return ChromaSessionVectorClient(GuruBackendConfig.VECTOR_DB_PATH)
+    except ImportError as e:
+        log.warning(f"No vector DB available, mentor sessions will not be indexed: {e}")
+        return None
+
+
+def _create_session_indexer(app) -> Optional[SessionIndexer]:
+    """Build the indexer for completed mentor sessions, if an embedding source exists."""
+    if not GuruBackendConfig.ENABLE_MENTOR_MEMORY:
+        return None
+    
+    embedding_function = _get_session_embedding_function(app)
+    if embedding_function is None:
+        log.info("No embedding function (set GURU_EMBEDDING_URL), mentor sessions will not be indexed")
+        return None
+    
+    vector_client = _get_session_vector_client()
+    if vector_client is None:
+        return None
+    
+    return SessionIndexer(
+        embedding_function=embedding_function,
+        vector_client=vector_client,
+        collection_name=GuruBackendConfig.SESSION_INDEX_COLLECTION,
+        batch_size=GuruBackendConfig.SESSION_INDEX_BATCH_SIZE,
+        flush_interval_seconds=GuruBackendConfig.SESSION_INDEX_FLUSH_SECONDS
+    )
+
+
 def initialize_mentor_loop(app):
     """
     Initialize the mentor loop orchestrator with the FastAPI app.
     Called during app startup.
     """
     orchestrator = get_mentor_orchestrator()
+    if orchestrator.session_indexer is None:
+        orchestrator.session_indexer = _create_session_indexer(app)
+        if orchestrator.session_indexer is not None:
+            app.add_event_handler("shutdown", orchestrator.session_indexer.stop)
     app.state.mentor_orchestrator = orchestrator
     log.info("✓ Mentor loop orchestrator initialized")
     return orchestrator
@@ -468,3 +581,4 @@ __all__ = [
     "MentorLoopOrchestrator",
     "get_mentor_orchestrator",
     "initialize_mentor_loop",
+]
@@ -5,14 +5,21 @@ Orchestrates DISCOVERER → RESEARCHER → ARCHIVIST → THINKER agents
 to execute bidirectional retrieval with proper grounding.
 
 Replaces generic RAG with specialized agent roles.
+
+Stages run as a small dependency graph rather than a straight line:
+discovery and the archivist's user-context lookups start together, and
+each agent fans its independent lookups out concurrently under a deadline.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Sequence, AsyncIterator, Tuple
 from enum import Enum
 from dataclasses import dataclass
 from datetime import datetime
 
+from core.config import GuruBackendConfig
+
 log = logging.getLogger(__name__)
 
 
@@ -51,6 +58,147 @@ class PipelineOutput:
     synthesis_strategy: Optional[str] = None
     contradictions: List[str] = None
     next_action: str = "respond"  # 'respond' | 'ask' | 'refuse'
+    degraded_stages: List[str] = None  # Stages that timed out or failed
+
+
+@dataclass
+class StageBudget:
+    """Deadline and fan-out limit for the lookups inside one agent"""
+    timeout_seconds: Optional[float] = None
+    max_concurrency: int = 4
+
+
+async def gather_with_deadline(
+    calls: Sequence[Callable[[], Awaitable[Any]]],
+    budget: StageBudget,
+    labels: Optional[Sequence[str]] = None
+) -> List[Any]:
+    """
+    Run independent lookups concurrently and return their results in order.
+    
+    At most ``budget.max_concurrency`` calls run at once and all of them share
+    ``budget.timeout_seconds``. A call that raises or misses the deadline
+    yields None, so callers can keep whatever finished in time.
+    """
+    labels = labels or [str(i) for i in range(len(calls))]
+    semaphore = asyncio.Semaphore(max(1, budget.max_concurrency))
+    
+    async def run(call):
+        async with semaphore:
+            return await call()
+    
+    tasks = [asyncio.ensure_future(run(call)) for call in calls]
+    if not tasks:
+        return []
+    
+    done, pending = await asyncio.wait(tasks, timeout=budget.timeout_seconds)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    
+    results = []
+    for label, task in zip(labels, tasks):
+        if task in pending:
+            log.warning(f"Lookup '{label}' missed its {budget.timeout_seconds}s deadline")
+            results.append(None)
+        elif task.exception() is not None:
+            log.warning(f"Lookup '{label}' failed: {task.exception()}")
+            results.append(None)
+        else:
+            results.append(task.result())
+    return results
+
+
+@dataclass
+class _Stage:
+    name: str
+    run: Callable[..., Awaitable[Any]]
+    depends_on: List[str]
+    timeout_seconds: Optional[float]
+    fallback: Callable[[], Any]
+
+
+class StageScheduler:
+    """
+    Minimal DAG runner for pipeline stages.
+    
+    Each stage starts as soon as the stages it depends on have finished and
+    receives their results as keyword arguments. A stage that fails or misses
+    its deadline resolves to its fallback value and is recorded in
+    ``degraded`` instead of failing the whole run.
+    """
+    
+    def __init__(self):
+        self._stages: Dict[str, _Stage] = {}
+        self.degraded: List[str] = []
+    
+    def add(
+        self,
+        name: str,
+        run: Callable[..., Awaitable[Any]],
+        depends_on: Sequence[str] = (),
+        timeout_seconds: Optional[float] = None,
+        fallback: Callable[[], Any] = lambda: None
+    ) -> None:
+        for dependency in depends_on:
+            if dependency not in self._stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dependency}'")
+        self._stages[name] = _Stage(
+            name=name,
+            run=run,
+            depends_on=list(depends_on),
+            timeout_seconds=timeout_seconds,
+            fallback=fallback
+        )
+    
+    @property
+    def stage_names(self) -> List[str]:
+        return list(self._stages.keys())
+    
+    async def run(
+        self,
+        on_stage_complete: Optional[Callable[[str, Any], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run every stage and return results keyed by stage name.
+        
+        ``on_stage_complete(name, result)`` is called as each stage finishes,
+        including stages that resolved to their fallback.
+        """
+        tasks: Dict[str, asyncio.Task] = {}
+        
+        async def run_stage(stage: _Stage):
+            inputs = {dep: await tasks[dep] for dep in stage.depends_on}
+            try:
+                result = await asyncio.wait_for(
+                    stage.run(**inputs), timeout=stage.timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                log.warning(f"[PIPELINE] Stage '{stage.name}' timed out after {stage.timeout_seconds}s")
+                self.degraded.append(stage.name)
+                result = stage.fallback()
+            except Exception as e:
+                log.warning(f"[PIPELINE] Stage '{stage.name}' failed: {e}")
+                self.degraded.append(stage.name)
+                result = stage.fallback()
+            
+            if on_stage_complete:
+                on_stage_complete(stage.name, result)
+            return result
+        
+        # Stages are registered after their dependencies, so every task a
+        # stage awaits already exists by the time it starts running.
+        for name, stage in self._stages.items():
+            tasks[name] = asyncio.ensure_future(run_stage(stage))
+        
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        
+        return {name: task.result() for name, task in tasks.items()}
 
 
 class DiscovererAgent:
@@ -63,6 +211,9 @@ class DiscovererAgent:
     - Web (if enabled)
     """
     
+    def __init__(self, budget: Optional[StageBudget] = None):
+        self.budget = budget or StageBudget()
+    
     async def perform_discovery(
         self, 
         user_id: str, 
@@ -72,24 +223,29 @@ class DiscovererAgent:
         """
         Search for relevant sources like a crawler.
         
+        All sources are searched concurrently; a source that misses the
+        deadline is left out rather than stalling discovery.
+        
         Returns ranked list of sources by relevance.
         """
         log.info(f"[DISCOVERER] Searching for: {query}")
         
-        sources = []
-        
-        # 1. Search local artifacts (documents, code)
-        local_sources = await self._search_local_artifacts(user_id, query)
-        sources.extend(local_sources)
+        # 1. Local artifacts (documents, code), 2. courses, 3. web (optional)
+        lookups = {
+            "local": lambda: self._search_local_artifacts(user_id, query),
+            "courses": lambda: self._search_courses(query),
+        }
+        if enable_web_search:
+            lookups["web"] = lambda: self._search_web(query)
         
-        # 2. Search courses
-        course_sources = await self._search_courses(query)
-        sources.extend(course_sources)
+        found = await gather_with_deadline(
+            list(lookups.values()), self.budget, labels=list(lookups.keys())
+        )
         
-        # 3. Search web (optional)
-        if enable_web_search:
-            web_sources = await self._search_web(query)
-            sources.extend(web_sources)
+        sources = []
+        for source_list in found:
+            if source_list:
+                sources.extend(source_list)
         
         # Rank by relevance
         sources.sort(key=lambda s: s.relevance_score, reverse=True)
@@ -149,6 +305,9 @@ class ResearcherAgent:
     - Extract web snippets
     """
     
+    def __init__(self, budget: Optional[StageBudget] = None):
+        self.budget = budget or StageBudget()
+    
     async def perform_retrieval(
         self,
         user_id: str,
@@ -156,7 +315,7 @@ class ResearcherAgent:
         query: str
     ) -> Dict[str, List[RetrievalResult]]:
         """
-        Fetch content from all sources.
+        Fetch content from all sources concurrently.
         
         Returns organized by content_type.
         """
@@ -169,25 +328,27 @@ class ResearcherAgent:
             "web": []
         }
         
+        fetches = []
         for source in sources:
-            try:
-                if source.origin == "Internal":
-                    # Query vector DB
-                    doc_results = await self._query_vector_db(source, query)
-                    results["documents"].extend(doc_results)
-                
-                elif source.origin == "Course":
-                    # Fetch course content
-                    course_results = await self._fetch_course_content(source)
-                    results["courses"].extend(course_results)
-                
-                elif source.origin == "Web":
-                    # Fetch web snippet
-                    web_results = await self._fetch_web_content(source)
-                    results["web"].extend(web_results)
-            
-            except Exception as e:
-                log.warning(f"Failed to retrieve from {source.url}: {e}")
+            if source.origin == "Internal":
+                # Query vector DB
+                fetches.append(("documents", source, lambda s=source: self._query_vector_db(s, query)))
+            elif source.origin == "Course":
+                # Fetch course content
+                fetches.append(("courses", source, lambda s=source: self._fetch_course_content(s)))
+            elif source.origin == "Web":
+                # Fetch web snippet
+                fetches.append(("web", source, lambda s=source: self._fetch_web_content(s)))
+        
+        fetched = await gather_with_deadline(
+            [call for _, _, call in fetches],
+            self.budget,
+            labels=[source.url for _, source, _ in fetches]
+        )
+        
+        for (bucket, _, _), items in zip(fetches, fetched):
+            if items:
+                results[bucket].extend(items)
         
         total = sum(len(v) for v in results.values())
         log.info(f"[RESEARCHER] Retrieved {total} items")
@@ -247,25 +408,53 @@ class ArchivistAgent:
     - Inquiry history (did we solve this?)
     """
     
+    def __init__(self, budget: Optional[StageBudget] = None):
+        self.budget = budget or StageBudget()
+    
+    async def gather_user_context(self, user_id: str, query: str) -> Dict[str, Any]:
+        """
+        Look up everything we know about the user for this query.
+        
+        Depends only on the user and the query, so the pipeline runs it
+        alongside discovery. The four lookups are independent and run
+        concurrently; a lookup that misses the deadline is left empty.
+        """
+        profile, recall, past, inquiry = await gather_with_deadline(
+            [
+                lambda: self._get_user_profile(user_id),
+                lambda: self._search_user_recall(user_id, query),
+                lambda: self._get_past_problems(user_id, query),
+                lambda: self._check_inquiry_history(user_id, query),
+            ],
+            self.budget,
+            labels=["user_profile", "recall_patches", "past_problems", "inquiry_history"]
+        )
+        return {
+            "user_profile": profile or {},
+            "recall_patches": recall or [],
+            "past_problems": past or [],
+            "inquiry_history": inquiry or {},
+        }
+    
     async def perform_archiving(
         self,
         user_id: str,
         query: str,
-        retrieval_results: Dict[str, List[RetrievalResult]]
+        retrieval_results: Dict[str, List[RetrievalResult]],
+        user_context: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Ground retrieval in user context.
         
+        Pass ``user_context`` when it was already gathered ahead of time.
+        
         Returns consolidated grounding context.
         """
         log.info(f"[ARCHIVIST] Grounding in user context")
         
-        context = {
-            "user_profile": await self._get_user_profile(user_id),
-            "recall_patches": await self._search_user_recall(user_id, query),
-            "past_problems": await self._get_past_problems(user_id, query),
-            "inquiry_history": await self._check_inquiry_history(user_id, query),
-        }
+        if user_context is None:
+            user_context = await self.gather_user_context(user_id, query)
+        context = dict(user_context)
         
         # Check if we should refuse
         context["should_refuse"] = self._check_response_gates(context)
@@ -436,14 +625,94 @@ class ThinkerAgent:
 class RetrievalPipeline:
     """
     Main orchestrator: DISCOVERER → RESEARCHER → ARCHIVIST → THINKER
+    
+    Stage graph:
+    
+        discovery ──► retrieval ──┐
+                                  ├──► grounding ──► synthesis
+        user_context ─────────────┘
     """
     
-    def __init__(self):
-        self.discoverer = DiscovererAgent()
-        self.researcher = ResearcherAgent()
-        self.archivist = ArchivistAgent()
+    def __init__(
+        self,
+        stage_timeout_seconds: Optional[float] = GuruBackendConfig.RETRIEVAL_STAGE_TIMEOUT_SECONDS,
+        source_timeout_seconds: Optional[float] = GuruBackendConfig.RETRIEVAL_SOURCE_TIMEOUT_SECONDS,
+        max_concurrency: int = GuruBackendConfig.RETRIEVAL_MAX_CONCURRENCY
+    ):
+        budget = StageBudget(
+            timeout_seconds=source_timeout_seconds,
+            max_concurrency=max_concurrency
+        )
+        self.stage_timeout_seconds = stage_timeout_seconds
+        self.discoverer = DiscovererAgent(budget)
+        self.researcher = ResearcherAgent(budget)
+        self.archivist = ArchivistAgent(budget)
         self.thinker = ThinkerAgent()
     
+    def _build_schedule(
+        self,
+        user_id: str,
+        query: str,
+        enable_web_search: bool
+    ) -> StageScheduler:
+        """Wire the agents into a stage graph for one query."""
+        scheduler = StageScheduler()
+        timeout = self.stage_timeout_seconds
+        
+        # Step 1: DISCOVERER
+        scheduler.add(
+            "discovery",
+            lambda: self.discoverer.perform_discovery(user_id, query, enable_web_search),
+            timeout_seconds=timeout,
+            fallback=list
+        )
+        # ARCHIVIST lookups only need the user and query, so overlap them with discovery
+        scheduler.add(
+            "user_context",
+            lambda: self.archivist.gather_user_context(user_id, query),
+            timeout_seconds=timeout,
+            fallback=dict
+        )
+        
+        # Step 2: RESEARCHER
+        async def retrieve(discovery):
+            if not discovery:
+                return {}
+            return await self.researcher.perform_retrieval(user_id, discovery, query)
+        
+        scheduler.add(
+            "retrieval",
+            retrieve,
+            depends_on=["discovery"],
+            timeout_seconds=timeout,
+            fallback=dict
+        )
+        
+        # Step 3: ARCHIVIST
+        scheduler.add(
+            "grounding",
+            lambda retrieval, user_context: self.archivist.perform_archiving(
+                user_id, query, retrieval, user_context
+            ),
+            depends_on=["retrieval", "user_context"],
+            timeout_seconds=timeout,
+            fallback=lambda: {"should_refuse": True}
+        )
+        
+        # Step 4: THINKER (skipped when the grounding gates refuse)
+        async def synthesize(retrieval, grounding):
+            if grounding.get("should_refuse"):
+                return None
+            return await self.thinker.perform_synthesis(retrieval, grounding, query)
+        
+        scheduler.add(
+            "synthesis",
+            synthesize,
+            depends_on=["retrieval", "grounding"],
+            timeout_seconds=timeout
+        )
+        return scheduler
+    
     async def execute(
         self,
         user_id: str,
@@ -461,81 +730,62 @@ class RetrievalPipeline:
         log.info(f"{'='*60}\n")
         
         try:
-            # Step 1: DISCOVERER
-            sources = await self.discoverer.perform_discovery(
-                user_id,
-                query,
-                enable_web_search
-            )
-            
-            if not sources:
-                return PipelineOutput(
-                    status="error",
-                    query=query,
-                    sources_found=0,
-                    documents_retrieved=0,
-                    courses_retrieved=0,
-                    is_grounded=False,
-                    grounding_confidence=0.0,
-                    guided_question="No sources found. Please refine your query.",
-                    next_action="ask"
-                )
-            
-            # Step 2: RESEARCHER
-            retrieval = await self.researcher.perform_retrieval(
-                user_id,
-                sources,
-                query
-            )
-            
-            # Step 3: ARCHIVIST
-            grounding = await self.archivist.perform_archiving(
-                user_id,
-                query,
-                retrieval
-            )
-            
-            # Check gates
-            if grounding.get("should_refuse"):
-                guided = await self._generate_clarifying_question(query, grounding)
-                return PipelineOutput(
-                    status="gated",
-                    query=query,
-                    sources_found=len(sources),
-                    documents_retrieved=len(retrieval.get("documents", [])),
-                    courses_retrieved=len(retrieval.get("courses", [])),
-                    is_grounded=False,
-                    grounding_confidence=0.3,
-                    guided_question=guided,
-                    next_action="ask"
-                )
-            
-            # Step 4: THINKER
-            synthesis = await self.thinker.perform_synthesis(
-                retrieval,
-                grounding,
-                query
-            )
-            
-            # Success
-            log.info("\n[PIPELINE] Retrieval complete. Ready for LLM.\n")
-            
+            scheduler = self._build_schedule(user_id, query, enable_web_search)
+            results = await scheduler.run()
+            return await self._build_output(query, results, scheduler.degraded)
+        
+        except Exception as e:
+            log.error(f"[PIPELINE] Error: {e}", exc_info=True)
             return PipelineOutput(
-                status="success",
+                status="error",
                 query=query,
-                sources_found=len(sources),
-                documents_retrieved=len(retrieval.get("documents", [])),
-                courses_retrieved=len(retrieval.get("courses", [])),
-                is_grounded=synthesis["grounding_confidence"] > 0.6,
-                grounding_confidence=synthesis["grounding_confidence"],
-                synthesis_strategy=synthesis["synthesis_strategy"],
-                contradictions=synthesis["contradictions"],
-                next_action="respond"
+                sources_found=0,
+                documents_retrieved=0,
+                courses_retrieved=0,
+                is_grounded=False,
+                grounding_confidence=0.0,
+                next_action="refuse"
             )
+    
+    async def stream(
+        self,
+        user_id: str,
+        query: str,
+        domain: str,
+        enable_web_search: bool = False
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Execute the pipeline, yielding ``(stage, result)`` as each stage finishes.
         
+        The last item is ``("complete", PipelineOutput)`` with the same output
+        ``execute`` would have returned. Stages that timed out or failed are
+        yielded with their fallback result.
+        """
+        log.info(f"[PIPELINE] Streaming retrieval for: {query}")
+        
+        scheduler = self._build_schedule(user_id, query, enable_web_search)
+        finished: asyncio.Queue = asyncio.Queue()
+        run_task = asyncio.ensure_future(
+            scheduler.run(
+                on_stage_complete=lambda name, result: finished.put_nowait((name, result))
+            )
+        )
+        
+        try:
+            for _ in scheduler.stage_names:
+                get_next = asyncio.ensure_future(finished.get())
+                await asyncio.wait({get_next, run_task}, return_when=asyncio.FIRST_COMPLETED)
+                if not get_next.done():
+                    # The scheduler stopped without reporting every stage
+                    get_next.cancel()
+                    break
+                yield get_next.result()
+            
+            results = await run_task
+            output = await self._build_output(query, results, scheduler.degraded)
         except Exception as e:
             log.error(f"[PIPELINE] Error: {e}", exc_info=True)
-            return PipelineOutput(
+            output = PipelineOutput(
                 status="error",
                 query=query,
                 sources_found=0,
@@ -545,6 +795,72 @@ class RetrievalPipeline:
                 grounding_confidence=0.0,
                 next_action="refuse"
             )
+        finally:
+            # Client went away mid-stream: stop the remaining stages
+            if not run_task.done():
+                run_task.cancel()
+        
+        yield "complete", output
+    
+    async def _build_output(
+        self,
+        query: str,
+        results: Dict[str, Any],
+        degraded: List[str]
+    ) -> PipelineOutput:
+        """Turn finished stage results into the pipeline's response."""
+        sources = results.get("discovery") or []
+        retrieval = results.get("retrieval") or {}
+        grounding = results.get("grounding") or {}
+        synthesis = results.get("synthesis")
+        degraded_stages = list(degraded) or None
+        
+        if not sources:
+            return PipelineOutput(
+                status="error",
+                query=query,
+                sources_found=0,
+                documents_retrieved=0,
+                courses_retrieved=0,
+                is_grounded=False,
+                grounding_confidence=0.0,
+                guided_question="No sources found. Please refine your query.",
+                next_action="ask",
+                degraded_stages=degraded_stages
+            )
+        
+        # Check gates
+        if grounding.get("should_refuse") or synthesis is None:
+            guided = await self._generate_clarifying_question(query, grounding)
+            return PipelineOutput(
+                status="gated",
+                query=query,
+                sources_found=len(sources),
+                documents_retrieved=len(retrieval.get("documents", [])),
+                courses_retrieved=len(retrieval.get("courses", [])),
+                is_grounded=False,
+                grounding_confidence=0.3,
+                guided_question=guided,
+                next_action="ask",
+                degraded_stages=degraded_stages
+            )
+        
+        # Success
+        log.info("\n[PIPELINE] Retrieval complete. Ready for LLM.\n")
+        
+        return PipelineOutput(
+            status="success",
+            query=query,
+            sources_found=len(sources),
+            documents_retrieved=len(retrieval.get("documents", [])),
+            courses_retrieved=len(retrieval.get("courses", [])),
+            is_grounded=synthesis["grounding_confidence"] > 0.6,
+            grounding_confidence=synthesis["grounding_confidence"],
+            synthesis_strategy=synthesis["synthesis_strategy"],
+            contradictions=synthesis["contradictions"],
+            next_action="respond",
+            degraded_stages=degraded_stages
+        )
     
     async def _generate_clarifying_question(
         self, 
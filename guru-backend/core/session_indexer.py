@@ -0,0 +1,239 @@
+"""
+Guru Mentor Session Indexer
+
+Background worker that embeds completed mentor sessions and writes them to
+the vector DB in batches, feeding getSimilarPastProblems without putting
+embedding latency on the REFLECT response.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+# Namespace for chunk ids: vector DBs such as Qdrant only accept UUID (or
+# integer) point ids
+SESSION_CHUNK_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "guru-mentor-sessions")
+
+
+def session_chunk_id(session_id: str, chunk_type: str) -> str:
+    return str(uuid.uuid5(SESSION_CHUNK_NAMESPACE, f"{session_id}:{chunk_type}"))
+
+
+def build_session_chunks(session) -> List[Dict[str, Any]]:
+    """
+    Chunk a completed session into retrievable pieces.
+
+    Chunk ids are UUIDs derived from the session id and chunk type, so
+    re-indexing a session replaces its chunks instead of duplicating them.
+    """
+    metadata = {
+        "sessionId": session.session_id,
+        "userId": session.user_id,
+        "domain": session.domain,
+    }
+    pieces = [
+        ("problem", session.observation),
+        ("solution", json.dumps(session.guidance) if session.guidance else None),
+        ("principle", session.reflection),
+    ]
+    return [
+        {
+            "id": session_chunk_id(session.session_id, chunk_type),
+            "type": chunk_type,
+            "content": content,
+            "metadata": {**metadata, "type": chunk_type},
+        }
+        for chunk_type, content in pieces
+        if content
+    ]
+
+
+def create_endpoint_embedding_function(
+    url: str,
+    model: str,
+    api_key: str = "",
+    timeout_seconds: float = 30.0
+) -> Callable[[List[str]], Awaitable[List[List[float]]]]:
+    """
+    Embedding function backed by an OpenAI-compatible ``/embeddings`` endpoint
+    (Ollama, llama.cpp server, vLLM, OpenAI), for running without Open WebUI.
+    """
+    endpoint = f"{url.rstrip('/')}/embeddings"
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+
+    async def embed(texts: List[str]) -> List[List[float]]:
+        import aiohttp
+
+        async with aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=timeout_seconds)
+        ) as session:
+            async with session.post(
+                endpoint, json={"model": model, "input": texts}, headers=headers
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
+        items = sorted(data["data"], key=lambda item: item["index"])
+        return [item["embedding"] for item in items]
+
+    return embed
+
+
+class ChromaSessionVectorClient:
+    """
+    Minimal vector client over a persistent Chroma directory, with the
+    ``upsert(collection_name, items)`` interface of Open WebUI's clients.
+    """
+
+    def __init__(self, path: str):
+        import chromadb
+
+        self.client = chromadb.PersistentClient(path=path)
+
+    def upsert(self, collection_name: str, items: List[Dict[str, Any]]):
+        collection = self.client.get_or_create_collection(
+            name=collection_name, metadata={"hnsw:space": "cosine"}
+        )
+        collection.upsert(
+            ids=[item["id"] for item in items],
+            documents=[item["text"] for item in items],
+            embeddings=[item["vector"] for item in items],
+            metadatas=[item["metadata"] for item in items],
+        )
+
+
+class SessionIndexer:
+    """
+    Queues completed sessions and indexes them in the background.
+
+    Chunks are collected until ``batch_size`` sessions are waiting or
+    ``flush_interval_seconds`` has passed, then embedded with one call to
+    ``embedding_function`` and written with one ``vector_client.upsert``.
+    The queue is bounded; when it is full new sessions are dropped (and
+    counted) rather than slowing down the mentor loop.
+    """
+
+    def __init__(
+        self,
+        embedding_function: Callable[..., Awaitable[List[List[float]]]],
+        vector_client,
+        collection_name: str = "guru-mentor-sessions",
+        batch_size: int = 32,
+        flush_interval_seconds: float = 2.0,
+        max_queue_size: int = 10000
+    ):
+        self.embedding_function = embedding_function
+        self.vector_client = vector_client
+        self.collection_name = collection_name
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_queue_size = max_queue_size
+
+        self.indexed = 0
+        self.dropped = 0
+        self.failed = 0
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_worker(self):
+        # Started lazily so the indexer binds to the serving event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    def enqueue(self, session) -> bool:
+        """
+        Queue a completed session for indexing. Must be called from the event loop.
+
+        Returns False if the session was dropped because the queue is full.
+        """
+        chunks = build_session_chunks(session)
+        if not chunks:
+            return True
+
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(chunks)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            log.warning(f"[{session.session_id}] Session index queue full, dropping session")
+            return False
+
+    async def _next_batch(self) -> List[List[Dict[str, Any]]]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval_seconds
+        while len(batch) < self.batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self.index_batch([chunk for chunks in batch for chunk in chunks])
+            except Exception as e:
+                self.failed += len(batch)
+                log.error(f"Failed to index {len(batch)} mentor sessions: {e}", exc_info=True)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def index_batch(self, chunks: List[Dict[str, Any]]):
+        """Embed chunks in one call and upsert them in one write."""
+        if not chunks:
+            return
+
+        vectors = await self.embedding_function([chunk["content"] for chunk in chunks])
+        if not vectors or len(vectors) != len(chunks):
+            raise ValueError(
+                f"Embedding function returned {len(vectors or [])} vectors for {len(chunks)} chunks"
+            )
+
+        items = [
+            {
+                "id": chunk["id"],
+                "text": chunk["content"],
+                "vector": vector,
+                "metadata": chunk["metadata"],
+            }
+            for chunk, vector in zip(chunks, vectors)
+        ]
+        # Vector DB clients are synchronous; keep them off the event loop
+        await asyncio.to_thread(self.vector_client.upsert, self.collection_name, items)
+
+        self.indexed += len({chunk["metadata"]["sessionId"] for chunk in chunks})
+        log.info(f"Indexed {len(items)} mentor session chunks into '{self.collection_name}'")
+
+    async def flush(self):
+        """Wait until every queued session has been indexed (or failed)."""
+        if self._queue is not None and self._worker is not None and not self._worker.done():
+            await self._queue.join()
+
+    async def stop(self):
+        """Flush pending sessions and stop the background worker."""
+        await self.flush()
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+
+__all__ = [
+    "build_session_chunks",
+    "create_endpoint_embedding_function",
+    "ChromaSessionVectorClient",
+    "SessionIndexer",
+]
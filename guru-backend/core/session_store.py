@@ -0,0 +1,258 @@
+"""
+Guru Diagnostic Session Stores
+
+Pluggable storage for in-flight mentor loop sessions.
+
+- InMemorySessionStore: per-process LRU with TTL eviction (default, dev)
+- SQLiteSessionStore: file-backed, shared by every worker on the host
+- RedisSessionStore: shared across hosts
+
+Sessions are stored in their serialized form (DiagnosticSession.to_dict),
+so any store can be swapped in without touching the orchestrator.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+
+class SessionStore(ABC):
+    """
+    Key/value store for serialized diagnostic sessions.
+
+    Values are the plain dicts produced by DiagnosticSession.to_dict().
+    Every read or write refreshes the session's TTL.
+    """
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return the session data, or None if missing or expired."""
+        pass
+
+    @abstractmethod
+    def put(self, session_id: str, data: Dict[str, Any]) -> None:
+        """Insert or replace a session."""
+        pass
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Remove a session if present."""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of live sessions."""
+        pass
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Bounded per-process store.
+
+    Keeps at most ``max_sessions`` entries, evicting the least recently used
+    first, and drops entries idle for longer than ``ttl_seconds``.
+    """
+
+    def __init__(self, max_sessions: int = 10000, ttl_seconds: Optional[float] = 3600):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _is_expired(self, touched_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - touched_at > self.ttl_seconds
+
+    def _evict(self, now: float) -> None:
+        # Oldest entries sit at the front, so stop at the first live one
+        while self._entries:
+            session_id, (touched_at, _) = next(iter(self._entries.items()))
+            if len(self._entries) > self.max_sessions or self._is_expired(touched_at, now):
+                self._entries.popitem(last=False)
+            else:
+                break
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            if self._is_expired(entry[0], now):
+                del self._entries[session_id]
+                return None
+            self._entries[session_id] = (now, entry[1])
+            self._entries.move_to_end(session_id)
+            return entry[1]
+
+    def put(self, session_id: str, data: Dict[str, Any]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._entries[session_id] = (now, data)
+            self._entries.move_to_end(session_id)
+            self._evict(now)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._evict(time.monotonic())
+            return len(self._entries)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    File-backed store shared by all workers on one host.
+
+    Pass ``":memory:"`` as the path for a throwaway local store in tests.
+    Expired rows are purged lazily on write.
+    """
+
+    PURGE_EVERY_N_WRITES = 500
+
+    def __init__(self, path: str, ttl_seconds: Optional[float] = 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS guru_session (
+                session_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                expires_at REAL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS guru_session_expires_at ON guru_session (expires_at)"
+        )
+
+    def _expires_at(self) -> Optional[float]:
+        return time.time() + self.ttl_seconds if self.ttl_seconds is not None else None
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, expires_at FROM guru_session WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            data, expires_at = row
+            if expires_at is not None and expires_at < time.time():
+                self._conn.execute("DELETE FROM guru_session WHERE session_id = ?", (session_id,))
+                return None
+            self._conn.execute(
+                "UPDATE guru_session SET expires_at = ? WHERE session_id = ?",
+                (self._expires_at(), session_id)
+            )
+        return json.loads(data)
+
+    def put(self, session_id: str, data: Dict[str, Any]) -> None:
+        payload = json.dumps(data)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO guru_session (session_id, data, expires_at) VALUES (?, ?, ?)",
+                (session_id, payload, self._expires_at())
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY_N_WRITES == 0:
+                self._conn.execute(
+                    "DELETE FROM guru_session WHERE expires_at < ?", (time.time(),)
+                )
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM guru_session WHERE session_id = ?", (session_id,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM guru_session WHERE expires_at IS NULL OR expires_at >= ?",
+                (time.time(),)
+            ).fetchone()
+        return count
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Store shared across hosts, using Redis key expiry for the TTL.
+
+    Accepts any client exposing get/set/delete/expire/scan_iter (redis-py or
+    a compatible stand-in).
+    """
+
+    def __init__(
+        self,
+        client=None,
+        url: Optional[str] = None,
+        ttl_seconds: Optional[float] = 3600,
+        key_prefix: str = "guru:session:"
+    ):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self.client = client
+        self.ttl_seconds = int(ttl_seconds) if ttl_seconds is not None else None
+        self.key_prefix = key_prefix
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.key_prefix}{session_id}"
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        key = self._key(session_id)
+        data = self.client.get(key)
+        if data is None:
+            return None
+        if self.ttl_seconds is not None:
+            self.client.expire(key, self.ttl_seconds)
+        return json.loads(data)
+
+    def put(self, session_id: str, data: Dict[str, Any]) -> None:
+        self.client.set(self._key(session_id), json.dumps(data), ex=self.ttl_seconds)
+
+    def delete(self, session_id: str) -> None:
+        self.client.delete(self._key(session_id))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.client.scan_iter(match=f"{self.key_prefix}*"))
+
+
+def create_session_store(
+    backend: str = "memory",
+    ttl_seconds: Optional[float] = 3600,
+    max_sessions: int = 10000,
+    path: Optional[str] = None,
+    redis_url: Optional[str] = None
+) -> SessionStore:
+    """Build a session store from config values."""
+    backend = (backend or "memory").lower()
+    if backend == "sqlite":
+        return SQLiteSessionStore(path or "guru_sessions.db", ttl_seconds=ttl_seconds)
+    if backend == "redis":
+        return RedisSessionStore(url=redis_url, ttl_seconds=ttl_seconds)
+    if backend != "memory":
+        log.warning(f"Unknown session store '{backend}', falling back to memory")
+    return InMemorySessionStore(max_sessions=max_sessions, ttl_seconds=ttl_seconds)
+
+
+__all__ = [
+    "SessionStore",
+    "InMemorySessionStore",
+    "SQLiteSessionStore",
+    "RedisSessionStore",
+    "create_session_store",
+]
@@ -6,9 +6,11 @@ Extends the RAG pipeline to support the 6-stage diagnostic mentor loop.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+import json
 import logging
-from core.retrieval_pipeline import get_retrieval_pipeline
+from typing import Any, Dict
+from core.retrieval_pipeline import PipelineOutput, get_retrieval_pipeline
 
 log = logging.getLogger(__name__)
 
@@ -211,24 +213,129 @@ async def execute_retrieval_pipeline(payload: dict):
         )
         
         # Return pipelined result
-        return {
-            "status": result.status,
-            "query": result.query,
-            "sourceCount": result.sources_found,
-            "documentsRetrieved": result.documents_retrieved,
-            "coursesRetrieved": result.courses_retrieved,
-            "isGrounded": result.is_grounded,
-            "groundingConfidence": result.grounding_confidence,
-            "synthesisStrategy": result.synthesis_strategy,
-            "contradictions": result.contradictions,
-            "guidedQuestion": result.guided_question,
-            "nextAction": result.next_action
-        }
+        return _serialize_pipeline_output(result)
     except Exception as e:
         log.error(f"Pipeline error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/retrieval/execute/stream")
+async def stream_retrieval_pipeline(payload: dict):
+    """
+    Streaming variant of /retrieval/execute (Server-Sent Events).
+    
+    Emits one `stage` event per agent stage as soon as it finishes
+    (discovery, user_context, retrieval, grounding, synthesis), then a
+    `complete` event carrying the same body /retrieval/execute returns.
+    """
+    user_id = payload.get("userId")
+    query = payload.get("query")
+    domain = payload.get("domain", "general")
+    enable_web_search = payload.get("enableWebSearch", False)
+    
+    if not user_id or not query:
+        raise HTTPException(
+            status_code=400,
+            detail="userId and query are required"
+        )
+    
+    pipeline = get_retrieval_pipeline()
+    
+    async def event_stream():
+        async for stage, result in pipeline.stream(
+            user_id=user_id,
+            query=query,
+            domain=domain,
+            enable_web_search=enable_web_search
+        ):
+            if stage == "complete":
+                yield _sse("complete", _serialize_pipeline_output(result))
+            else:
+                yield _sse("stage", {"stage": stage, **_serialize_stage_result(stage, result)})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _serialize_pipeline_output(result: PipelineOutput) -> Dict[str, Any]:
+    return {
+        "status": result.status,
+        "query": result.query,
+        "sourceCount": result.sources_found,
+        "documentsRetrieved": result.documents_retrieved,
+        "coursesRetrieved": result.courses_retrieved,
+        "isGrounded": result.is_grounded,
+        "groundingConfidence": result.grounding_confidence,
+        "synthesisStrategy": result.synthesis_strategy,
+        "contradictions": result.contradictions,
+        "guidedQuestion": result.guided_question,
+        "nextAction": result.next_action,
+        "degradedStages": result.degraded_stages
+    }
+
+
+def _serialize_stage_result(stage: str, result: Any) -> Dict[str, Any]:
+    """Summarize one agent stage for the AgentStatusCards / GroundingPanel."""
+    if stage == "discovery":
+        sources = result or []
+        return {
+            "sourceCount": len(sources),
+            "sources": [
+                {
+                    "url": source.url,
+                    "origin": source.origin,
+                    "category": source.category,
+                    "title": source.title,
+                    "relevanceScore": source.relevance_score,
+                }
+                for source in sources
+            ],
+        }
+    if stage == "user_context":
+        context = result or {}
+        return {
+            "hasProfile": bool(context.get("user_profile")),
+            "recallPatches": len(context.get("recall_patches", [])),
+            "pastProblems": len(context.get("past_problems", [])),
+        }
+    if stage == "retrieval":
+        retrieval = result or {}
+        return {
+            "documentsRetrieved": len(retrieval.get("documents", [])),
+            "codeRetrieved": len(retrieval.get("code", [])),
+            "coursesRetrieved": len(retrieval.get("courses", [])),
+            "webRetrieved": len(retrieval.get("web", [])),
+        }
+    if stage == "grounding":
+        grounding = result or {}
+        inquiry = grounding.get("inquiry_history", {})
+        return {
+            "shouldRefuse": grounding.get("should_refuse", False),
+            "hasProfile": bool(grounding.get("user_profile")),
+            "isRepeat": inquiry.get("is_repeat", False),
+            "wasResolved": inquiry.get("was_resolved", False),
+        }
+    if stage == "synthesis":
+        if result is None:
+            return {"skipped": True}
+        return {
+            "skipped": False,
+            "groundingConfidence": result["grounding_confidence"],
+            "sourceCount": result["source_count"],
+            "contradictions": result["contradictions"],
+            "synthesisStrategy": result["synthesis_strategy"],
+            "suggestedTools": result["suggested_tools"],
+        }
+    return {}
+
+
 @router.post("/retrieval/query")
 async def query_user_history(payload: dict):
     """
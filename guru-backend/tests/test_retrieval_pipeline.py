@@ -0,0 +1,175 @@
+import asyncio
+
+import pytest
+
+from core.retrieval_pipeline import (
+    RetrievalPipeline,
+    SourceSignal,
+    StageBudget,
+    StageScheduler,
+    gather_with_deadline,
+)
+
+
+@pytest.mark.asyncio
+async def test_gather_with_deadline_keeps_order_and_drops_slow_calls():
+    async def value(v, delay=0):
+        await asyncio.sleep(delay)
+        return v
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    results = await gather_with_deadline(
+        [lambda: value("a", 0.02), lambda: value("b", 1), fail, lambda: value("d")],
+        StageBudget(timeout_seconds=0.2, max_concurrency=4)
+    )
+    assert results == ["a", None, None, "d"]
+
+
+@pytest.mark.asyncio
+async def test_gather_with_deadline_limits_concurrency():
+    running = 0
+    peak = 0
+
+    async def call():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    await gather_with_deadline([call] * 6, StageBudget(max_concurrency=2))
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_scheduler_overlaps_independent_stages():
+    started = []
+
+    async def stage(name, value):
+        started.append(name)
+        await asyncio.sleep(0.05)
+        return value
+
+    scheduler = StageScheduler()
+    scheduler.add("a", lambda: stage("a", 1))
+    scheduler.add("b", lambda: stage("b", 2))
+    scheduler.add("sum", lambda a, b: stage("sum", a + b), depends_on=["a", "b"])
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    results = await scheduler.run()
+
+    assert results == {"a": 1, "b": 2, "sum": 3}
+    assert started[-1] == "sum"
+    # a and b ran together: two stage delays, not three
+    assert loop.time() - start < 0.14
+
+
+@pytest.mark.asyncio
+async def test_scheduler_degrades_to_fallback():
+    async def slow():
+        await asyncio.sleep(1)
+
+    async def broken():
+        raise RuntimeError("boom")
+
+    completed = []
+    scheduler = StageScheduler()
+    scheduler.add("slow", slow, timeout_seconds=0.05, fallback=list)
+    scheduler.add("broken", broken, fallback=dict)
+    scheduler.add("after", lambda slow, broken: asyncio.sleep(0, (slow, broken)), depends_on=["slow", "broken"])
+
+    results = await scheduler.run(on_stage_complete=lambda name, result: completed.append(name))
+
+    assert results["after"] == ([], {})
+    assert sorted(scheduler.degraded) == ["broken", "slow"]
+    assert completed[-1] == "after"
+
+
+def test_scheduler_rejects_unknown_dependency():
+    scheduler = StageScheduler()
+    with pytest.raises(ValueError):
+        scheduler.add("b", lambda a: a, depends_on=["a"])
+
+
+def make_pipeline(discovery=None):
+    pipeline = RetrievalPipeline(stage_timeout_seconds=1, source_timeout_seconds=1)
+
+    async def perform_discovery(user_id, query, enable_web_search):
+        return discovery or []
+
+    async def gather_user_context(user_id, query):
+        return {"profile": {}}
+
+    async def perform_retrieval(user_id, sources, query):
+        return {"documents": [{"id": "d1"}], "courses": []}
+
+    async def perform_archiving(user_id, query, retrieval, user_context):
+        return {"should_refuse": False}
+
+    async def perform_synthesis(retrieval, grounding, query):
+        return {
+            "grounding_confidence": 0.9,
+            "source_count": 1,
+            "contradictions": [],
+            "synthesis_strategy": "s",
+            "suggested_tools": [],
+        }
+
+    pipeline.discoverer.perform_discovery = perform_discovery
+    pipeline.archivist.gather_user_context = gather_user_context
+    pipeline.researcher.perform_retrieval = perform_retrieval
+    pipeline.archivist.perform_archiving = perform_archiving
+    pipeline.thinker.perform_synthesis = perform_synthesis
+    return pipeline
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_each_stage_then_output():
+    source = SourceSignal(url="u", origin="Internal", category="c", title="t", relevance_score=1.0)
+    pipeline = make_pipeline(discovery=[source])
+
+    events = [event async for event in pipeline.stream("user", "query", "domain")]
+    stages = [name for name, _ in events]
+
+    assert sorted(stages[:-1]) == ["discovery", "grounding", "retrieval", "synthesis", "user_context"]
+    assert stages.index("discovery") < stages.index("retrieval") < stages.index("grounding")
+    name, output = events[-1]
+    assert name == "complete"
+    assert output.status == "success"
+    assert output.documents_retrieved == 1
+
+    executed = await pipeline.execute("user", "query", "domain")
+    assert executed.status == output.status
+    assert executed.grounding_confidence == output.grounding_confidence
+
+
+@pytest.mark.asyncio
+async def test_execute_without_sources_asks_for_more():
+    output = await make_pipeline().execute("user", "query", "domain")
+    assert output.status == "error"
+    assert output.next_action == "ask"
+
+
+def test_stream_route_emits_server_sent_events(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from open_webui.routes import guru
+
+    source = SourceSignal(url="u", origin="Internal", category="c", title="t", relevance_score=1.0)
+    monkeypatch.setattr(guru, "get_retrieval_pipeline", lambda: make_pipeline(discovery=[source]))
+    app = FastAPI()
+    app.include_router(guru.router)
+
+    response = TestClient(app).post(
+        "/api/guru/retrieval/execute/stream", json={"userId": "user", "query": "query"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = [block.split("\n")[0] for block in response.text.strip().split("\n\n")]
+    assert events.count("event: stage") == 5
+    assert events[-1] == "event: complete"
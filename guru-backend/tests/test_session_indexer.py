@@ -0,0 +1,208 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from core.session_indexer import (
+    SessionIndexer,
+    build_session_chunks,
+    session_chunk_id,
+)
+
+
+def make_session(session_id, reflection="principle"):
+    return SimpleNamespace(
+        session_id=session_id,
+        user_id="user",
+        domain="general",
+        observation="problem",
+        guidance={"steps": ["a"]},
+        reflection=reflection,
+    )
+
+
+class FakeVectorClient:
+    def __init__(self):
+        self.upserts = []
+
+    def upsert(self, collection_name, items):
+        self.upserts.append((collection_name, items))
+
+
+def make_indexer(vector_client, calls, **kwargs):
+    async def embed(texts):
+        calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    return SessionIndexer(embed, vector_client, **kwargs)
+
+
+def test_chunk_ids_are_stable_uuids():
+    chunks = build_session_chunks(make_session("s1"))
+    ids = [chunk["id"] for chunk in chunks]
+
+    # Valid point ids for Qdrant, and the same on every re-index
+    assert [str(uuid.UUID(chunk_id)) for chunk_id in ids] == ids
+    assert ids == [chunk["id"] for chunk in build_session_chunks(make_session("s1"))]
+    assert len(set(ids)) == 3
+    assert ids[0] == session_chunk_id("s1", "problem")
+    assert ids[0] != session_chunk_id("s2", "problem")
+
+
+def test_build_session_chunks_skips_empty_pieces():
+    chunks = build_session_chunks(make_session("s1", reflection=None))
+    assert [chunk["type"] for chunk in chunks] == ["problem", "solution"]
+    assert chunks[0]["metadata"] == {
+        "sessionId": "s1",
+        "userId": "user",
+        "domain": "general",
+        "type": "problem",
+    }
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_indexed_in_one_batch():
+    client = FakeVectorClient()
+    calls = []
+    indexer = make_indexer(client, calls, batch_size=3, flush_interval_seconds=1)
+
+    for i in range(3):
+        assert indexer.enqueue(make_session(f"s{i}"))
+    await indexer.stop()
+
+    assert len(calls) == 1
+    assert len(client.upserts) == 1
+    collection_name, items = client.upserts[0]
+    assert collection_name == "guru-mentor-sessions"
+    assert len(items) == 9
+    assert indexer.indexed == 3
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_flushed_after_interval():
+    client = FakeVectorClient()
+    indexer = make_indexer(client, [], batch_size=10, flush_interval_seconds=0.01)
+
+    indexer.enqueue(make_session("s1"))
+    await asyncio.wait_for(indexer.flush(), 1)
+
+    assert indexer.indexed == 1
+    await indexer.stop()
+
+
+@pytest.mark.asyncio
+async def test_drops_sessions_when_queue_is_full():
+    indexer = make_indexer(FakeVectorClient(), [], max_queue_size=1, flush_interval_seconds=0.01)
+
+    # The worker has not run yet, so the second session finds the queue full
+    assert indexer.enqueue(make_session("s1"))
+    assert not indexer.enqueue(make_session("s2"))
+    assert indexer.dropped == 1
+
+    await indexer.stop()
+    assert indexer.indexed == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_counted():
+    async def embed(texts):
+        return []
+
+    indexer = SessionIndexer(embed, FakeVectorClient(), flush_interval_seconds=0.01)
+    indexer.enqueue(make_session("s1"))
+    await indexer.stop()
+
+    assert indexer.failed == 1
+    assert indexer.indexed == 0
+
+
+@pytest.mark.asyncio
+async def test_reflected_session_reaches_the_vector_db(monkeypatch):
+    from core import mentor_loop
+    from core.session_store import InMemorySessionStore
+
+    client = FakeVectorClient()
+    calls = []
+
+    async def open_webui_embed(texts, prefix=None):
+        calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    monkeypatch.setattr(mentor_loop, "_get_session_vector_client", lambda: client)
+    app = SimpleNamespace(state=SimpleNamespace(EMBEDDING_FUNCTION=open_webui_embed))
+    orchestrator = mentor_loop.MentorLoopOrchestrator(
+        session_store=InMemorySessionStore(),
+        session_indexer=mentor_loop._create_session_indexer(app),
+    )
+
+    session = orchestrator.create_session("user", "general")
+    await orchestrator.stage_observe(session, "printer is offline")
+    session.reflection = "check the cable first"
+    await orchestrator.stage_reflect(session, "it worked")
+    await orchestrator.session_indexer.stop()
+
+    assert calls == [["printer is offline", "check the cable first"]]
+    collection_name, items = client.upserts[0]
+    assert collection_name == "guru-mentor-sessions"
+    assert [item["metadata"]["type"] for item in items] == ["problem", "principle"]
+
+
+@pytest.mark.asyncio
+async def test_endpoint_embedding_function():
+    web = pytest.importorskip("aiohttp.web")
+    from core.session_indexer import create_endpoint_embedding_function
+
+    requests = []
+
+    async def handle(request):
+        requests.append((await request.json(), request.headers.get("Authorization")))
+        return web.json_response(
+            {"data": [{"index": 1, "embedding": [2.0]}, {"index": 0, "embedding": [1.0]}]}
+        )
+
+    app = web.Application()
+    app.router.add_post("/v1/embeddings", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        embed = create_endpoint_embedding_function(
+            f"http://127.0.0.1:{port}/v1/", "nomic-embed-text", api_key="key"
+        )
+        assert await embed(["a", "b"]) == [[1.0], [2.0]]
+    finally:
+        await runner.cleanup()
+
+    assert requests == [({"model": "nomic-embed-text", "input": ["a", "b"]}, "Bearer key")]
+
+
+def test_no_embedding_source_means_no_indexer(monkeypatch):
+    from core import mentor_loop
+
+    monkeypatch.setattr(mentor_loop.GuruBackendConfig, "EMBEDDING_URL", "")
+    app = SimpleNamespace(state=SimpleNamespace())
+
+    assert mentor_loop._create_session_indexer(app) is None
+
+
+def test_chroma_client_upserts_items(tmp_path):
+    pytest.importorskip("chromadb")
+    from core.session_indexer import ChromaSessionVectorClient
+
+    client = ChromaSessionVectorClient(str(tmp_path))
+    item = {
+        "id": session_chunk_id("s1", "problem"),
+        "text": "problem",
+        "vector": [1.0, 0.0],
+        "metadata": {"sessionId": "s1"},
+    }
+    client.upsert("guru-mentor-sessions", [item])
+    client.upsert("guru-mentor-sessions", [{**item, "text": "updated"}])
+
+    stored = client.client.get_collection("guru-mentor-sessions").get()
+    assert stored["ids"] == [item["id"]]
+    assert stored["documents"] == ["updated"]
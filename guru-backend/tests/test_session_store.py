@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+from core.session_store import (
+    InMemorySessionStore,
+    RedisSessionStore,
+    SQLiteSessionStore,
+    create_session_store,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store(request):
+    if request.param == "memory":
+        return InMemorySessionStore(max_sessions=100, ttl_seconds=60)
+    if request.param == "sqlite":
+        return SQLiteSessionStore(":memory:", ttl_seconds=60)
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisSessionStore(client=fakeredis.FakeRedis(decode_responses=True), ttl_seconds=60)
+
+
+def test_round_trip(store):
+    assert store.get("s1") is None
+
+    store.put("s1", {"stage": "observe", "history": [1, 2]})
+    assert store.get("s1") == {"stage": "observe", "history": [1, 2]}
+    assert len(store) == 1
+
+    store.put("s1", {"stage": "frame"})
+    assert store.get("s1") == {"stage": "frame"}
+    assert len(store) == 1
+
+    store.delete("s1")
+    store.delete("missing")
+    assert store.get("s1") is None
+    assert len(store) == 0
+
+
+def test_in_memory_evicts_least_recently_used():
+    store = InMemorySessionStore(max_sessions=2, ttl_seconds=None)
+    store.put("a", {"n": 1})
+    store.put("b", {"n": 2})
+    # Reading "a" makes "b" the eviction candidate
+    store.get("a")
+    store.put("c", {"n": 3})
+
+    assert store.get("b") is None
+    assert store.get("a") == {"n": 1}
+    assert store.get("c") == {"n": 3}
+    assert len(store) == 2
+
+
+def test_in_memory_expires_idle_sessions(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    store = InMemorySessionStore(ttl_seconds=10)
+    store.put("a", {"n": 1})
+    store.put("b", {"n": 2})
+
+    now[0] += 8
+    assert store.get("a") == {"n": 1}
+
+    # "a" was refreshed by the read, "b" was not
+    now[0] += 5
+    assert store.get("b") is None
+    assert store.get("a") == {"n": 1}
+    assert len(store) == 1
+
+
+def test_sqlite_expires_sessions(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    store = SQLiteSessionStore(":memory:", ttl_seconds=10)
+    store.put("a", {"n": 1})
+
+    now[0] += 11
+    assert len(store) == 0
+    assert store.get("a") is None
+
+
+def test_redis_sets_and_refreshes_ttl():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis(decode_responses=True)
+    store = RedisSessionStore(client=client, ttl_seconds=30, key_prefix="test:")
+    store.put("a", {"n": 1})
+    assert 0 < client.ttl("test:a") <= 30
+
+    client.expire("test:a", 5)
+    store.get("a")
+    assert client.ttl("test:a") > 5
+
+
+def test_create_session_store_falls_back_to_memory():
+    assert isinstance(create_session_store("sqlite", path=":memory:"), SQLiteSessionStore)
+    assert isinstance(create_session_store("unknown"), InMemorySessionStore)
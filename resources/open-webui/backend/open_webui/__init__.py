@@ -99,5 +99,35 @@ def dev(
     )
 
 
+@app.command()
+def profile_imports(
+    module: str = "open_webui.main",
+    top: int = 25,
+    json_output: Annotated[bool, typer.Option("--json")] = False,
+    max_seconds: Optional[float] = None,
+):
+    """
+    Report per-module import cost of the backend (python -X importtime).
+
+    With --max-seconds, exits non-zero when the import is slower, so it can
+    be used as a startup benchmark in CI.
+    """
+    from open_webui.utils.import_profile import (
+        dump_report,
+        format_report,
+        profile_imports as run_profile,
+    )
+
+    report = run_profile(module)
+    typer.echo(dump_report(report) if json_output else format_report(report, top))
+
+    if max_seconds is not None and report["seconds"] > max_seconds:
+        typer.echo(
+            f"Import took {report['seconds']:.2f}s, over the {max_seconds:.2f}s budget",
+            err=True,
+        )
+        raise typer.Exit(code=1)
+
+
 if __name__ == "__main__":
     app()
@@ -2868,6 +2868,27 @@ RAG_RERANKING_MODEL_TRUST_REMOTE_CODE = (
     os.environ.get("RAG_RERANKING_MODEL_TRUST_REMOTE_CODE", "True").lower() == "true"
 )
 
+# Store ColBERT token embeddings per chunk at ingestion time so reranking only
+# has to encode the query
+RAG_COLBERT_PRECOMPUTE_EMBEDDINGS = (
+    os.environ.get("RAG_COLBERT_PRECOMPUTE_EMBEDDINGS", "False").lower() == "true"
+)
+
+RAG_COLBERT_EMBEDDINGS_DIR = os.environ.get(
+    "RAG_COLBERT_EMBEDDINGS_DIR", f"{CACHE_DIR}/colbert"
+)
+
+# Upper bound in MB on stored ColBERT embeddings; the least recently used are
+# evicted past it. Empty means unbounded
+RAG_COLBERT_EMBEDDINGS_MAX_SIZE = os.environ.get(
+    "RAG_COLBERT_EMBEDDINGS_MAX_SIZE", "10240"
+)
+RAG_COLBERT_EMBEDDINGS_MAX_SIZE = (
+    int(RAG_COLBERT_EMBEDDINGS_MAX_SIZE) * 1024 * 1024
+    if RAG_COLBERT_EMBEDDINGS_MAX_SIZE
+    else None
+)
+
 RAG_EXTERNAL_RERANKER_URL = PersistentConfig(
     "RAG_EXTERNAL_RERANKER_URL",
     "rag.external_reranker_url",
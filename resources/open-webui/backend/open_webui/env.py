@@ -519,6 +519,14 @@ OAUTH_SESSION_TOKEN_ENCRYPTION_KEY = os.environ.get(
     "OAUTH_SESSION_TOKEN_ENCRYPTION_KEY", WEBUI_SECRET_KEY
 )
 
+# Seconds a worker serves a decrypted OAuth session token from memory before
+# re-reading it from the database (sessions deleted elsewhere expire by then)
+OAUTH_SESSION_CACHE_TTL = os.environ.get("OAUTH_SESSION_CACHE_TTL", "60")
+try:
+    OAUTH_SESSION_CACHE_TTL = int(OAUTH_SESSION_CACHE_TTL)
+except ValueError:
+    OAUTH_SESSION_CACHE_TTL = 60
+
 ####################################
 # SCIM Configuration
 ####################################
@@ -611,6 +619,33 @@ else:
         CHAT_RESPONSE_MAX_TOOL_CALL_RETRIES = 30
 
 
+CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS = os.environ.get(
+    "CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS", "8"
+)
+
+if CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS == "":
+    CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS = 8
+else:
+    try:
+        CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS = max(
+            1, int(CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS)
+        )
+    except Exception:
+        CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS = 8
+
+
+# Per-tool-call timeout in seconds; empty means no timeout
+CHAT_RESPONSE_TOOL_CALL_TIMEOUT = os.environ.get("CHAT_RESPONSE_TOOL_CALL_TIMEOUT", "")
+
+if CHAT_RESPONSE_TOOL_CALL_TIMEOUT == "":
+    CHAT_RESPONSE_TOOL_CALL_TIMEOUT = None
+else:
+    try:
+        CHAT_RESPONSE_TOOL_CALL_TIMEOUT = float(CHAT_RESPONSE_TOOL_CALL_TIMEOUT)
+    except Exception:
+        CHAT_RESPONSE_TOOL_CALL_TIMEOUT = None
+
+
 CHAT_STREAM_RESPONSE_CHUNK_MAX_BUFFER_SIZE = os.environ.get(
     "CHAT_STREAM_RESPONSE_CHUNK_MAX_BUFFER_SIZE", ""
 )
@@ -626,6 +661,44 @@ else:
         CHAT_STREAM_RESPONSE_CHUNK_MAX_BUFFER_SIZE = None
 
 
+# Jupyter kernels kept per code interpreter server, including warm spares and
+# kernels pinned to a chat; 0 starts a fresh kernel for every execution.
+# Pools live in each worker process, so a Jupyter server may hold up to this
+# many kernels per worker and replica. Chat kernels (variables kept between a
+# chat's code blocks) are disabled when UVICORN_WORKERS > 1; with several
+# replicas, route a user's requests to one replica to keep them.
+CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE = os.environ.get(
+    "CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE", "8"
+)
+try:
+    CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE = int(
+        CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE
+    )
+except ValueError:
+    CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE = 8
+
+CODE_INTERPRETER_JUPYTER_KERNEL_POOL_MIN_IDLE = os.environ.get(
+    "CODE_INTERPRETER_JUPYTER_KERNEL_POOL_MIN_IDLE", "1"
+)
+try:
+    CODE_INTERPRETER_JUPYTER_KERNEL_POOL_MIN_IDLE = int(
+        CODE_INTERPRETER_JUPYTER_KERNEL_POOL_MIN_IDLE
+    )
+except ValueError:
+    CODE_INTERPRETER_JUPYTER_KERNEL_POOL_MIN_IDLE = 1
+
+# Seconds a chat's kernel (or an unused server's spares) survives without executions
+CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT = os.environ.get(
+    "CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT", "600"
+)
+try:
+    CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT = float(
+        CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT
+    )
+except ValueError:
+    CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT = 600.0
+
+
 ####################################
 # WEBSOCKET SUPPORT
 ####################################
@@ -687,6 +760,28 @@ try:
 except ValueError:
     WEBSOCKET_SERVER_PING_INTERVAL = 25
 
+# Seconds a worker may reuse a session's user record without asking Redis
+WEBSOCKET_SESSION_CACHE_TTL = os.environ.get("WEBSOCKET_SESSION_CACHE_TTL", "5")
+try:
+    WEBSOCKET_SESSION_CACHE_TTL = float(WEBSOCKET_SESSION_CACHE_TTL)
+except ValueError:
+    WEBSOCKET_SESSION_CACHE_TTL = 5.0
+
+# Collaborative documents keep a log of Yjs updates on top of a state snapshot.
+# Once the log reaches either threshold it is merged into the snapshot, so
+# loading a document costs its size rather than its edit history.
+YDOC_COMPACTION_UPDATE_COUNT = os.environ.get("YDOC_COMPACTION_UPDATE_COUNT", "500")
+try:
+    YDOC_COMPACTION_UPDATE_COUNT = int(YDOC_COMPACTION_UPDATE_COUNT)
+except ValueError:
+    YDOC_COMPACTION_UPDATE_COUNT = 500
+
+YDOC_COMPACTION_BYTES = os.environ.get("YDOC_COMPACTION_BYTES", "1048576")
+try:
+    YDOC_COMPACTION_BYTES = int(YDOC_COMPACTION_BYTES)
+except ValueError:
+    YDOC_COMPACTION_BYTES = 1048576
+
 
 REQUESTS_VERIFY = os.environ.get("REQUESTS_VERIFY", "True").lower() == "true"
 
@@ -738,6 +833,17 @@ AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL", "True").lower() == "true"
 )
 
+# Pipeline inlet/outlet filter hops; defaults to AIOHTTP_CLIENT_TIMEOUT
+AIOHTTP_CLIENT_TIMEOUT_PIPELINE = os.environ.get("AIOHTTP_CLIENT_TIMEOUT_PIPELINE", "")
+
+if AIOHTTP_CLIENT_TIMEOUT_PIPELINE == "":
+    AIOHTTP_CLIENT_TIMEOUT_PIPELINE = AIOHTTP_CLIENT_TIMEOUT
+else:
+    try:
+        AIOHTTP_CLIENT_TIMEOUT_PIPELINE = int(AIOHTTP_CLIENT_TIMEOUT_PIPELINE)
+    except Exception:
+        AIOHTTP_CLIENT_TIMEOUT_PIPELINE = AIOHTTP_CLIENT_TIMEOUT
+
 
 ####################################
 # SENTENCE TRANSFORMERS
@@ -793,6 +899,56 @@ SENTENCE_TRANSFORMERS_CROSS_ENCODER_SIGMOID_ACTIVATION_FUNCTION = (
     == "true"
 )
 
+# Maximum number of document/query embeddings kept in the in-process cache used
+# when scoring hybrid search candidates without a reranker. Set to 0 to disable.
+RAG_EMBEDDING_CACHE_SIZE = os.environ.get("RAG_EMBEDDING_CACHE_SIZE", "4096")
+
+if RAG_EMBEDDING_CACHE_SIZE == "":
+    RAG_EMBEDDING_CACHE_SIZE = 0
+else:
+    try:
+        RAG_EMBEDDING_CACHE_SIZE = int(RAG_EMBEDDING_CACHE_SIZE)
+    except Exception:
+        RAG_EMBEDDING_CACHE_SIZE = 4096
+
+# Local (SentenceTransformers) embedding requests from concurrent coroutines are
+# queued and encoded together in micro-batches of up to this many texts, waiting
+# at most RAG_EMBEDDING_BATCH_MAX_WAIT_MS for a batch to fill. Set the wait to 0
+# to encode every request on its own.
+RAG_EMBEDDING_BATCH_MAX_SIZE = os.environ.get("RAG_EMBEDDING_BATCH_MAX_SIZE", "64")
+
+if RAG_EMBEDDING_BATCH_MAX_SIZE == "":
+    RAG_EMBEDDING_BATCH_MAX_SIZE = 64
+else:
+    try:
+        RAG_EMBEDDING_BATCH_MAX_SIZE = max(int(RAG_EMBEDDING_BATCH_MAX_SIZE), 1)
+    except Exception:
+        RAG_EMBEDDING_BATCH_MAX_SIZE = 64
+
+RAG_EMBEDDING_BATCH_MAX_WAIT_MS = os.environ.get("RAG_EMBEDDING_BATCH_MAX_WAIT_MS", "5")
+
+if RAG_EMBEDDING_BATCH_MAX_WAIT_MS == "":
+    RAG_EMBEDDING_BATCH_MAX_WAIT_MS = 0.0
+else:
+    try:
+        RAG_EMBEDDING_BATCH_MAX_WAIT_MS = max(
+            float(RAG_EMBEDDING_BATCH_MAX_WAIT_MS), 0.0
+        )
+    except Exception:
+        RAG_EMBEDDING_BATCH_MAX_WAIT_MS = 5.0
+
+# Number of users whose memory vectors are kept in process for chat memory
+# lookups. Set to 0 to rebuild the per-user matrix on every query.
+MEMORY_INDEX_CACHE_SIZE = os.environ.get("MEMORY_INDEX_CACHE_SIZE", "1000")
+
+if MEMORY_INDEX_CACHE_SIZE == "":
+    MEMORY_INDEX_CACHE_SIZE = 0
+else:
+    try:
+        MEMORY_INDEX_CACHE_SIZE = int(MEMORY_INDEX_CACHE_SIZE)
+    except Exception:
+        MEMORY_INDEX_CACHE_SIZE = 1000
+
 ####################################
 # OFFLINE_MODE
 ####################################
@@ -842,6 +998,18 @@ AUDIT_EXCLUDED_PATHS = os.getenv("AUDIT_EXCLUDED_PATHS", "/chats,/chat,/folders"
 AUDIT_EXCLUDED_PATHS = [path.strip() for path in AUDIT_EXCLUDED_PATHS]
 AUDIT_EXCLUDED_PATHS = [path.lstrip("/") for path in AUDIT_EXCLUDED_PATHS]
 
+# Audit entries are written by a background task; when the queue is full new
+# entries are dropped (and counted) instead of slowing down requests
+try:
+    AUDIT_LOG_QUEUE_SIZE = int(os.environ.get("AUDIT_LOG_QUEUE_SIZE") or 10000)
+except ValueError:
+    AUDIT_LOG_QUEUE_SIZE = 10000
+
+try:
+    AUDIT_LOG_BATCH_SIZE = int(os.environ.get("AUDIT_LOG_BATCH_SIZE") or 100)
+except ValueError:
+    AUDIT_LOG_BATCH_SIZE = 100
+
 
 ####################################
 # OPENTELEMETRY
@@ -13,6 +13,7 @@ from uuid import uuid4
 
 
 from contextlib import asynccontextmanager
+from functools import partial
 from urllib.parse import urlencode, parse_qs, urlparse
 from pydantic import BaseModel
 from sqlalchemy import text
@@ -58,7 +59,11 @@ from starsessions import (
 from starsessions.stores.redis import RedisStore
 
 from open_webui.utils import logger
-from open_webui.utils.audit import AuditLevel, AuditLoggingMiddleware
+from open_webui.utils.audit import (
+    AUDIT_LOG_WRITER,
+    AuditLevel,
+    AuditLoggingMiddleware,
+)
 from open_webui.utils.logger import start_logger
 from open_webui.socket.main import (
     MODELS,
@@ -101,6 +106,7 @@ from open_webui.routers.retrieval import (
     get_ef,
     get_rf,
 )
+from open_webui.retrieval.models.lazy import LazyModel
 
 
 from sqlalchemy.orm import Session
@@ -505,6 +511,7 @@ from open_webui.utils.chat import (
     chat_action as chat_action_handler,
 )
 from open_webui.utils.embeddings import generate_embeddings
+from open_webui.utils.code_interpreter import JUPYTER_KERNEL_POOLS
 from open_webui.utils.middleware import process_chat_payload, process_chat_response
 from open_webui.utils.access_control import has_access
 
@@ -599,10 +606,18 @@ async def lifespan(app: FastAPI):
             # Disable signup since we now have an admin
             app.state.config.ENABLE_SIGNUP = False
 
-    # This should be blocking (sync) so functions are not deactivated on first /get_models calls
-    # when the first user lands on the / route.
+    # Finishes before serving: a function or tool imported before its
+    # requirements are installed would be deactivated. Restarts with an
+    # unchanged requirement set skip pip, so this is quick.
     log.info("Installing external dependencies of functions and tools...")
-    install_tool_and_function_dependencies()
+    await asyncio.to_thread(install_tool_and_function_dependencies)
+
+    # Kept on app.state so the tasks are not garbage collected mid-load
+    app.state.model_load_tasks = [
+        asyncio.create_task(model.load_async())
+        for model in (app.state.ef, app.state.rf)
+        if isinstance(model, LazyModel)
+    ]
 
     app.state.redis = get_redis_connection(
         redis_url=REDIS_URL,
@@ -650,6 +665,10 @@ async def lifespan(app: FastAPI):
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    await AUDIT_LOG_WRITER.stop()
+    await pipelines.PIPELINE_CLIENT.close()
+    await JUPYTER_KERNEL_POOLS.close()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -1022,26 +1041,43 @@ app.state.rf = None
 app.state.YOUTUBE_LOADER_TRANSLATION = None
 
 
-try:
-    app.state.ef = get_ef(
-        app.state.config.RAG_EMBEDDING_ENGINE, app.state.config.RAG_EMBEDDING_MODEL
+# Local embedding and reranking weights are loaded in the background (see
+# lifespan) so the server accepts traffic immediately; /health/ready reports
+# when they are available.
+if app.state.config.RAG_EMBEDDING_ENGINE == "" and app.state.config.RAG_EMBEDDING_MODEL:
+    app.state.ef = LazyModel(
+        "embedding",
+        partial(
+            get_ef,
+            app.state.config.RAG_EMBEDDING_ENGINE,
+            app.state.config.RAG_EMBEDDING_MODEL,
+        ),
+        warmup=lambda ef: ef.encode(["warmup"]),
     )
-    if (
-        app.state.config.ENABLE_RAG_HYBRID_SEARCH
-        and not app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
-    ):
-        app.state.rf = get_rf(
-            app.state.config.RAG_RERANKING_ENGINE,
-            app.state.config.RAG_RERANKING_MODEL,
-            app.state.config.RAG_EXTERNAL_RERANKER_URL,
-            app.state.config.RAG_EXTERNAL_RERANKER_API_KEY,
-            app.state.config.RAG_EXTERNAL_RERANKER_TIMEOUT,
+
+if (
+    app.state.config.ENABLE_RAG_HYBRID_SEARCH
+    and not app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
+):
+    rf_loader = partial(
+        get_rf,
+        app.state.config.RAG_RERANKING_ENGINE,
+        app.state.config.RAG_RERANKING_MODEL,
+        app.state.config.RAG_EXTERNAL_RERANKER_URL,
+        app.state.config.RAG_EXTERNAL_RERANKER_API_KEY,
+        app.state.config.RAG_EXTERNAL_RERANKER_TIMEOUT,
+    )
+    if app.state.config.RAG_RERANKING_ENGINE == "external":
+        try:
+            app.state.rf = rf_loader()
+        except Exception as e:
+            log.error(f"Error updating models: {e}")
+    elif app.state.config.RAG_RERANKING_MODEL:
+        app.state.rf = LazyModel(
+            "reranking",
+            rf_loader,
+            warmup=lambda rf: rf.predict([("warmup", "warmup")]),
         )
-    else:
-        app.state.rf = None
-except Exception as e:
-    log.error(f"Error updating models: {e}")
-    pass
 
 
 app.state.EMBEDDING_FUNCTION = get_embedding_function(
@@ -2117,7 +2153,7 @@ async def get_current_usage(user=Depends(get_verified_user)):
             )
 
         return {
-            "model_ids": get_models_in_use(),
+            "model_ids": await get_models_in_use(),
             "user_count": Users.get_active_user_count(),
         }
     except HTTPException:
@@ -2378,6 +2414,26 @@ async def healthcheck():
     return {"status": True}
 
 
+@app.get("/health/ready")
+async def readiness_check():
+    checks = {
+        "embedding_model": (
+            app.state.ef.status if isinstance(app.state.ef, LazyModel) else "ready"
+        ),
+        "reranking_model": (
+            app.state.rf.status if isinstance(app.state.rf, LazyModel) else "ready"
+        ),
+    }
+    # A model that failed to load does not block readiness, matching startup
+    # behavior before models were loaded in the background. A failed reranker
+    # falls back to cosine scoring.
+    ready = all(status != "loading" for status in checks.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": ready, **checks},
+    )
+
+
 @app.get("/health/db")
 async def healthcheck_with_db():
     ScopedSession.execute(text("SELECT 1;")).all()
@@ -0,0 +1,32 @@
+"""Add embedding columns to memory table
+
+Revision ID: 4b2e9d7c1a8f
+Revises: c440947495f3
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4b2e9d7c1a8f"
+down_revision: Union[str, None] = "c440947495f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Memory vectors are stored with the memory itself and searched in process
+    with op.batch_alter_table("memory", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("embedding", sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column("embedding_model", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("memory", schema=None) as batch_op:
+        batch_op.drop_column("embedding_model")
+        batch_op.drop_column("embedding")
@@ -0,0 +1,32 @@
+"""Add memory_version table
+
+Revision ID: 5c8a1f3e9b27
+Revises: b3f8c1d7e2a6
+Create Date: 2026-10-19 18:02:37.415926
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5c8a1f3e9b27"
+down_revision: Union[str, None] = "b3f8c1d7e2a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A user without a row reads as version 0
+    op.create_table(
+        "memory_version",
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("memory_version")
@@ -0,0 +1,61 @@
+"""Add materialized feedback leaderboard tables
+
+Revision ID: 6e1c4f8a2d95
+Revises: 9d3f6a2b8c41
+Create Date: 2026-10-19 15:02:17.604518
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "6e1c4f8a2d95"
+down_revision: Union[str, None] = "9d3f6a2b8c41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "feedback_model_stat",
+        sa.Column("model_id", sa.Text(), primary_key=True, nullable=False),
+        sa.Column("rating", sa.Float(), nullable=False),
+        sa.Column("won", sa.BigInteger(), nullable=False),
+        sa.Column("lost", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+
+    op.create_table(
+        "feedback_model_daily",
+        sa.Column("model_id", sa.Text(), nullable=False),
+        sa.Column("date", sa.Text(), nullable=False),
+        sa.Column("won", sa.BigInteger(), nullable=False),
+        sa.Column("lost", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("model_id", "date", name="pk_feedback_model_daily"),
+    )
+
+    op.create_table(
+        "feedback_model_tag",
+        sa.Column("model_id", sa.Text(), nullable=False),
+        sa.Column("tag", sa.Text(), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("model_id", "tag", name="pk_feedback_model_tag"),
+    )
+
+    # No state row yet: the first leaderboard read rebuilds from existing feedback
+    op.create_table(
+        "feedback_leaderboard_state",
+        sa.Column("id", sa.Text(), primary_key=True, nullable=False),
+        sa.Column("stale", sa.Boolean(), nullable=False),
+        sa.Column("rebuilt_at", sa.BigInteger(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("feedback_leaderboard_state")
+    op.drop_table("feedback_model_tag")
+    op.drop_table("feedback_model_daily")
+    op.drop_table("feedback_model_stat")
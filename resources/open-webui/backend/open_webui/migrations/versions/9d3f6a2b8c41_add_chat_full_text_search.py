@@ -0,0 +1,217 @@
+"""Add full-text search index for chats
+
+Revision ID: 9d3f6a2b8c41
+Revises: 4b2e9d7c1a8f
+Create Date: 2026-10-19 14:03:27.511870
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d3f6a2b8c41"
+down_revision: Union[str, None] = "4b2e9d7c1a8f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Concatenated text of a chat's messages (string contents only)
+SQLITE_CONTENT_SQL = """
+(
+    SELECT group_concat(
+        CASE WHEN message.type = 'object' THEN
+            CASE WHEN json_type(message.value, '$.content') = 'text'
+                THEN json_extract(message.value, '$.content')
+            END
+        END,
+        ' '
+    )
+    FROM json_each(
+        CASE WHEN json_valid({chat}) THEN {chat} ELSE '{{}}' END, '$.messages'
+    ) AS message
+)
+"""
+
+
+def upgrade_sqlite(conn):
+    try:
+        # chat_search holds the indexed text with a stable integer rowid, and
+        # chat_fts is an external-content FTS5 index over it. The trigram
+        # tokenizer matches substrings, like the LIKE search it replaces, and
+        # works for scripts that aren't delimited by spaces (e.g. CJK)
+        conn.execute(
+            sa.text(
+                """
+                CREATE TABLE IF NOT EXISTS chat_search (
+                    rowid INTEGER PRIMARY KEY,
+                    chat_id TEXT NOT NULL UNIQUE,
+                    title TEXT,
+                    content TEXT
+                )
+                """
+            )
+        )
+        conn.execute(
+            sa.text(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS chat_fts USING fts5(
+                    title,
+                    content,
+                    content='chat_search',
+                    content_rowid='rowid',
+                    tokenize='trigram'
+                )
+                """
+            )
+        )
+    except Exception as e:
+        # SQLite built without FTS5 or older than 3.34 (no trigram tokenizer):
+        # chat search keeps using LIKE scans
+        print(f"Skipping chat full-text index, FTS5 trigram is not available: {e}")
+        conn.execute(sa.text("DROP TABLE IF EXISTS chat_search"))
+        return
+
+    new_content = SQLITE_CONTENT_SQL.format(chat="NEW.chat")
+    statements = [
+        # chat -> chat_search
+        f"""
+        CREATE TRIGGER IF NOT EXISTS chat_search_ai AFTER INSERT ON chat BEGIN
+            INSERT INTO chat_search (chat_id, title, content)
+            VALUES (NEW.id, NEW.title, {new_content});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS chat_search_au AFTER UPDATE OF title, chat ON chat BEGIN
+            DELETE FROM chat_search WHERE chat_id = OLD.id;
+            INSERT INTO chat_search (chat_id, title, content)
+            VALUES (NEW.id, NEW.title, {new_content});
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS chat_search_ad AFTER DELETE ON chat BEGIN
+            DELETE FROM chat_search WHERE chat_id = OLD.id;
+        END
+        """,
+        # chat_search -> chat_fts
+        """
+        CREATE TRIGGER IF NOT EXISTS chat_fts_ai AFTER INSERT ON chat_search BEGIN
+            INSERT INTO chat_fts (rowid, title, content)
+            VALUES (NEW.rowid, NEW.title, NEW.content);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS chat_fts_ad AFTER DELETE ON chat_search BEGIN
+            INSERT INTO chat_fts (chat_fts, rowid, title, content)
+            VALUES ('delete', OLD.rowid, OLD.title, OLD.content);
+        END
+        """,
+        # Backfill existing chats
+        f"""
+        INSERT INTO chat_search (chat_id, title, content)
+        SELECT id, title, {SQLITE_CONTENT_SQL.format(chat="chat.chat")} FROM chat
+        WHERE id NOT IN (SELECT chat_id FROM chat_search)
+        """,
+    ]
+    for statement in statements:
+        conn.execute(sa.text(statement))
+
+
+def upgrade_postgresql(conn):
+    try:
+        # Savepoint: without the privilege to create pg_trgm, the migration
+        # carries on and chat search keeps using LIKE scans
+        with conn.begin_nested():
+            conn.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except Exception as e:
+        print(f"Skipping chat full-text index, pg_trgm is not available: {e}")
+        return
+
+    conn.execute(
+        sa.text(
+            """
+            CREATE OR REPLACE FUNCTION chat_search_text(title text, chat json)
+            RETURNS text AS $$
+            BEGIN
+                RETURN lower(
+                    coalesce(title, '') || ' ' || coalesce((
+                        SELECT string_agg(message->>'content', ' ')
+                        FROM json_array_elements(chat->'messages') AS message
+                        WHERE json_typeof(message->'content') = 'string'
+                    ), '')
+                );
+            EXCEPTION WHEN others THEN
+                -- Malformed messages or unsupported escapes: index the title only
+                RETURN lower(coalesce(title, ''));
+            END;
+            $$ LANGUAGE plpgsql IMMUTABLE
+            """
+        )
+    )
+    conn.execute(
+        sa.text(
+            """
+            CREATE OR REPLACE FUNCTION chat_search_text_trigger() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_text := chat_search_text(NEW.title, NEW.chat::json);
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+    )
+
+    conn.execute(sa.text("ALTER TABLE chat ADD COLUMN IF NOT EXISTS search_text text"))
+    conn.execute(
+        sa.text("UPDATE chat SET search_text = chat_search_text(title, chat::json)")
+    )
+    # Trigram index: serves substring LIKE filters, including CJK text that
+    # to_tsvector can't split into words
+    conn.execute(
+        sa.text(
+            "CREATE INDEX IF NOT EXISTS chat_search_text_idx ON chat "
+            "USING GIN (search_text gin_trgm_ops)"
+        )
+    )
+    conn.execute(sa.text("DROP TRIGGER IF EXISTS chat_search_text_update ON chat"))
+    conn.execute(
+        sa.text(
+            """
+            CREATE TRIGGER chat_search_text_update
+            BEFORE INSERT OR UPDATE OF title, chat ON chat
+            FOR EACH ROW EXECUTE FUNCTION chat_search_text_trigger()
+            """
+        )
+    )
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == "sqlite":
+        upgrade_sqlite(conn)
+    elif conn.dialect.name == "postgresql":
+        upgrade_postgresql(conn)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == "sqlite":
+        for trigger in [
+            "chat_search_ai",
+            "chat_search_au",
+            "chat_search_ad",
+            "chat_fts_ai",
+            "chat_fts_ad",
+        ]:
+            conn.execute(sa.text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        conn.execute(sa.text("DROP TABLE IF EXISTS chat_fts"))
+        conn.execute(sa.text("DROP TABLE IF EXISTS chat_search"))
+    elif conn.dialect.name == "postgresql":
+        conn.execute(sa.text("DROP TRIGGER IF EXISTS chat_search_text_update ON chat"))
+        conn.execute(sa.text("DROP INDEX IF EXISTS chat_search_text_idx"))
+        conn.execute(sa.text("ALTER TABLE chat DROP COLUMN IF EXISTS search_text"))
+        conn.execute(sa.text("DROP FUNCTION IF EXISTS chat_search_text_trigger()"))
+        conn.execute(sa.text("DROP FUNCTION IF EXISTS chat_search_text(text, json)"))
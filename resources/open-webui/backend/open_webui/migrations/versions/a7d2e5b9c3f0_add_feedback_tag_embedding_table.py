@@ -0,0 +1,34 @@
+"""Add feedback_tag_embedding table
+
+Revision ID: a7d2e5b9c3f0
+Revises: 6e1c4f8a2d95
+Create Date: 2026-10-19 16:21:44.092731
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d2e5b9c3f0"
+down_revision: Union[str, None] = "6e1c4f8a2d95"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tags are embedded lazily, so existing feedback needs no backfill
+    op.create_table(
+        "feedback_tag_embedding",
+        sa.Column("model", sa.Text(), nullable=False),
+        sa.Column("tag", sa.Text(), nullable=False),
+        sa.Column("embedding", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint("model", "tag", name="pk_feedback_tag_embedding"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("feedback_tag_embedding")
@@ -0,0 +1,206 @@
+"""Add full-text search index for notes
+
+Revision ID: b3f8c1d7e2a6
+Revises: a7d2e5b9c3f0
+Create Date: 2026-10-19 17:08:12.640218
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b3f8c1d7e2a6"
+down_revision: Union[str, None] = "a7d2e5b9c3f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Markdown content of a note (data.content.md), if it is a string
+SQLITE_CONTENT_SQL = """
+(
+    CASE WHEN json_valid({data})
+        AND json_type({data}, '$.content.md') = 'text'
+        THEN json_extract({data}, '$.content.md')
+    END
+)
+"""
+
+
+def upgrade_sqlite(conn):
+    try:
+        # note_search holds the indexed text with a stable integer rowid, and
+        # note_fts is an external-content FTS5 index over it. The trigram
+        # tokenizer matches substrings, like the ilike search it replaces, and
+        # works for scripts that aren't delimited by spaces (e.g. CJK)
+        conn.execute(
+            sa.text(
+                """
+                CREATE TABLE IF NOT EXISTS note_search (
+                    rowid INTEGER PRIMARY KEY,
+                    note_id TEXT NOT NULL UNIQUE,
+                    title TEXT,
+                    content TEXT
+                )
+                """
+            )
+        )
+        conn.execute(
+            sa.text(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS note_fts USING fts5(
+                    title,
+                    content,
+                    content='note_search',
+                    content_rowid='rowid',
+                    tokenize='trigram'
+                )
+                """
+            )
+        )
+    except Exception as e:
+        # SQLite built without FTS5 or older than 3.34 (no trigram tokenizer):
+        # note search keeps using LIKE scans
+        print(f"Skipping note full-text index, FTS5 trigram is not available: {e}")
+        conn.execute(sa.text("DROP TABLE IF EXISTS note_search"))
+        return
+
+    new_content = SQLITE_CONTENT_SQL.format(data="NEW.data")
+    statements = [
+        # note -> note_search
+        f"""
+        CREATE TRIGGER IF NOT EXISTS note_search_ai AFTER INSERT ON note BEGIN
+            INSERT INTO note_search (note_id, title, content)
+            VALUES (NEW.id, NEW.title, {new_content});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS note_search_au AFTER UPDATE OF title, data ON note BEGIN
+            DELETE FROM note_search WHERE note_id = OLD.id;
+            INSERT INTO note_search (note_id, title, content)
+            VALUES (NEW.id, NEW.title, {new_content});
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS note_search_ad AFTER DELETE ON note BEGIN
+            DELETE FROM note_search WHERE note_id = OLD.id;
+        END
+        """,
+        # note_search -> note_fts
+        """
+        CREATE TRIGGER IF NOT EXISTS note_fts_ai AFTER INSERT ON note_search BEGIN
+            INSERT INTO note_fts (rowid, title, content)
+            VALUES (NEW.rowid, NEW.title, NEW.content);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS note_fts_ad AFTER DELETE ON note_search BEGIN
+            INSERT INTO note_fts (note_fts, rowid, title, content)
+            VALUES ('delete', OLD.rowid, OLD.title, OLD.content);
+        END
+        """,
+        # Backfill existing notes
+        f"""
+        INSERT INTO note_search (note_id, title, content)
+        SELECT id, title, {SQLITE_CONTENT_SQL.format(data="note.data")} FROM note
+        WHERE id NOT IN (SELECT note_id FROM note_search)
+        """,
+    ]
+    for statement in statements:
+        conn.execute(sa.text(statement))
+
+
+def upgrade_postgresql(conn):
+    try:
+        # Savepoint: without the privilege to create pg_trgm, the migration
+        # carries on and note search keeps using LIKE scans
+        with conn.begin_nested():
+            conn.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except Exception as e:
+        print(f"Skipping note full-text index, pg_trgm is not available: {e}")
+        return
+
+    conn.execute(
+        sa.text(
+            """
+            CREATE OR REPLACE FUNCTION note_search_text(title text, data json)
+            RETURNS text AS $$
+            BEGIN
+                RETURN lower(
+                    coalesce(title, '') || ' ' || coalesce(data->'content'->>'md', '')
+                );
+            EXCEPTION WHEN others THEN
+                -- Malformed data or unsupported escapes: index the title only
+                RETURN lower(coalesce(title, ''));
+            END;
+            $$ LANGUAGE plpgsql IMMUTABLE
+            """
+        )
+    )
+    conn.execute(
+        sa.text(
+            """
+            CREATE OR REPLACE FUNCTION note_search_text_trigger() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_text := note_search_text(NEW.title, NEW.data::json);
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+    )
+
+    conn.execute(sa.text("ALTER TABLE note ADD COLUMN IF NOT EXISTS search_text text"))
+    conn.execute(
+        sa.text("UPDATE note SET search_text = note_search_text(title, data::json)")
+    )
+    # Trigram index: serves substring LIKE filters, including CJK text that
+    # to_tsvector can't split into words
+    conn.execute(
+        sa.text(
+            "CREATE INDEX IF NOT EXISTS note_search_text_idx ON note "
+            "USING GIN (search_text gin_trgm_ops)"
+        )
+    )
+    conn.execute(sa.text("DROP TRIGGER IF EXISTS note_search_text_update ON note"))
+    conn.execute(
+        sa.text(
+            """
+            CREATE TRIGGER note_search_text_update
+            BEFORE INSERT OR UPDATE OF title, data ON note
+            FOR EACH ROW EXECUTE FUNCTION note_search_text_trigger()
+            """
+        )
+    )
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == "sqlite":
+        upgrade_sqlite(conn)
+    elif conn.dialect.name == "postgresql":
+        upgrade_postgresql(conn)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == "sqlite":
+        for trigger in [
+            "note_search_ai",
+            "note_search_au",
+            "note_search_ad",
+            "note_fts_ai",
+            "note_fts_ad",
+        ]:
+            conn.execute(sa.text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        conn.execute(sa.text("DROP TABLE IF EXISTS note_fts"))
+        conn.execute(sa.text("DROP TABLE IF EXISTS note_search"))
+    elif conn.dialect.name == "postgresql":
+        conn.execute(sa.text("DROP TRIGGER IF EXISTS note_search_text_update ON note"))
+        conn.execute(sa.text("DROP INDEX IF EXISTS note_search_text_idx"))
+        conn.execute(sa.text("ALTER TABLE note DROP COLUMN IF EXISTS search_text"))
+        conn.execute(sa.text("DROP FUNCTION IF EXISTS note_search_text_trigger()"))
+        conn.execute(sa.text("DROP FUNCTION IF EXISTS note_search_text(text, json)"))
@@ -1,10 +1,11 @@
 import logging
 import json
+import re
 import time
 import uuid
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.folders import Folders
@@ -15,6 +16,7 @@ from sqlalchemy import (
     BigInteger,
     Boolean,
     Column,
+    Float,
     ForeignKey,
     String,
     Text,
@@ -24,7 +26,7 @@ from sqlalchemy import (
 )
 from sqlalchemy import or_, func, select, and_, text
 from sqlalchemy.sql import exists
-from sqlalchemy.sql.expression import bindparam
+from sqlalchemy.sql.expression import bindparam, literal_column
 
 ####################
 # Chat DB Schema
@@ -32,6 +34,10 @@ from sqlalchemy.sql.expression import bindparam
 
 log = logging.getLogger(__name__)
 
+# Whether the full-text index maintained by triggers (see the
+# "Add full-text search index for chats" migration) exists, per database URL
+FULL_TEXT_INDEX_AVAILABLE = {}
+
 
 class Chat(Base):
     __tablename__ = "chat"
@@ -85,6 +91,26 @@ class ChatModel(BaseModel):
     folder_id: Optional[str] = None
 
 
+class ChatListItemModel(BaseModel):
+    """Chat without its message history, for list and search views."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    user_id: str
+    title: str
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+    share_id: Optional[str] = None
+    archived: bool = False
+    pinned: Optional[bool] = False
+
+    meta: dict = {}
+    folder_id: Optional[str] = None
+
+
 class ChatFile(Base):
     __tablename__ = "chat_file"
 
@@ -254,6 +280,23 @@ class ChatStatsExport(BaseModel):
 
 
 class ChatTable:
+    def _query_chat_list(self, db: Session):
+        # Never selects the chat column, which holds the full message history
+        return db.query(Chat).options(
+            load_only(
+                Chat.id,
+                Chat.user_id,
+                Chat.title,
+                Chat.created_at,
+                Chat.updated_at,
+                Chat.share_id,
+                Chat.archived,
+                Chat.pinned,
+                Chat.meta,
+                Chat.folder_id,
+            )
+        )
+
     def _clean_null_bytes(self, obj):
         """Recursively remove null bytes from strings in dict/list structures."""
         return sanitize_data_for_db(obj)
@@ -402,12 +445,15 @@ class ChatTable:
             self.add_chat_tag_by_id_and_user_id_and_tag_name(id, user.id, tag_name)
         return self.get_chat_by_id(id)
 
-    def get_chat_title_by_id(self, id: str) -> Optional[str]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+    def get_chat_title_by_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[str]:
+        with get_db_context(db) as db:
+            row = db.query(Chat.title).filter_by(id=id).first()
+            if row is None:
+                return None
 
-        return chat.chat.get("title", "New Chat")
+            return row[0] or "New Chat"
 
     def get_messages_map_by_chat_id(self, id: str) -> Optional[dict]:
         chat = self.get_chat_by_id(id)
@@ -641,10 +687,10 @@ class ChatTable:
         skip: int = 0,
         limit: int = 50,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemModel]:
 
         with get_db_context(db) as db:
-            query = db.query(Chat).filter_by(user_id=user_id, archived=True)
+            query = self._query_chat_list(db).filter_by(user_id=user_id, archived=True)
 
             if filter:
                 query_key = filter.get("query")
@@ -673,7 +719,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatListItemModel.model_validate(chat) for chat in all_chats]
 
     def get_chat_list_by_user_id(
         self,
@@ -683,9 +729,9 @@ class ChatTable:
         skip: int = 0,
         limit: int = 50,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemModel]:
         with get_db_context(db) as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
+            query = self._query_chat_list(db).filter_by(user_id=user_id)
             if not include_archived:
                 query = query.filter_by(archived=False)
 
@@ -713,7 +759,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatListItemModel.model_validate(chat) for chat in all_chats]
 
     def get_chat_title_id_list_by_user_id(
         self,
@@ -880,14 +926,14 @@ class ChatTable:
 
     def get_pinned_chats_by_user_id(
         self, user_id: str, db: Optional[Session] = None
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemModel]:
         with get_db_context(db) as db:
             all_chats = (
-                db.query(Chat)
+                self._query_chat_list(db)
                 .filter_by(user_id=user_id, pinned=True, archived=False)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatListItemModel.model_validate(chat) for chat in all_chats]
 
     def get_archived_chats_by_user_id(
         self, user_id: str, db: Optional[Session] = None
@@ -900,6 +946,41 @@ class ChatTable:
             )
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
+    def _has_full_text_index(self, db: Session) -> bool:
+        key = str(db.bind.url)
+        if key not in FULL_TEXT_INDEX_AVAILABLE:
+            dialect_name = db.bind.dialect.name
+            try:
+                if dialect_name == "sqlite":
+                    # Triggers are checked rather than the table: rebuilding the
+                    # chat table (e.g. SQLite batch migrations) drops them
+                    count = db.execute(
+                        text(
+                            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' "
+                            "AND name IN ('chat_search_ai', 'chat_search_au', 'chat_search_ad')"
+                        )
+                    ).scalar()
+                    available = count == 3
+                elif dialect_name == "postgresql":
+                    available = (
+                        db.execute(
+                            text(
+                                "SELECT 1 FROM pg_trigger WHERE tgname = 'chat_search_text_update'"
+                            )
+                        ).first()
+                        is not None
+                    )
+                else:
+                    available = False
+            except Exception as e:
+                log.debug(f"Full-text index check failed: {e}")
+                available = False
+
+            if not available:
+                log.info("Chat full-text index not found, searching with LIKE")
+            FULL_TEXT_INDEX_AVAILABLE[key] = available
+        return FULL_TEXT_INDEX_AVAILABLE[key]
+
     def get_chats_by_user_id_and_search_text(
         self,
         user_id: str,
@@ -908,9 +989,13 @@ class ChatTable:
         skip: int = 0,
         limit: int = 60,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemModel]:
         """
-        Filters chats based on a search query using Python, allowing pagination using skip and limit.
+        Filters chats based on a search query, allowing pagination using skip and limit.
+
+        When the full-text index is available, words match by prefix against
+        titles and message contents and results are ranked by relevance;
+        otherwise the query is matched as a substring.
         """
         search_text = sanitize_text_for_db(search_text).lower().strip()
 
@@ -970,9 +1055,10 @@ class ChatTable:
         ]
 
         search_text = " ".join(search_text_words)
+        search_terms = re.findall(r"\w+", search_text)
 
         with get_db_context(db) as db:
-            query = db.query(Chat).filter(Chat.user_id == user_id)
+            query = self._query_chat_list(db).filter(Chat.user_id == user_id)
 
             if is_archived is not None:
                 query = query.filter(Chat.archived == is_archived)
@@ -991,11 +1077,52 @@ class ChatTable:
             if folder_ids:
                 query = query.filter(Chat.folder_id.in_(folder_ids))
 
-            query = query.order_by(Chat.updated_at.desc())
+            # The trigram index can't match terms shorter than 3 characters
+            # (e.g. two CJK characters), so those searches scan with LIKE
+            use_full_text_index = (
+                bool(search_terms)
+                and all(len(term) >= 3 for term in search_terms)
+                and self._has_full_text_index(db)
+            )
+            ranked = False
 
             # Check if the database dialect is either 'sqlite' or 'postgresql'
             dialect_name = db.bind.dialect.name
-            if dialect_name == "sqlite":
+            if dialect_name == "sqlite" and use_full_text_index:
+                # Quoted substring terms, all of which must match (bm25: lower is better)
+                fts_match = " AND ".join(f'"{term}"' for term in search_terms)
+                matches = (
+                    text(
+                        "SELECT chat_search.chat_id AS chat_id, bm25(chat_fts) AS rank "
+                        "FROM chat_fts JOIN chat_search ON chat_search.rowid = chat_fts.rowid "
+                        "WHERE chat_fts MATCH :fts_match"
+                    )
+                    .bindparams(fts_match=fts_match)
+                    .columns(chat_id=String, rank=Float)
+                    .subquery("matches")
+                )
+                query = query.join(matches, matches.c.chat_id == Chat.id).order_by(
+                    matches.c.rank, Chat.updated_at.desc()
+                )
+                ranked = True
+            elif dialect_name == "postgresql" and use_full_text_index:
+                # search_text is lowercased; the trigram index serves the LIKEs
+                search_text_column = literal_column("chat.search_text", String)
+                query = query.filter(
+                    and_(
+                        *[
+                            search_text_column.contains(term, autoescape=True)
+                            for term in search_terms
+                        ]
+                    )
+                ).order_by(
+                    func.word_similarity(
+                        " ".join(search_terms), search_text_column
+                    ).desc(),
+                    Chat.updated_at.desc(),
+                )
+                ranked = True
+            elif dialect_name == "sqlite":
                 # SQLite case: using JSON1 extension for JSON searching
                 sqlite_content_sql = (
                     "EXISTS ("
@@ -1010,7 +1137,42 @@ class ChatTable:
                         Chat.title.ilike(bindparam("title_key")), sqlite_content_clause
                     ).params(title_key=f"%{search_text}%", content_key=search_text)
                 )
+            elif dialect_name == "postgresql":
+                # PostgreSQL doesn't allow null bytes in text. We filter those out by checking
+                # the JSON representation for \u0000 before attempting text extraction
+
+                # Safety filter: JSON field must not contain \u0000
+                query = query.filter(text("Chat.chat::text NOT LIKE '%\\\\u0000%'"))
+
+                # Safety filter: title must not contain actual null bytes
+                query = query.filter(text("Chat.title::text NOT LIKE '%\\x00%'"))
+
+                postgres_content_sql = """
+                EXISTS (
+                    SELECT 1
+                    FROM json_array_elements(Chat.chat->'messages') AS message
+                    WHERE json_typeof(message->'content') = 'string'
+                    AND LOWER(message->>'content') LIKE '%' || :content_key || '%'
+                )
+                """
 
+                postgres_content_clause = text(postgres_content_sql)
+
+                query = query.filter(
+                    or_(
+                        Chat.title.ilike(bindparam("title_key")),
+                        postgres_content_clause,
+                    )
+                ).params(title_key=f"%{search_text}%", content_key=search_text.lower())
+            else:
+                raise NotImplementedError(
+                    f"Unsupported dialect: {db.bind.dialect.name}"
+                )
+
+            if not ranked:
+                query = query.order_by(Chat.updated_at.desc())
+
+            if dialect_name == "sqlite":
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
                     query = query.filter(
@@ -1042,33 +1204,6 @@ class ChatTable:
                     )
 
             elif dialect_name == "postgresql":
-                # PostgreSQL doesn't allow null bytes in text. We filter those out by checking
-                # the JSON representation for \u0000 before attempting text extraction
-
-                # Safety filter: JSON field must not contain \u0000
-                query = query.filter(text("Chat.chat::text NOT LIKE '%\\\\u0000%'"))
-
-                # Safety filter: title must not contain actual null bytes
-                query = query.filter(text("Chat.title::text NOT LIKE '%\\x00%'"))
-
-                postgres_content_sql = """
-                EXISTS (
-                    SELECT 1
-                    FROM json_array_elements(Chat.chat->'messages') AS message
-                    WHERE json_typeof(message->'content') = 'string'
-                    AND LOWER(message->>'content') LIKE '%' || :content_key || '%'
-                )
-                """
-
-                postgres_content_clause = text(postgres_content_sql)
-
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")),
-                        postgres_content_clause,
-                    )
-                ).params(title_key=f"%{search_text}%", content_key=search_text.lower())
-
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
                     query = query.filter(
@@ -1109,7 +1244,7 @@ class ChatTable:
             log.info(f"The number of chats: {len(all_chats)}")
 
             # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatListItemModel.model_validate(chat) for chat in all_chats]
 
     def get_chats_by_folder_id_and_user_id(
         self,
@@ -1118,9 +1253,11 @@ class ChatTable:
         skip: int = 0,
         limit: int = 60,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemModel]:
         with get_db_context(db) as db:
-            query = db.query(Chat).filter_by(folder_id=folder_id, user_id=user_id)
+            query = self._query_chat_list(db).filter_by(
+                folder_id=folder_id, user_id=user_id
+            )
             query = query.filter(or_(Chat.pinned == False, Chat.pinned == None))
             query = query.filter_by(archived=False)
 
@@ -1132,7 +1269,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatListItemModel.model_validate(chat) for chat in all_chats]
 
     def get_chats_by_folder_ids_and_user_id(
         self, folder_ids: list[str], user_id: str, db: Optional[Session] = None
@@ -1179,9 +1316,9 @@ class ChatTable:
         skip: int = 0,
         limit: int = 50,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemModel]:
         with get_db_context(db) as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
+            query = self._query_chat_list(db).filter_by(user_id=user_id)
             tag_id = tag_name.replace(" ", "_").lower()
 
             log.info(f"DB dialect name: {db.bind.dialect.name}")
@@ -1206,7 +1343,7 @@ class ChatTable:
 
             all_chats = query.all()
             log.debug(f"all_chats: {all_chats}")
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatListItemModel.model_validate(chat) for chat in all_chats]
 
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str, db: Optional[Session] = None
@@ -1,6 +1,9 @@
 import logging
+import threading
 import time
 import uuid
+from collections import defaultdict
+from datetime import datetime
 from typing import Optional
 
 from sqlalchemy.orm import Session
@@ -8,7 +11,19 @@ from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.users import User
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, Text, JSON, Boolean
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Float,
+    LargeBinary,
+    PrimaryKeyConstraint,
+    Text,
+    JSON,
+    Boolean,
+    insert,
+)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 log = logging.getLogger(__name__)
 
@@ -31,6 +46,131 @@ class Feedback(Base):
     updated_at = Column(BigInteger)
 
 
+class FeedbackModelStat(Base):
+    """Materialized Elo rating and pairwise win/loss totals per model."""
+
+    __tablename__ = "feedback_model_stat"
+    model_id = Column(Text, primary_key=True)
+    rating = Column(Float, nullable=False, default=1000.0)
+    won = Column(BigInteger, nullable=False, default=0)
+    lost = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(BigInteger)
+
+
+class FeedbackModelDaily(Base):
+    """Per model, per day (server local date) wins/losses of rated feedback."""
+
+    __tablename__ = "feedback_model_daily"
+    model_id = Column(Text, nullable=False)
+    date = Column(Text, nullable=False)
+    won = Column(BigInteger, nullable=False, default=0)
+    lost = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("model_id", "date", name="pk_feedback_model_daily"),
+    )
+
+
+class FeedbackModelTag(Base):
+    __tablename__ = "feedback_model_tag"
+    model_id = Column(Text, nullable=False)
+    tag = Column(Text, nullable=False)
+    count = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("model_id", "tag", name="pk_feedback_model_tag"),
+    )
+
+
+class FeedbackTagEmbedding(Base):
+    """Normalized float32 embedding of a feedback tag, per embedding model."""
+
+    __tablename__ = "feedback_tag_embedding"
+    model = Column(Text, nullable=False)
+    tag = Column(Text, nullable=False)
+    embedding = Column(LargeBinary, nullable=False)
+    created_at = Column(BigInteger)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("model", "tag", name="pk_feedback_tag_embedding"),
+    )
+
+
+class FeedbackLeaderboardState(Base):
+    """
+    Single row recording whether the materialized ratings are current.
+
+    Elo depends on the order of matches, so editing or deleting an old
+    feedback cannot be applied incrementally; it marks the ratings stale and
+    the next read (or an explicit rebuild) replays every feedback.
+    """
+
+    __tablename__ = "feedback_leaderboard_state"
+    id = Column(Text, primary_key=True)
+    stale = Column(Boolean, nullable=False, default=True)
+    rebuilt_at = Column(BigInteger)
+
+
+LEADERBOARD_STATE_ID = "leaderboard"
+
+# Readers of a stale leaderboard in this process wait for one rebuild
+LEADERBOARD_REBUILD_LOCK = threading.Lock()
+
+ELO_K_FACTOR = 32  # Standard Elo K-factor for rating volatility
+ELO_INITIAL_RATING = 1000.0
+
+
+def get_rated_match(data: Optional[dict]) -> Optional[tuple[str, bool, list[str]]]:
+    """Return (model_id, won, opponent_ids) for a rated feedback, else None."""
+    data = data or {}
+    model_id = data.get("model_id")
+    rating_value = str(data.get("rating", ""))
+    if not model_id or rating_value not in ("1", "-1"):
+        return None
+    return model_id, rating_value == "1", list(data.get("sibling_model_ids") or [])
+
+
+def apply_elo_match(
+    model_stats: dict, data: Optional[dict], weight: float = 1.0
+) -> None:
+    """
+    Apply one feedback's matches to ``model_stats`` in place.
+
+    ``model_stats`` maps model ids to {"rating": float, "won": int, "lost": int};
+    missing models start at the initial rating.
+    """
+    match = get_rated_match(data)
+    if match is None:
+        return
+    winner_id, won, opponent_ids = match
+
+    def get_or_create_stats(model_id):
+        if model_id not in model_stats:
+            model_stats[model_id] = {"rating": ELO_INITIAL_RATING, "won": 0, "lost": 0}
+        return model_stats[model_id]
+
+    for opponent_id in opponent_ids:
+        winner = get_or_create_stats(winner_id)
+        opponent = get_or_create_stats(opponent_id)
+        expected = 1 / (1 + 10 ** ((opponent["rating"] - winner["rating"]) / 400))
+
+        winner["rating"] += ELO_K_FACTOR * ((1 if won else 0) - expected) * weight
+        opponent["rating"] += (
+            ELO_K_FACTOR * ((0 if won else 1) - (1 - expected)) * weight
+        )
+
+        if won:
+            winner["won"] += 1
+            opponent["lost"] += 1
+        else:
+            winner["lost"] += 1
+            opponent["won"] += 1
+
+
+def _feedback_date(created_at: int) -> str:
+    return datetime.fromtimestamp(created_at).strftime("%Y-%m-%d")
+
+
 class FeedbackModel(BaseModel):
     id: str
     user_id: str
@@ -138,7 +278,379 @@ class ModelHistoryResponse(BaseModel):
     history: list[ModelHistoryEntry]
 
 
+class ModelLeaderboardStat(BaseModel):
+    model_id: str
+    rating: float
+    won: int
+    lost: int
+    top_tags: list[dict] = []
+
+
 class FeedbackTable:
+    def __init__(self):
+        # Rebuilds finished in this process; waiters skip a redundant one
+        self._rebuild_generation = 0
+
+    ####################
+    # Leaderboard aggregates
+    ####################
+
+    def _upsert(self, db: Session, table, values: dict, update: dict):
+        """
+        Insert ``values``, or update the existing row with ``update`` if one
+        with the same primary key exists, in one atomic statement. ``update``
+        values may be SQL expressions on the row's current columns.
+        """
+        dialect_name = db.bind.dialect.name
+        if dialect_name in ("sqlite", "postgresql"):
+            dialect_insert = (
+                sqlite_insert if dialect_name == "sqlite" else postgresql_insert
+            )
+            db.execute(
+                dialect_insert(table)
+                .values(**values)
+                .on_conflict_do_update(
+                    index_elements=[c.name for c in table.__table__.primary_key],
+                    set_=update,
+                )
+            )
+        else:
+            key = {c.name: values[c.name] for c in table.__table__.primary_key}
+            if not (
+                db.query(table)
+                .filter_by(**key)
+                .update(update, synchronize_session=False)
+            ):
+                db.execute(insert(table).values(**values))
+
+    def _increment(self, db: Session, table, key: dict, **deltas: int):
+        """Add ``deltas`` to the counters of the row at ``key``, creating it."""
+        self._upsert(
+            db,
+            table,
+            {**key, **deltas},
+            {name: getattr(table, name) + delta for name, delta in deltas.items()},
+        )
+
+    def _get_leaderboard_state(
+        self, db: Session, for_write: bool = False
+    ) -> tuple[bool, Optional[int]]:
+        """
+        (stale, rebuilt_at) of the materialized ratings, read fresh. With
+        ``for_write`` the state row is share-locked, so the aggregate writes
+        that follow wait for a running rebuild instead of racing it.
+        """
+        query = db.query(
+            FeedbackLeaderboardState.stale, FeedbackLeaderboardState.rebuilt_at
+        ).filter_by(id=LEADERBOARD_STATE_ID)
+        if for_write:
+            query = query.with_for_update(read=True)
+        state = query.first()
+        if state is None:
+            return True, None
+        return state.stale, state.rebuilt_at
+
+    def _is_leaderboard_stale(self, db: Session, for_write: bool = False) -> bool:
+        return self._get_leaderboard_state(db, for_write=for_write)[0]
+
+    def _mark_leaderboard_stale(self, db: Session):
+        self._upsert(
+            db,
+            FeedbackLeaderboardState,
+            {"id": LEADERBOARD_STATE_ID, "stale": True},
+            {"stale": True},
+        )
+
+    def _lock_leaderboard_state(self, db: Session):
+        # A no-op write to the state row holds its row lock (PostgreSQL) or
+        # the database write lock (SQLite) until commit. Rebuilds take it so
+        # workers rebuild one at a time, and feedback edits and deletes take
+        # it before they may mark the ratings stale
+        self._upsert(
+            db,
+            FeedbackLeaderboardState,
+            {"id": LEADERBOARD_STATE_ID, "stale": True},
+            {"rebuilt_at": FeedbackLeaderboardState.rebuilt_at},
+        )
+
+    def _adjust_aggregates(
+        self,
+        db: Session,
+        data: Optional[dict],
+        created_at: int,
+        sign: int,
+        pairwise: bool = True,
+    ):
+        """
+        Add (sign=1) or remove (sign=-1) one feedback's tag, daily and (when
+        ``pairwise``) per-opponent win/loss counts. Ratings are not touched.
+        """
+        data = data or {}
+        model_id = data.get("model_id")
+        if not model_id:
+            return
+
+        for tag in data.get("tags") or []:
+            self._increment(
+                db, FeedbackModelTag, {"model_id": model_id, "tag": tag}, count=sign
+            )
+
+        match = get_rated_match(data)
+        if match is None:
+            return
+        _, won, opponent_ids = match
+
+        self._increment(
+            db,
+            FeedbackModelDaily,
+            {"model_id": model_id, "date": _feedback_date(created_at)},
+            **{"won" if won else "lost": sign},
+        )
+
+        if pairwise:
+            for opponent_id in opponent_ids:
+                self._increment(
+                    db,
+                    FeedbackModelStat,
+                    {"model_id": model_id},
+                    **{"won" if won else "lost": sign},
+                )
+                self._increment(
+                    db,
+                    FeedbackModelStat,
+                    {"model_id": opponent_id},
+                    **{"lost" if won else "won": sign},
+                )
+
+    def _apply_new_feedback(self, db: Session, data: Optional[dict], created_at: int):
+        if (
+            self._is_leaderboard_stale(db, for_write=True)
+            or get_rated_match(data) is None
+        ):
+            self._adjust_aggregates(db, data, created_at, 1)
+            return
+
+        # New feedback is the latest match, so its Elo update can be applied
+        # on top of the materialized ratings
+        model_id, _, opponent_ids = get_rated_match(data)
+        model_ids = sorted({model_id, *opponent_ids})
+        # Creating the rows first takes their write locks before the ratings
+        # are read, so concurrent feedback cannot update the same old ratings
+        for stat_model_id in model_ids:
+            self._increment(
+                db, FeedbackModelStat, {"model_id": stat_model_id}, won=0, lost=0
+            )
+        rows = {
+            row.model_id: row
+            for row in db.query(FeedbackModelStat)
+            .filter(FeedbackModelStat.model_id.in_(model_ids))
+            .with_for_update()
+            .populate_existing()
+            .all()
+        }
+        model_stats = {
+            row.model_id: {"rating": row.rating, "won": row.won, "lost": row.lost}
+            for row in rows.values()
+        }
+        apply_elo_match(model_stats, data)
+
+        now = int(time.time())
+        for stat_model_id, stats in model_stats.items():
+            row = rows[stat_model_id]
+            row.rating = stats["rating"]
+            row.won = stats["won"]
+            row.lost = stats["lost"]
+            row.updated_at = now
+
+        self._adjust_aggregates(db, data, created_at, 1, pairwise=False)
+
+    def _apply_feedback_update(
+        self,
+        db: Session,
+        old_data: Optional[dict],
+        new_data: Optional[dict],
+        created_at: int,
+    ):
+        if old_data == new_data:
+            return
+        self._lock_leaderboard_state(db)
+        self._adjust_aggregates(db, old_data, created_at, -1)
+        self._adjust_aggregates(db, new_data, created_at, 1)
+        if get_rated_match(old_data) != get_rated_match(new_data):
+            self._mark_leaderboard_stale(db)
+
+    def _apply_feedback_delete(self, db: Session, feedback: "Feedback"):
+        self._lock_leaderboard_state(db)
+        self._adjust_aggregates(db, feedback.data, feedback.created_at, -1)
+        if get_rated_match(feedback.data) is not None:
+            self._mark_leaderboard_stale(db)
+
+    def rebuild_leaderboard(
+        self, db: Optional[Session] = None, only_if_stale: bool = False
+    ) -> int:
+        """
+        Recompute every materialized rating and aggregate by replaying all
+        feedback in creation order. Returns the number of feedbacks replayed.
+
+        Rebuilds are serialized across threads and workers. With
+        ``only_if_stale`` the rebuild is skipped (returning 0) if the ratings
+        are current or another rebuild finished while this one waited.
+        """
+        with get_db_context(db) as db:
+            generation = self._rebuild_generation
+            _, seen_rebuilt_at = self._get_leaderboard_state(db)
+
+            with LEADERBOARD_REBUILD_LOCK:
+                self._lock_leaderboard_state(db)
+                stale, rebuilt_at = self._get_leaderboard_state(db)
+                if only_if_stale and (
+                    not stale
+                    or generation != self._rebuild_generation
+                    or rebuilt_at != seen_rebuilt_at
+                ):
+                    db.commit()
+                    return 0
+
+                started_at = int(time.time())
+
+                model_stats = {}
+                daily_counts = defaultdict(lambda: {"won": 0, "lost": 0})
+                tag_counts = defaultdict(int)
+                replayed = 0
+
+                for created_at, data in (
+                    db.query(Feedback.created_at, Feedback.data)
+                    .order_by(Feedback.created_at.asc(), Feedback.id.asc())
+                    .yield_per(1000)
+                ):
+                    replayed += 1
+                    data = data or {}
+                    apply_elo_match(model_stats, data)
+
+                    model_id = data.get("model_id")
+                    if not model_id:
+                        continue
+                    for tag in data.get("tags") or []:
+                        tag_counts[(model_id, tag)] += 1
+
+                    match = get_rated_match(data)
+                    if match:
+                        key = (model_id, _feedback_date(created_at))
+                        daily_counts[key]["won" if match[1] else "lost"] += 1
+
+                db.query(FeedbackModelStat).delete()
+                db.query(FeedbackModelDaily).delete()
+                db.query(FeedbackModelTag).delete()
+                db.bulk_insert_mappings(
+                    FeedbackModelStat,
+                    [
+                        {"model_id": model_id, "updated_at": started_at, **stats}
+                        for model_id, stats in model_stats.items()
+                    ],
+                )
+                db.bulk_insert_mappings(
+                    FeedbackModelDaily,
+                    [
+                        {"model_id": model_id, "date": date, **counts}
+                        for (model_id, date), counts in daily_counts.items()
+                    ],
+                )
+                db.bulk_insert_mappings(
+                    FeedbackModelTag,
+                    [
+                        {"model_id": model_id, "tag": tag, "count": count}
+                        for (model_id, tag), count in tag_counts.items()
+                    ],
+                )
+
+                # Writers wait on the state row lock, so nothing was written
+                # to the aggregates while replaying
+                db.query(FeedbackLeaderboardState).filter_by(
+                    id=LEADERBOARD_STATE_ID
+                ).update({"stale": False, "rebuilt_at": started_at})
+
+                db.commit()
+                self._rebuild_generation += 1
+                log.info(f"Rebuilt leaderboard from {replayed} feedbacks")
+                return replayed
+
+    def get_leaderboard_stats(
+        self, tag_limit: int = 5, db: Optional[Session] = None
+    ) -> list[ModelLeaderboardStat]:
+        """Materialized ratings with each model's most frequent tags."""
+        with get_db_context(db) as db:
+            if self._is_leaderboard_stale(db):
+                self.rebuild_leaderboard(db=db, only_if_stale=True)
+
+            top_tags = defaultdict(list)
+            for row in (
+                db.query(FeedbackModelTag)
+                .filter(FeedbackModelTag.count > 0)
+                .order_by(FeedbackModelTag.model_id, FeedbackModelTag.count.desc())
+            ):
+                if len(top_tags[row.model_id]) < tag_limit:
+                    top_tags[row.model_id].append({"tag": row.tag, "count": row.count})
+
+            return [
+                ModelLeaderboardStat(
+                    model_id=row.model_id,
+                    rating=row.rating,
+                    won=row.won,
+                    lost=row.lost,
+                    top_tags=top_tags.get(row.model_id, []),
+                )
+                for row in db.query(FeedbackModelStat)
+                .filter(FeedbackModelStat.won + FeedbackModelStat.lost > 0)
+                .all()
+            ]
+
+    ####################
+    # Tag embeddings
+    ####################
+
+    def get_tag_embeddings(
+        self, model: str, db: Optional[Session] = None
+    ) -> dict[str, bytes]:
+        with get_db_context(db) as db:
+            return {
+                tag: embedding
+                for tag, embedding in db.query(
+                    FeedbackTagEmbedding.tag, FeedbackTagEmbedding.embedding
+                ).filter_by(model=model)
+            }
+
+    def insert_tag_embeddings(
+        self, model: str, embeddings: dict[str, bytes], db: Optional[Session] = None
+    ) -> int:
+        """Store embeddings for tags not yet stored; returns how many were added."""
+        with get_db_context(db) as db:
+            existing = {
+                tag
+                for (tag,) in db.query(FeedbackTagEmbedding.tag).filter(
+                    FeedbackTagEmbedding.model == model,
+                    FeedbackTagEmbedding.tag.in_(list(embeddings.keys())),
+                )
+            }
+            now = int(time.time())
+            rows = [
+                {"model": model, "tag": tag, "embedding": embedding, "created_at": now}
+                for tag, embedding in embeddings.items()
+                if tag not in existing
+            ]
+            try:
+                db.bulk_insert_mappings(FeedbackTagEmbedding, rows)
+                db.commit()
+                return len(rows)
+            except Exception as e:
+                # Another worker stored the same tags concurrently
+                db.rollback()
+                log.debug(f"Skipping tag embeddings already stored: {e}")
+                return 0
+
+    ####################
+    # Feedback
+    ####################
+
     def insert_new_feedback(
         self, user_id: str, form_data: FeedbackForm, db: Optional[Session] = None
     ) -> Optional[FeedbackModel]:
@@ -157,6 +669,7 @@ class FeedbackTable:
             try:
                 result = Feedback(**feedback.model_dump())
                 db.add(result)
+                self._apply_new_feedback(db, feedback.data, feedback.created_at)
                 db.commit()
                 db.refresh(result)
                 if result:
@@ -296,7 +809,9 @@ class FeedbackTable:
         with get_db_context(db) as db:
             return [
                 LeaderboardFeedbackData(id=row.id, data=row.data)
-                for row in db.query(Feedback.id, Feedback.data).all()
+                for row in db.query(Feedback.id, Feedback.data)
+                .order_by(Feedback.created_at.asc(), Feedback.id.asc())
+                .all()
             ]
 
     def get_model_evaluation_history(
@@ -307,43 +822,23 @@ class FeedbackTable:
         If days=0, returns all time data starting from first feedback.
         Returns: [{"date": "2026-01-08", "won": 5, "lost": 2}, ...]
         """
-        from datetime import datetime, timedelta
-        from collections import defaultdict
+        from datetime import timedelta
 
         with get_db_context(db) as db:
-            if days == 0:
-                # All time - no cutoff
-                rows = db.query(Feedback.created_at, Feedback.data).all()
-            else:
-                cutoff = int(time.time()) - (days * 86400)
-                rows = (
-                    db.query(Feedback.created_at, Feedback.data)
-                    .filter(Feedback.created_at >= cutoff)
-                    .all()
+            query = db.query(
+                FeedbackModelDaily.date, FeedbackModelDaily.won, FeedbackModelDaily.lost
+            ).filter(FeedbackModelDaily.model_id == model_id)
+            if days != 0:
+                cutoff = (datetime.now().date() - timedelta(days=days - 1)).strftime(
+                    "%Y-%m-%d"
                 )
+                query = query.filter(FeedbackModelDaily.date >= cutoff)
+            rows = query.all()
 
-        daily_counts = defaultdict(lambda: {"won": 0, "lost": 0})
-        first_date = None
-
-        for created_at, data in rows:
-            if not data:
-                continue
-            if data.get("model_id") != model_id:
-                continue
-
-            rating_str = str(data.get("rating", ""))
-            if rating_str not in ("1", "-1"):
-                continue
-
-            date_str = datetime.fromtimestamp(created_at).strftime("%Y-%m-%d")
-            if rating_str == "1":
-                daily_counts[date_str]["won"] += 1
-            else:
-                daily_counts[date_str]["lost"] += 1
-
-            # Track first date for this model
-            if first_date is None or date_str < first_date:
-                first_date = date_str
+        daily_counts = {
+            date: {"won": won, "lost": lost} for date, won, lost in rows if won or lost
+        }
+        first_date = min(daily_counts) if daily_counts else None
 
         # Generate date range
         result = []
@@ -400,6 +895,7 @@ class FeedbackTable:
             if not feedback:
                 return None
 
+            old_data = feedback.data
             if form_data.data:
                 feedback.data = form_data.data.model_dump()
             if form_data.meta:
@@ -409,6 +905,9 @@ class FeedbackTable:
 
             feedback.updated_at = int(time.time())
 
+            self._apply_feedback_update(
+                db, old_data, feedback.data, feedback.created_at
+            )
             db.commit()
             return FeedbackModel.model_validate(feedback)
 
@@ -424,6 +923,7 @@ class FeedbackTable:
             if not feedback:
                 return None
 
+            old_data = feedback.data
             if form_data.data:
                 feedback.data = form_data.data.model_dump()
             if form_data.meta:
@@ -433,6 +933,9 @@ class FeedbackTable:
 
             feedback.updated_at = int(time.time())
 
+            self._apply_feedback_update(
+                db, old_data, feedback.data, feedback.created_at
+            )
             db.commit()
             return FeedbackModel.model_validate(feedback)
 
@@ -441,6 +944,7 @@ class FeedbackTable:
             feedback = db.query(Feedback).filter_by(id=id).first()
             if not feedback:
                 return False
+            self._apply_feedback_delete(db, feedback)
             db.delete(feedback)
             db.commit()
             return True
@@ -452,6 +956,7 @@ class FeedbackTable:
             feedback = db.query(Feedback).filter_by(id=id, user_id=user_id).first()
             if not feedback:
                 return False
+            self._apply_feedback_delete(db, feedback)
             db.delete(feedback)
             db.commit()
             return True
@@ -464,6 +969,7 @@ class FeedbackTable:
             if not feedbacks:
                 return False
             for feedback in feedbacks:
+                self._apply_feedback_delete(db, feedback)
                 db.delete(feedback)
             db.commit()
             return True
@@ -475,6 +981,11 @@ class FeedbackTable:
                 return False
             for feedback in feedbacks:
                 db.delete(feedback)
+            db.query(FeedbackModelStat).delete()
+            db.query(FeedbackModelDaily).delete()
+            db.query(FeedbackModelTag).delete()
+            db.query(FeedbackLeaderboardState).delete()
+            db.add(FeedbackLeaderboardState(id=LEADERBOARD_STATE_ID, stale=False))
             db.commit()
             return True
 
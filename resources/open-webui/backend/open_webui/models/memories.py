@@ -5,7 +5,9 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, get_db, get_db_context
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text
+from sqlalchemy import BigInteger, Column, LargeBinary, String, Text, insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 ####################
 # Memory DB Schema
@@ -21,6 +23,19 @@ class Memory(Base):
     updated_at = Column(BigInteger)
     created_at = Column(BigInteger)
 
+    # float32 vector of the content and the embedding model that produced it
+    embedding = Column(LargeBinary, nullable=True)
+    embedding_model = Column(Text, nullable=True)
+
+
+class MemoryVersion(Base):
+    """Per-user counter bumped in the same transaction as every memory write."""
+
+    __tablename__ = "memory_version"
+
+    user_id = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
 
 class MemoryModel(BaseModel):
     id: str
@@ -38,6 +53,28 @@ class MemoryModel(BaseModel):
 
 
 class MemoriesTable:
+    def _bump_version(self, db: Session, user_id: str):
+        """Increment the user's memory version; committed with the caller's write."""
+        dialect_name = db.bind.dialect.name
+        if dialect_name in ("sqlite", "postgresql"):
+            dialect_insert = (
+                sqlite_insert if dialect_name == "sqlite" else postgresql_insert
+            )
+            db.execute(
+                dialect_insert(MemoryVersion)
+                .values(user_id=user_id, version=1)
+                .on_conflict_do_update(
+                    index_elements=["user_id"],
+                    set_={"version": MemoryVersion.version + 1},
+                )
+            )
+        elif not (
+            db.query(MemoryVersion)
+            .filter_by(user_id=user_id)
+            .update({"version": MemoryVersion.version + 1}, synchronize_session=False)
+        ):
+            db.execute(insert(MemoryVersion).values(user_id=user_id, version=1))
+
     def insert_new_memory(
         self,
         user_id: str,
@@ -58,6 +95,7 @@ class MemoriesTable:
             )
             result = Memory(**memory.model_dump())
             db.add(result)
+            self._bump_version(db, user_id)
             db.commit()
             db.refresh(result)
             if result:
@@ -65,6 +103,32 @@ class MemoriesTable:
             else:
                 return None
 
+    def insert_new_memories(
+        self,
+        user_id: str,
+        contents: list[str],
+        db: Optional[Session] = None,
+    ) -> list[MemoryModel]:
+        with get_db_context(db) as db:
+            now = int(time.time())
+            memories = [
+                MemoryModel(
+                    **{
+                        "id": str(uuid.uuid4()),
+                        "user_id": user_id,
+                        "content": content,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                )
+                for content in contents
+            ]
+            # Single transaction: either every memory is stored or none are
+            db.add_all([Memory(**memory.model_dump()) for memory in memories])
+            self._bump_version(db, user_id)
+            db.commit()
+            return memories
+
     def update_memory_by_id_and_user_id(
         self,
         id: str,
@@ -80,6 +144,9 @@ class MemoriesTable:
 
                 memory.content = content
                 memory.updated_at = int(time.time())
+                memory.embedding = None
+                memory.embedding_model = None
+                self._bump_version(db, user_id)
 
                 db.commit()
                 return self.get_memory_by_id(id)
@@ -104,6 +171,74 @@ class MemoriesTable:
             except Exception:
                 return None
 
+    def get_memory_embeddings_by_user_id(
+        self, user_id: str, db: Optional[Session] = None
+    ) -> list[tuple[MemoryModel, Optional[bytes], Optional[str]]]:
+        with get_db_context(db) as db:
+            try:
+                memories = db.query(Memory).filter_by(user_id=user_id).all()
+                return [
+                    (
+                        MemoryModel.model_validate(memory),
+                        memory.embedding,
+                        memory.embedding_model,
+                    )
+                    for memory in memories
+                ]
+            except Exception:
+                return []
+
+    def get_memory_version_by_user_id(
+        self, user_id: str, db: Optional[Session] = None
+    ) -> Optional[int]:
+        """
+        Counter bumped whenever one of the user's memories is added, edited or
+        deleted, so it can validate cached copies.
+        """
+        with get_db_context(db) as db:
+            try:
+                version = db.get(MemoryVersion, user_id)
+                return version.version if version else 0
+            except Exception:
+                return None
+
+    def get_user_ids_with_stale_embeddings(
+        self, embedding_model: str, db: Optional[Session] = None
+    ) -> list[str]:
+        with get_db_context(db) as db:
+            try:
+                rows = (
+                    db.query(Memory.user_id)
+                    .filter(
+                        (Memory.embedding.is_(None))
+                        | (Memory.embedding_model.is_(None))
+                        | (Memory.embedding_model != embedding_model)
+                    )
+                    .distinct()
+                    .all()
+                )
+                return [row[0] for row in rows]
+            except Exception:
+                return []
+
+    def update_memory_embeddings(
+        self,
+        embeddings: dict[str, bytes],
+        embedding_model: str,
+        db: Optional[Session] = None,
+    ) -> bool:
+        with get_db_context(db) as db:
+            try:
+                for memory in db.query(Memory).filter(
+                    Memory.id.in_(list(embeddings.keys()))
+                ):
+                    memory.embedding = embeddings[memory.id]
+                    memory.embedding_model = embedding_model
+                db.commit()
+                return True
+            except Exception:
+                return False
+
     def get_memory_by_id(
         self, id: str, db: Optional[Session] = None
     ) -> Optional[MemoryModel]:
@@ -117,7 +252,10 @@ class MemoriesTable:
     def delete_memory_by_id(self, id: str, db: Optional[Session] = None) -> bool:
         with get_db_context(db) as db:
             try:
-                db.query(Memory).filter_by(id=id).delete()
+                memory = db.get(Memory, id)
+                if memory:
+                    db.delete(memory)
+                    self._bump_version(db, memory.user_id)
                 db.commit()
 
                 return True
@@ -131,6 +269,7 @@ class MemoriesTable:
         with get_db_context(db) as db:
             try:
                 db.query(Memory).filter_by(user_id=user_id).delete()
+                self._bump_version(db, user_id)
                 db.commit()
 
                 return True
@@ -148,6 +287,7 @@ class MemoriesTable:
 
                 # Delete the memory
                 db.delete(memory)
+                self._bump_version(db, user_id)
                 db.commit()
 
                 return True
@@ -1,4 +1,6 @@
 import json
+import logging
+import re
 import time
 import uuid
 from typing import Optional
@@ -12,17 +14,24 @@ from open_webui.models.users import User, UserModel, Users, UserResponse
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Boolean, Column, Float, String, Text, JSON
 from sqlalchemy.dialects.postgresql import JSONB
 
 
 from sqlalchemy import or_, func, select, and_, text, cast, or_, and_, func
 from sqlalchemy.sql import exists
+from sqlalchemy.sql.expression import literal_column
 
 ####################
 # Note DB Schema
 ####################
 
+log = logging.getLogger(__name__)
+
+# Whether the full-text index maintained by triggers (see the
+# "Add full-text search index for notes" migration) exists, per database URL
+FULL_TEXT_INDEX_AVAILABLE = {}
+
 
 class Note(Base):
     __tablename__ = "note"
@@ -211,6 +220,106 @@ class NoteTable:
 
         return query
 
+    def _has_full_text_index(self, db: Session) -> bool:
+        key = str(db.bind.url)
+        if key not in FULL_TEXT_INDEX_AVAILABLE:
+            dialect_name = db.bind.dialect.name
+            try:
+                if dialect_name == "sqlite":
+                    # Triggers are checked rather than the table: rebuilding the
+                    # note table (e.g. SQLite batch migrations) drops them
+                    count = db.execute(
+                        text(
+                            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' "
+                            "AND name IN ('note_search_ai', 'note_search_au', 'note_search_ad')"
+                        )
+                    ).scalar()
+                    available = count == 3
+                elif dialect_name == "postgresql":
+                    available = (
+                        db.execute(
+                            text(
+                                "SELECT 1 FROM pg_trigger WHERE tgname = 'note_search_text_update'"
+                            )
+                        ).first()
+                        is not None
+                    )
+                else:
+                    available = False
+            except Exception as e:
+                log.debug(f"Full-text index check failed: {e}")
+                available = False
+
+            if not available:
+                log.info("Note full-text index not found, searching with LIKE")
+            FULL_TEXT_INDEX_AVAILABLE[key] = available
+        return FULL_TEXT_INDEX_AVAILABLE[key]
+
+    def _filter_by_search_text(self, db, query, query_key: str):
+        """
+        Filter notes matching ``query_key`` by title and markdown content.
+
+        Returns the query and a relevance ordering, or None when the
+        full-text index is unavailable and the query is matched as a
+        substring instead.
+        """
+        search_terms = re.findall(r"\w+", query_key.lower())
+        dialect_name = db.bind.dialect.name
+
+        # The trigram index can't match terms shorter than 3 characters
+        # (e.g. two CJK characters), so those searches scan with ilike
+        if (
+            search_terms
+            and all(len(term) >= 3 for term in search_terms)
+            and self._has_full_text_index(db)
+        ):
+            if dialect_name == "sqlite":
+                # Quoted substring terms, all of which must match (bm25: lower is better)
+                fts_match = " AND ".join(f'"{term}"' for term in search_terms)
+                matches = (
+                    text(
+                        "SELECT note_search.note_id AS note_id, bm25(note_fts, 2.0, 1.0) AS rank "
+                        "FROM note_fts JOIN note_search ON note_search.rowid = note_fts.rowid "
+                        "WHERE note_fts MATCH :fts_match"
+                    )
+                    .bindparams(fts_match=fts_match)
+                    .columns(note_id=String, rank=Float)
+                    .subquery("matches")
+                )
+                query = query.join(matches, matches.c.note_id == Note.id)
+                return query, matches.c.rank.asc()
+            elif dialect_name == "postgresql":
+                # search_text is lowercased; the trigram index serves the LIKEs
+                search_text = literal_column("note.search_text", String)
+                query = query.filter(
+                    and_(
+                        *[
+                            search_text.contains(term, autoescape=True)
+                            for term in search_terms
+                        ]
+                    )
+                )
+                return (
+                    query,
+                    func.word_similarity(" ".join(search_terms), search_text).desc(),
+                )
+
+        # Normalize search by removing hyphens and spaces (e.g., "todo" matches "to-do" and "to do")
+        normalized_query = query_key.replace("-", "").replace(" ", "")
+        query = query.filter(
+            or_(
+                func.replace(func.replace(Note.title, "-", ""), " ", "").ilike(
+                    f"%{normalized_query}%"
+                ),
+                func.replace(
+                    func.replace(cast(Note.data["content"]["md"], Text), "-", ""),
+                    " ",
+                    "",
+                ).ilike(f"%{normalized_query}%"),
+            )
+        )
+        return query, None
+
     def insert_new_note(
         self, user_id: str, form_data: NoteForm, db: Optional[Session] = None
     ) -> Optional[NoteModel]:
@@ -254,24 +363,10 @@ class NoteTable:
         with get_db_context(db) as db:
             query = db.query(Note, User).outerjoin(User, User.id == Note.user_id)
             if filter:
+                relevance = None
                 query_key = filter.get("query")
                 if query_key:
-                    # Normalize search by removing hyphens and spaces (e.g., "todo" matches "to-do" and "to do")
-                    normalized_query = query_key.replace("-", "").replace(" ", "")
-                    query = query.filter(
-                        or_(
-                            func.replace(
-                                func.replace(Note.title, "-", ""), " ", ""
-                            ).ilike(f"%{normalized_query}%"),
-                            func.replace(
-                                func.replace(
-                                    cast(Note.data["content"]["md"], Text), "-", ""
-                                ),
-                                " ",
-                                "",
-                            ).ilike(f"%{normalized_query}%"),
-                        )
-                    )
+                    query, relevance = self._filter_by_search_text(db, query, query_key)
 
                 view_option = filter.get("view_option")
                 if view_option == "created":
@@ -310,6 +405,9 @@ class NoteTable:
                         query = query.order_by(Note.updated_at.asc())
                     else:
                         query = query.order_by(Note.updated_at.desc())
+                elif relevance is not None:
+                    # Searches without an explicit order are ranked by relevance
+                    query = query.order_by(relevance, Note.updated_at.desc())
                 else:
                     query = query.order_by(Note.updated_at.desc())
 
@@ -113,6 +113,15 @@ class ToolValves(BaseModel):
     valves: Optional[dict] = None
 
 
+def get_user_valves_from_settings(settings) -> dict[str, dict]:
+    """Extract the per-tool valves dict from a user's settings."""
+    if settings is None:
+        return {}
+    if isinstance(settings, BaseModel):
+        settings = settings.model_dump()
+    return (settings.get("tools") or {}).get("valves") or {}
+
+
 class ToolsTable:
     def insert_new_tool(
         self,
@@ -155,6 +164,23 @@ class ToolsTable:
         except Exception:
             return None
 
+    def get_tools_with_valves_by_ids(
+        self, ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, tuple[ToolModel, dict]]:
+        """Load several tools and their valves in a single query, keyed by id."""
+        if not ids:
+            return {}
+        try:
+            with get_db_context(db) as db:
+                tools = db.query(Tool).filter(Tool.id.in_(ids)).all()
+                return {
+                    tool.id: (ToolModel.model_validate(tool), tool.valves or {})
+                    for tool in tools
+                }
+        except Exception as e:
+            log.exception(f"Error getting tools by ids {ids}: {e}")
+            return {}
+
     def get_tools(self, db: Optional[Session] = None) -> list[ToolUserModel]:
         with get_db_context(db) as db:
             all_tools = db.query(Tool).order_by(Tool.updated_at.desc()).all()
@@ -236,6 +262,17 @@ class ToolsTable:
             )
             return None
 
+    def get_user_valves_by_user_id(
+        self, user_id: str, db: Optional[Session] = None
+    ) -> dict[str, dict]:
+        """All of a user's tool valves, keyed by tool id."""
+        try:
+            user = Users.get_user_by_id(user_id, db=db)
+            return get_user_valves_from_settings(user.settings)
+        except Exception as e:
+            log.exception(f"Error getting user valves by user_id {user_id}: {e}")
+            return {}
+
     def update_user_valves_by_id_and_user_id(
         self, id: str, user_id: str, valves: dict, db: Optional[Session] = None
     ) -> Optional[dict]:
@@ -0,0 +1,284 @@
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+from fastapi import Request
+
+from open_webui.env import MEMORY_INDEX_CACHE_SIZE, REDIS_KEY_PREFIX
+from open_webui.models.memories import Memories, MemoryModel
+from open_webui.models.users import Users
+from open_webui.retrieval.vector.main import SearchResult
+
+log = logging.getLogger(__name__)
+
+
+def get_embedding_model_id(request: Request) -> str:
+    """Identifies the embedding model that produced a stored memory vector."""
+    config = request.app.state.config
+    return f"{config.RAG_EMBEDDING_ENGINE or 'sentence_transformers'}:{config.RAG_EMBEDDING_MODEL}"
+
+
+class UserMemoryMatrix:
+    """A user's memories with their L2-normalized embeddings as one matrix."""
+
+    __slots__ = ("memories", "matrix", "embedding_model", "version")
+
+    def __init__(
+        self,
+        memories: list[MemoryModel],
+        matrix: np.ndarray,
+        embedding_model: str,
+        version: Optional[int],
+    ):
+        self.memories = memories
+        self.matrix = matrix
+        self.embedding_model = embedding_model
+        # The user's memory version read before the rows were loaded
+        self.version = version
+
+    def search(self, vector: list[float], k: int) -> SearchResult:
+        if not self.memories or k <= 0:
+            return SearchResult(
+                ids=[[]], documents=[[]], metadatas=[[]], distances=[[]]
+            )
+
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        # Cosine similarity, mapped to the 0 (worst) -> 1 (best) scale the
+        # vector DB clients report as distances
+        scores = (1 + self.matrix @ query) / 2
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        return SearchResult(
+            ids=[[self.memories[idx].id for idx in top]],
+            documents=[[self.memories[idx].content for idx in top]],
+            metadatas=[
+                [
+                    {
+                        "created_at": self.memories[idx].created_at,
+                        "updated_at": self.memories[idx].updated_at,
+                    }
+                    for idx in top
+                ]
+            ],
+            distances=[[float(scores[idx]) for idx in top]],
+        )
+
+
+class MemoryIndex:
+    """
+    In-process index of per-user memory embeddings.
+
+    Vectors are persisted on the memory rows and assembled into a normalized
+    matrix per user, kept in an LRU of ``max_users`` entries, so a lookup is a
+    single matrix-vector product instead of a vector DB round trip. Memories
+    without a vector for the current embedding model are embedded in one
+    batched call when the matrix is built.
+
+    Writes on this worker invalidate entries directly. Writes on other workers
+    are caught by checking each entry against the user's memory version before
+    it is used: a counter in Redis, bumped by ``invalidate``, when Redis is
+    configured, else the counter the memories table bumps on every write.
+    """
+
+    def __init__(self, max_users: int):
+        self.max_users = max_users
+        self._entries: "OrderedDict[str, UserMemoryMatrix]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a matrix built from rows read before
+        # a concurrent write is not cached
+        self._generation = 0
+
+    def _version_key(self, user_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:memory_version:{user_id}"
+
+    async def get_version(self, request: Request, user_id: str) -> Optional[int]:
+        redis = getattr(request.app.state, "redis", None)
+        if redis is not None:
+            return int(await redis.get(self._version_key(user_id)) or 0)
+        return Memories.get_memory_version_by_user_id(user_id)
+
+    async def invalidate(self, request: Request, user_id: str):
+        """Drop the user's entry here and on every other worker."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(user_id, None)
+
+        redis = getattr(request.app.state, "redis", None)
+        if redis is not None:
+            await redis.incr(self._version_key(user_id))
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    async def embed_memories(
+        self, request: Request, memories: list[MemoryModel], user
+    ) -> dict[str, np.ndarray]:
+        """
+        Embed memories and persist the vectors on their rows in one transaction.
+
+        Contents are sent in batches of RAG_EMBEDDING_BATCH_SIZE.
+        """
+        if not memories:
+            return {}
+
+        batch_size = max(int(request.app.state.config.RAG_EMBEDDING_BATCH_SIZE), 1)
+        vectors = []
+        for start in range(0, len(memories), batch_size):
+            batch = memories[start : start + batch_size]
+            batch_vectors = await request.app.state.EMBEDDING_FUNCTION(
+                [memory.content for memory in batch], user=user
+            )
+            if not batch_vectors or len(batch_vectors) != len(batch):
+                raise ValueError(
+                    f"Embedding function returned {len(batch_vectors or [])} vectors for {len(batch)} memories"
+                )
+            vectors.extend(batch_vectors)
+
+        embeddings = {
+            memory.id: np.asarray(vector, dtype=np.float32)
+            for memory, vector in zip(memories, vectors)
+        }
+        Memories.update_memory_embeddings(
+            {memory_id: vector.tobytes() for memory_id, vector in embeddings.items()},
+            get_embedding_model_id(request),
+        )
+        return embeddings
+
+    async def get(self, request: Request, user) -> UserMemoryMatrix:
+        embedding_model = get_embedding_model_id(request)
+
+        with self._lock:
+            entry = self._entries.get(user.id)
+            generation = self._generation
+
+        version = await self.get_version(request, user.id)
+        if entry is not None and entry.embedding_model == embedding_model:
+            if version is not None and version == entry.version:
+                with self._lock:
+                    if user.id in self._entries:
+                        self._entries.move_to_end(user.id)
+                return entry
+
+        rows = Memories.get_memory_embeddings_by_user_id(user.id)
+
+        memories = []
+        vectors = []
+        stale = []
+        for memory, embedding, model in rows:
+            memories.append(memory)
+            if embedding is not None and model == embedding_model:
+                vectors.append(np.frombuffer(embedding, dtype=np.float32))
+            else:
+                vectors.append(None)
+                stale.append(memory)
+
+        if stale:
+            log.debug(f"Embedding {len(stale)} memories for user {user.id}")
+            embedded = await self.embed_memories(request, stale, user)
+            vectors = [
+                embedded[memory.id] if vector is None else vector
+                for memory, vector in zip(memories, vectors)
+            ]
+
+        if vectors:
+            matrix = np.vstack(vectors)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.where(norms == 0, 1, norms)
+        else:
+            matrix = np.zeros((0, 0), dtype=np.float32)
+
+        entry = UserMemoryMatrix(memories, matrix, embedding_model, version)
+        if self.max_users > 0:
+            with self._lock:
+                if version is None or generation != self._generation:
+                    return entry
+                self._entries[user.id] = entry
+                self._entries.move_to_end(user.id)
+                while len(self._entries) > self.max_users:
+                    self._entries.popitem(last=False)
+        return entry
+
+    async def search(
+        self, request: Request, user, vector: list[float], k: int
+    ) -> SearchResult:
+        return (await self.get(request, user)).search(vector, k)
+
+
+MEMORY_INDEX = MemoryIndex(MEMORY_INDEX_CACHE_SIZE)
+
+
+async def embed_written_memories(request: Request, user, memories: list[MemoryModel]):
+    """
+    Embed memories that were just stored or edited and invalidate the user's
+    cached matrix. Embedding failures are logged, not raised.
+    """
+    try:
+        await MEMORY_INDEX.embed_memories(request, memories, user)
+    except Exception as e:
+        # The memories are stored; they are embedded when the index is next built
+        log.warning(f"Failed to embed {len(memories)} memories for user {user.id}: {e}")
+    finally:
+        await MEMORY_INDEX.invalidate(request, user.id)
+
+
+async def add_memories(
+    request: Request, user, contents: list[str]
+) -> list[MemoryModel]:
+    """Store several memories for a user in one transaction and embed them in batches."""
+    memories = Memories.insert_new_memories(user.id, contents)
+    await embed_written_memories(request, user, memories)
+    return memories
+
+
+async def reembed_memories(request: Request) -> int:
+    """
+    Re-embed every memory whose vector is missing or was produced by another
+    embedding model, one user at a time. Returns the number of memories embedded.
+    """
+    embedding_model = get_embedding_model_id(request)
+    user_ids = Memories.get_user_ids_with_stale_embeddings(embedding_model)
+    log.info(f"Re-embedding memories for {len(user_ids)} users with {embedding_model}")
+
+    total = 0
+    for user_id in user_ids:
+        stale = [
+            memory
+            for memory, embedding, model in Memories.get_memory_embeddings_by_user_id(
+                user_id
+            )
+            if embedding is None or model != embedding_model
+        ]
+        try:
+            await MEMORY_INDEX.embed_memories(
+                request, stale, Users.get_user_by_id(user_id)
+            )
+            total += len(stale)
+        except Exception as e:
+            log.error(f"Failed to re-embed memories for user {user_id}: {e}")
+        await MEMORY_INDEX.invalidate(request, user_id)
+
+    log.info(f"Re-embedded {total} memories")
+    return total
+
+
+REEMBED_TASK: Optional[asyncio.Task] = None
+
+
+def start_reembed_memories(request: Request) -> bool:
+    """Run reembed_memories in the background. Returns False if already running."""
+    global REEMBED_TASK
+    if REEMBED_TASK is not None and not REEMBED_TASK.done():
+        return False
+    REEMBED_TASK = asyncio.create_task(reembed_memories(request))
+    return True
@@ -1,5 +1,7 @@
 import os
 import logging
+from typing import Optional
+
 import torch
 import numpy as np
 from colbert.infra import ColBERTConfig
@@ -7,15 +9,30 @@ from colbert.modeling.checkpoint import Checkpoint
 
 
 from open_webui.retrieval.models.base_reranker import BaseReranker
+from open_webui.retrieval.models.colbert_store import ColBERTEmbeddingStore
 
 log = logging.getLogger(__name__)
 
 
 class ColBERT(BaseReranker):
-    def __init__(self, name, **kwargs) -> None:
+    def __init__(
+        self,
+        name,
+        embedding_dir: Optional[str] = None,
+        embedding_max_size: Optional[int] = None,
+        **kwargs,
+    ) -> None:
         log.info("ColBERT: Loading model", name)
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
 
+        # When set, document token embeddings are computed once (at ingestion
+        # or on first use) and reused across queries
+        self.store = (
+            ColBERTEmbeddingStore(embedding_dir, name, max_size=embedding_max_size)
+            if embedding_dir
+            else None
+        )
+
         DOCKER = kwargs.get("env") == "docker"
         if DOCKER:
             # This is a workaround for the issue with the docker container
@@ -68,13 +85,63 @@ class ColBERT(BaseReranker):
 
         return normalized_scores.detach().cpu().numpy().astype(np.float32)
 
+    def embed_documents(self, docs: list[str]) -> list[np.ndarray]:
+        """Per-document [num_tokens, dim] token embeddings, padding removed."""
+        result = self.ckpt.docFromText(docs, bsize=32, keep_dims=False, to_cpu=True)
+        return [d.detach().float().numpy() for d in result[0]]
+
+    def index_documents(self, docs: list[str]) -> int:
+        """
+        Precompute and store token embeddings for chunks at ingestion time.
+
+        Returns the number of chunks that were newly embedded.
+        """
+        if self.store is None:
+            return 0
+
+        missing = list({doc for doc in docs if self.store.get(doc) is None})
+        if not missing:
+            return 0
+
+        for doc, embeddings in zip(missing, self.embed_documents(missing)):
+            self.store.put(doc, embeddings)
+        return len(missing)
+
+    def clear_document_embeddings(self) -> None:
+        if self.store is not None:
+            self.store.clear()
+
+    def get_document_embeddings(self, docs: list[str]) -> torch.Tensor:
+        """
+        Zero-padded [num_docs, max_tokens, dim] embeddings, reading stored
+        matrices where available and embedding (and storing) the rest.
+        """
+        if self.store is None:
+            return self.ckpt.docFromText(docs, bsize=32)[0]
+
+        matrices = [self.store.get(doc) for doc in docs]
+        missing = [idx for idx, matrix in enumerate(matrices) if matrix is None]
+        if missing:
+            embedded = self.embed_documents([docs[idx] for idx in missing])
+            for idx, embeddings in zip(missing, embedded):
+                self.store.put(docs[idx], embeddings)
+                matrices[idx] = embeddings
+
+        max_tokens = max(matrix.shape[0] for matrix in matrices)
+        dim = matrices[0].shape[1]
+        # Padding rows are zero, matching docFromText(keep_dims=True)
+        padded = np.zeros((len(matrices), max_tokens, dim), dtype=np.float32)
+        for idx, matrix in enumerate(matrices):
+            padded[idx, : matrix.shape[0]] = matrix
+        return torch.from_numpy(padded)
+
     def predict(self, sentences):
 
         query = sentences[0][0]
         docs = [i[1] for i in sentences]
 
-        # Embedding the documents
-        embedded_docs = self.ckpt.docFromText(docs, bsize=32)[0]
+        # Embedding the documents (or loading their stored embeddings)
+        embedded_docs = self.get_document_embeddings(docs)
         # Embedding the queries
         embedded_queries = self.ckpt.queryFromText([query], bsize=32)
         embedded_query = embedded_queries[0]
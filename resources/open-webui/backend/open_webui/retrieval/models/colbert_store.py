@@ -0,0 +1,128 @@
+import os
+import hashlib
+import logging
+import threading
+from typing import Optional
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+
+class ColBERTEmbeddingStore:
+    """
+    On-disk store of per-chunk ColBERT token embeddings.
+
+    Each chunk's [num_tokens, dim] matrix is saved as an fp16 .npy file named
+    by the SHA-256 of the chunk text, under a directory per model. Files are
+    memory-mapped on load, so reranking only pages in the matrices it scores.
+
+    Chunks are shared by every collection containing the same text, so files
+    aren't tied to collections. Instead, when ``max_size`` (bytes) is set, the
+    least recently used files are evicted once the store grows past it.
+    """
+
+    def __init__(self, directory: str, model_name: str, max_size: Optional[int] = None):
+        model_slug = hashlib.sha256(model_name.encode()).hexdigest()[:16]
+        self.directory = os.path.join(directory, model_slug)
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Bytes on disk, scanned on the first write
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _path(self, text: str) -> str:
+        key = hashlib.sha256(text.encode()).hexdigest()
+        return os.path.join(self.directory, key[:2], f"{key}.npy")
+
+    def _files(self) -> list[os.DirEntry]:
+        files = []
+        if not os.path.isdir(self.directory):
+            return files
+        for prefix in os.scandir(self.directory):
+            if prefix.is_dir():
+                files.extend(
+                    entry
+                    for entry in os.scandir(prefix.path)
+                    if entry.name.endswith(".npy")
+                )
+        return files
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        path = self._path(text)
+        if not os.path.exists(path):
+            return None
+        try:
+            embeddings = np.load(path, mmap_mode="r")
+        except Exception as e:
+            log.warning(f"ColBERT: Failed to load stored embeddings {path}: {e}")
+            return None
+
+        if self.max_size is not None:
+            # The modification time orders eviction, so reads count as use
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return embeddings
+
+    def put(self, text: str, embeddings: np.ndarray) -> None:
+        path = self._path(text)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so concurrent readers never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, embeddings.astype(np.float16))
+        os.replace(tmp_path, path)
+
+        if self.max_size is not None:
+            self._track(os.path.getsize(path))
+
+    def _track(self, written: int) -> None:
+        with self._lock:
+            if self._size is None:
+                self._size = sum(entry.stat().st_size for entry in self._files())
+            else:
+                self._size += written
+            if self._size > self.max_size:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Evict down to 90% of the bound so the next writes don't rescan
+        target = self.max_size * 0.9
+        files = sorted(
+            ((entry.stat(), entry.path) for entry in self._files()),
+            key=lambda item: item[0].st_mtime,
+        )
+        size = sum(stat.st_size for stat, _ in files)
+        evicted = 0
+        for stat, path in files:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= stat.st_size
+            evicted += 1
+        self._size = size
+        log.info(f"ColBERT: Evicted {evicted} stored embeddings")
+
+    def clear(self) -> None:
+        """Remove the stored embeddings, leaving any other files in place."""
+        with self._lock:
+            for entry in self._files():
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+            if os.path.isdir(self.directory):
+                for prefix in os.scandir(self.directory):
+                    if prefix.is_dir():
+                        try:
+                            # Only succeeds once the prefix directory is empty
+                            os.rmdir(prefix.path)
+                        except OSError:
+                            pass
+            self._size = 0
@@ -0,0 +1,71 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+log = logging.getLogger(__name__)
+
+
+class LazyModel:
+    """
+    Handle for a model whose weights are loaded in the background.
+
+    Attribute access is forwarded to the loaded model. If the model is not
+    loaded yet, the caller blocks until it is (loading it in the calling
+    thread if no background load has started), so the handle can stand in
+    wherever the model itself is expected.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        warmup: Optional[Callable[[Any], Any]] = None,
+    ):
+        self._name = name
+        self._loader = loader
+        self._warmup = warmup
+        self._model = None
+        self._error: Optional[Exception] = None
+        self._loaded = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def status(self) -> str:
+        if not self._loaded.is_set():
+            return "loading"
+        return "ready" if self._model is not None else "failed"
+
+    def load(self):
+        with self._lock:
+            if not self._loaded.is_set():
+                start = time.monotonic()
+                try:
+                    model = self._loader()
+                    if model is not None and self._warmup is not None:
+                        # One inference so the first real request does not pay
+                        # for lazy initialization inside the model
+                        self._warmup(model)
+                    self._model = model
+                    log.info(
+                        f"Loaded {self._name} model in {time.monotonic() - start:.1f}s"
+                    )
+                except Exception as e:
+                    self._error = e
+                    log.error(f"Error loading {self._name} model: {e}")
+                finally:
+                    self._loaded.set()
+        return self._model
+
+    async def load_async(self):
+        return await asyncio.to_thread(self.load)
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        model = self.load()
+        if model is None:
+            raise AttributeError(f"{self._name} model is not available: {name}")
+        return getattr(model, name)
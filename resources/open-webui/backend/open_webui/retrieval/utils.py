@@ -9,7 +9,11 @@ import hashlib
 from concurrent.futures import ThreadPoolExecutor
 import time
 import re
+import weakref
+from collections import OrderedDict
+from functools import partial
 
+import numpy as np
 from urllib.parse import quote
 from huggingface_hub import snapshot_download
 from langchain_classic.retrievers import (
@@ -30,12 +34,12 @@ from open_webui.models.knowledge import Knowledges
 from open_webui.models.chats import Chats
 from open_webui.models.notes import Notes
 
+from open_webui.retrieval.models.lazy import LazyModel
 from open_webui.retrieval.vector.main import GetResult
 from open_webui.utils.access_control import has_access
 from open_webui.utils.headers import include_user_info_headers
 from open_webui.utils.misc import get_message_list
 
-from open_webui.retrieval.web.utils import get_web_loader
 from open_webui.retrieval.loaders.youtube import YoutubeLoader
 
 
@@ -44,6 +48,9 @@ from open_webui.env import (
     OFFLINE_MODE,
     ENABLE_FORWARD_USER_INFO_HEADERS,
     AIOHTTP_CLIENT_SESSION_SSL,
+    RAG_EMBEDDING_CACHE_SIZE,
+    RAG_EMBEDDING_BATCH_MAX_SIZE,
+    RAG_EMBEDDING_BATCH_MAX_WAIT_MS,
 )
 from open_webui.config import (
     RAG_EMBEDDING_QUERY_PREFIX,
@@ -60,6 +67,264 @@ from langchain_core.callbacks import CallbackManagerForRetrieverRun
 from langchain_core.retrievers import BaseRetriever
 
 
+class EmbeddingCache:
+    """
+    In-process LRU cache of embeddings, keyed by the embedding model that
+    produced them and a hash of the (prefixed) text.
+
+    Hybrid search embeds the query once for the vector retriever and again in
+    the reranking stage, and re-embeds every candidate document on every
+    query. Caching both lets repeated lookups skip the embedding engine.
+
+    Functions built by get_embedding_function carry a ``cache_key`` of
+    (engine, model, url), so entries are shared across requests, which bind
+    the app's embedding function per user with functools.partial. Other
+    callables are cached for as long as the function object lives.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._caches: dict[tuple, OrderedDict] = {}
+        self._function_caches = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _key(text: str, prefix: Optional[str]) -> str:
+        return hashlib.sha256(f"{prefix or ''}\x00{text}".encode()).hexdigest()
+
+    def _get_cache(self, embedding_function) -> OrderedDict:
+        function = embedding_function
+        while isinstance(function, partial):
+            function = function.func
+
+        cache_key = getattr(function, "cache_key", None)
+        if cache_key is not None:
+            return self._caches.setdefault(cache_key, OrderedDict())
+        return self._function_caches.setdefault(function, OrderedDict())
+
+    async def embed(
+        self, embedding_function, texts: list[str], prefix: Optional[str] = None
+    ) -> Optional[np.ndarray]:
+        """Return a (len(texts), dim) float32 matrix, embedding only cache misses."""
+        if not texts:
+            return None
+
+        if self.max_size <= 0:
+            embeddings = await embedding_function(texts, prefix)
+            if not embeddings or len(embeddings) != len(texts):
+                return None
+            return np.asarray(embeddings, dtype=np.float32)
+
+        cache = self._get_cache(embedding_function)
+        keys = [self._key(text, prefix) for text in texts]
+
+        # Hits are copied out before awaiting: a concurrent call may evict them
+        vectors = {}
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key in vectors or key in missing:
+                continue
+            if key in cache:
+                vectors[key] = cache[key]
+            else:
+                missing[key] = text
+
+        if missing:
+            embeddings = await embedding_function(list(missing.values()), prefix)
+            if not embeddings or len(embeddings) != len(missing):
+                return None
+            for key, embedding in zip(missing.keys(), embeddings):
+                vectors[key] = np.asarray(embedding, dtype=np.float32)
+
+        for key, vector in vectors.items():
+            if key in cache:
+                cache.move_to_end(key)
+            else:
+                cache[key] = vector
+
+        while len(cache) > self.max_size:
+            cache.popitem(last=False)
+
+        return np.vstack([vectors[key] for key in keys])
+
+
+EMBEDDING_CACHE = EmbeddingCache(RAG_EMBEDDING_CACHE_SIZE)
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batching executor for a local SentenceTransformer model.
+
+    Requests from all coroutines are queued and merged into batches of up to
+    ``max_batch_size`` texts, waiting at most ``max_wait_ms`` for a batch to
+    fill. Batches are encoded one at a time on a single dedicated thread, so
+    concurrent chat turns share one forward pass instead of contending for the
+    model and CPU cores from separate threads.
+    """
+
+    def __init__(
+        self,
+        model,
+        batch_size: int,
+        max_batch_size: int = RAG_EMBEDDING_BATCH_MAX_SIZE,
+        max_wait_ms: float = RAG_EMBEDDING_BATCH_MAX_WAIT_MS,
+    ):
+        # Weak reference so a cached batcher never keeps a replaced model alive
+        self._model = weakref.ref(model)
+        self.batch_size = batch_size
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.stopped = False
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="embedding"
+        )
+        # (queue, worker task) per event loop
+        self._workers = weakref.WeakKeyDictionary()
+
+    def stop(self):
+        """
+        Stop the worker tasks and thread. Queued and in-flight requests fail
+        with RuntimeError. Safe to call from any thread, more than once.
+        """
+        if self.stopped:
+            return
+        self.stopped = True
+        for loop, (_, task) in list(self._workers.items()):
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(task.cancel)
+        self._executor.shutdown(wait=False)
+
+    def _encode(self, texts: list[str], prefix: Optional[str]) -> list[list[float]]:
+        model = self._model()
+        if model is None:
+            raise RuntimeError("Embedding model has been unloaded")
+        return model.encode(
+            texts,
+            batch_size=int(self.batch_size),
+            **({"prompt": prefix} if prefix else {}),
+        ).tolist()
+
+    async def encode(
+        self, query: Union[str, list[str]], prefix: Optional[str] = None
+    ) -> Union[list[float], list[list[float]]]:
+        texts = [query] if isinstance(query, str) else list(query)
+        if not texts:
+            return []
+        if self.stopped:
+            raise RuntimeError("Embedding batcher has been stopped")
+
+        loop = asyncio.get_running_loop()
+        if self.max_wait <= 0:
+            embeddings = await loop.run_in_executor(
+                self._executor, self._encode, texts, prefix
+            )
+        else:
+            future = loop.create_future()
+            self._get_queue(loop).put_nowait((texts, prefix, future))
+            embeddings = await future
+
+        return embeddings[0] if isinstance(query, str) else embeddings
+
+    def _get_queue(self, loop) -> asyncio.Queue:
+        worker = self._workers.get(loop)
+        if worker is None:
+            queue = asyncio.Queue()
+            worker = (queue, loop.create_task(self._run(queue)))
+            self._workers[loop] = worker
+        return worker[0]
+
+    async def _next_batch(self, queue: asyncio.Queue, batch: list):
+        # Fills ``batch`` in place so requests taken from the queue are not
+        # lost if the worker is cancelled while waiting for more
+        batch.append(await queue.get())
+        size = len(batch[0][0])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                request = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            batch.append(request)
+            size += len(request[0])
+
+    async def _run(self, queue: asyncio.Queue):
+        batch = []
+        try:
+            while True:
+                batch = []
+                await self._next_batch(queue, batch)
+                await self._encode_batch(batch)
+        except asyncio.CancelledError:
+            # Stopped: fail the batch being encoded and everything still queued
+            error = RuntimeError("Embedding batcher has been stopped")
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            raise
+
+    async def _encode_batch(self, batch: list):
+        loop = asyncio.get_running_loop()
+        # A single encode call takes a single prompt, so group by prefix
+        groups = {}
+        for request in batch:
+            groups.setdefault(request[1], []).append(request)
+
+        for prefix, requests in groups.items():
+            requests = [r for r in requests if not r[2].done()]
+            if not requests:
+                continue
+
+            texts = [text for r in requests for text in r[0]]
+            try:
+                embeddings = await loop.run_in_executor(
+                    self._executor, self._encode, texts, prefix
+                )
+            except Exception as e:
+                for _, _, future in requests:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for request_texts, _, future in requests:
+                if not future.done():
+                    future.set_result(embeddings[offset : offset + len(request_texts)])
+                offset += len(request_texts)
+
+        log.debug(
+            f"EmbeddingBatcher: encoded {len(batch)} requests in {len(groups)} batches"
+        )
+
+
+EMBEDDING_BATCHERS = weakref.WeakKeyDictionary()
+
+
+def get_embedding_batcher(model, batch_size: int) -> EmbeddingBatcher:
+    """
+    Return the shared batcher for ``model``, creating it on first use.
+
+    Only one local embedding model is served at a time, so creating a batcher
+    stops the ones left over from a replaced model or batch size. A batcher is
+    also stopped once its model is garbage collected.
+    """
+    batcher = EMBEDDING_BATCHERS.get(model)
+    if batcher is None or batcher.batch_size != batch_size:
+        for old_batcher in list(EMBEDDING_BATCHERS.values()):
+            old_batcher.stop()
+        EMBEDDING_BATCHERS.clear()
+
+        batcher = EmbeddingBatcher(model, batch_size)
+        EMBEDDING_BATCHERS[model] = batcher
+        weakref.finalize(model, batcher.stop)
+    return batcher
+
+
 def is_youtube_url(url: str) -> bool:
     youtube_regex = r"^(https?://)?(www\.)?(youtube\.com|youtu\.be)/.+$"
     return re.match(youtube_regex, url) is not None
@@ -73,6 +338,8 @@ def get_loader(request, url: str):
             proxy_url=request.app.state.config.YOUTUBE_LOADER_PROXY_URL,
         )
     else:
+        from open_webui.retrieval.web.utils import get_web_loader
+
         return get_web_loader(
             url,
             verify_ssl=request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION,
@@ -113,10 +380,16 @@ class VectorSearchRetriever(BaseRetriever):
         *,
         run_manager: CallbackManagerForRetrieverRun,
     ) -> list[Document]:
-        embedding = await self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
+        # Goes through the cache so the reranking stage can reuse this embedding
+        embedding = await EMBEDDING_CACHE.embed(
+            self.embedding_function, [query], RAG_EMBEDDING_QUERY_PREFIX
+        )
+        if embedding is None:
+            return []
+
         result = VECTOR_DB_CLIENT.search(
             collection_name=self.collection_name,
-            vectors=[embedding],
+            vectors=[embedding[0].tolist()],
             limit=self.top_k,
         )
 
@@ -797,20 +1070,21 @@ def get_embedding_function(
     enable_async=True,
 ) -> Awaitable:
     if embedding_engine == "":
-        # Sentence transformers: CPU-bound sync operation
+        if embedding_function is None:
+
+            async def async_embedding_function(query, prefix=None, user=None):
+                raise ValueError("Embedding model is not loaded")
+
+            return async_embedding_function
+
+        # Sentence transformers: CPU-bound sync operation, micro-batched across
+        # concurrent callers on a dedicated worker thread
+        batcher = get_embedding_batcher(embedding_function, embedding_batch_size)
+
         async def async_embedding_function(query, prefix=None, user=None):
-            return await asyncio.to_thread(
-                (
-                    lambda query, prefix=None: embedding_function.encode(
-                        query,
-                        batch_size=int(embedding_batch_size),
-                        **({"prompt": prefix} if prefix else {}),
-                    ).tolist()
-                ),
-                query,
-                prefix,
-            )
+            return await batcher.encode(query, prefix)
 
+        async_embedding_function.cache_key = (embedding_engine, embedding_model, url)
         return async_embedding_function
     elif embedding_engine in ["ollama", "openai", "azure_openai"]:
         embedding_function = lambda query, prefix=None, user=None: generate_embeddings(
@@ -865,6 +1139,8 @@ def get_embedding_function(
             else:
                 return await embedding_function(query, prefix, user)
 
+        # Lets EmbeddingCache share entries across requests using this model
+        async_embedding_function.cache_key = (embedding_engine, embedding_model, url)
         return async_embedding_function
     else:
         raise ValueError(f"Unknown embedding engine: {embedding_engine}")
@@ -921,14 +1197,22 @@ async def generate_embeddings(
 def get_reranking_function(reranking_engine, reranking_model, reranking_function):
     if reranking_function is None:
         return None
-    if reranking_engine == "external":
-        return lambda query, documents, user=None: reranking_function.predict(
-            [(query, doc.page_content) for doc in documents], user=user
-        )
-    else:
-        return lambda query, documents, user=None: reranking_function.predict(
-            [(query, doc.page_content) for doc in documents]
-        )
+
+    def rerank(query, documents, user=None):
+        if (
+            isinstance(reranking_function, LazyModel)
+            and reranking_function.load() is None
+        ):
+            # The model failed to load; RerankCompressor falls back to cosine
+            # scoring on None
+            return None
+
+        pairs = [(query, doc.page_content) for doc in documents]
+        if reranking_engine == "external":
+            return reranking_function.predict(pairs, user=user)
+        return reranking_function.predict(pairs)
+
+    return rerank
 
 
 async def get_sources_from_items(
@@ -1249,7 +1533,6 @@ def get_model_path(model: str, update_model: bool = False):
         return model
 
 
-import operator
 from typing import Optional, Sequence
 
 from langchain_core.callbacks import Callbacks
@@ -1291,39 +1574,34 @@ class RerankCompressor(BaseDocumentCompressor):
         query: str,
         callbacks: Optional[Callbacks] = None,
     ) -> Sequence[Document]:
-        reranking = self.reranking_function is not None
+        if not documents:
+            return documents
 
         scores = None
-        if reranking:
+        if self.reranking_function is not None:
             scores = await asyncio.to_thread(self.reranking_function, query, documents)
-        else:
-            from sentence_transformers import util
+            if scores is not None:
+                scores = np.asarray(
+                    scores.tolist() if not isinstance(scores, list) else scores,
+                    dtype=np.float64,
+                ).reshape(-1)
 
-            query_embedding = await self.embedding_function(
-                query, RAG_EMBEDDING_QUERY_PREFIX
-            )
-            document_embedding = await self.embedding_function(
-                [doc.page_content for doc in documents], RAG_EMBEDDING_CONTENT_PREFIX
-            )
-            scores = util.cos_sim(query_embedding, document_embedding)[0]
+        if scores is None:
+            # No reranker, or it is unavailable (e.g. its model failed to load)
+            scores = await self._cosine_scores(query, documents)
 
-        if scores is not None:
-            docs_with_scores = list(
-                zip(
-                    documents,
-                    scores.tolist() if not isinstance(scores, list) else scores,
-                )
-            )
+        if scores is not None and len(scores) == len(documents):
+            candidates = np.arange(len(documents))
             if self.r_score:
-                docs_with_scores = [
-                    (d, s) for d, s in docs_with_scores if s >= self.r_score
-                ]
+                candidates = candidates[scores >= self.r_score]
+
+            top_idx = select_top_k(scores, candidates, self.top_n)
 
-            result = sorted(docs_with_scores, key=operator.itemgetter(1), reverse=True)
             final_results = []
-            for doc, doc_score in result[: self.top_n]:
+            for idx in top_idx:
+                doc = documents[idx]
                 metadata = doc.metadata
-                metadata["score"] = doc_score
+                metadata["score"] = float(scores[idx])
                 doc = Document(
                     page_content=doc.page_content,
                     metadata=metadata,
@@ -1335,3 +1613,40 @@ class RerankCompressor(BaseDocumentCompressor):
                 "No valid scores found, check your reranking function. Returning original documents."
             )
             return documents
+
+    async def _cosine_scores(
+        self, query: str, documents: Sequence[Document]
+    ) -> Optional[np.ndarray]:
+        query_embedding = await EMBEDDING_CACHE.embed(
+            self.embedding_function, [query], RAG_EMBEDDING_QUERY_PREFIX
+        )
+        document_embeddings = await EMBEDDING_CACHE.embed(
+            self.embedding_function,
+            [doc.page_content for doc in documents],
+            RAG_EMBEDDING_CONTENT_PREFIX,
+        )
+        if query_embedding is None or document_embeddings is None:
+            return None
+
+        query_vector = query_embedding[0]
+        norms = np.linalg.norm(document_embeddings, axis=1) * np.linalg.norm(
+            query_vector
+        )
+        # Zero vectors score 0 instead of producing NaN
+        norms[norms == 0] = 1.0
+        return (document_embeddings @ query_vector) / norms
+
+
+def select_top_k(scores: np.ndarray, candidates: np.ndarray, k: int) -> np.ndarray:
+    """Return the indices in `candidates` with the k highest scores, best first."""
+    if k <= 0 or len(candidates) == 0:
+        return candidates[:0]
+
+    candidate_scores = scores[candidates]
+    if k < len(candidates):
+        partition = np.sort(np.argpartition(-candidate_scores, k - 1)[:k])
+        candidates = candidates[partition]
+        candidate_scores = candidate_scores[partition]
+
+    # Stable sort keeps retriever order for tied scores
+    return candidates[np.argsort(-candidate_scores, kind="stable")]
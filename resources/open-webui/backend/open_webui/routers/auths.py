@@ -84,7 +84,7 @@ router = APIRouter()
 log = logging.getLogger(__name__)
 
 signin_rate_limiter = RateLimiter(
-    redis_client=get_redis_client(), limit=5 * 3, window=60 * 3
+    redis_client=get_redis_client(async_mode=True), limit=5 * 3, window=60 * 3
 )
 
 ############################
@@ -624,7 +624,7 @@ async def signin(
                 db=db,
             )
     else:
-        if signin_rate_limiter.is_limited(form_data.email.lower()):
+        if await signin_rate_limiter.is_limited(form_data.email.lower()):
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail=ERROR_MESSAGES.RATE_LIMIT_EXCEEDED,
@@ -1,6 +1,14 @@
 from typing import Optional
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+import threading
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    status,
+    Request,
+)
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
@@ -16,6 +24,7 @@ from open_webui.models.feedbacks import (
     ModelHistoryEntry,
     ModelHistoryResponse,
     Feedbacks,
+    apply_elo_match,
 )
 
 from open_webui.constants import ERROR_MESSAGES
@@ -55,18 +64,106 @@ EMBEDDING_MODEL_NAME = os.environ.get(
     "AUXILIARY_EMBEDDING_MODEL", "TaylorAI/bge-micro-v2"
 )
 _embedding_model = None
+_embedding_model_lock = threading.Lock()
 
 
 def _get_embedding_model():
     global _embedding_model
-    if _embedding_model is None:
-        try:
-            from sentence_transformers import SentenceTransformer
+    with _embedding_model_lock:
+        if _embedding_model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+
+                _embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+            except Exception as e:
+                log.error(f"Embedding model load failed: {e}")
+    return _embedding_model
+
+
+class TagEmbeddingIndex:
+    """
+    Tag embeddings of the auxiliary model, persisted in the
+    feedback_tag_embedding table and held in memory as one normalized matrix.
+
+    Tags are embedded once, when feedback carrying them arrives (or on first
+    search for older tags), so a topic query only encodes the query itself
+    and scores every tag with a single matrix-vector product.
+    """
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.positions: dict[str, int] = {}
+        self.matrix = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        import numpy as np
+
+        embeddings = Feedbacks.get_tag_embeddings(self.model_name)
+        self.positions = {tag: i for i, tag in enumerate(embeddings)}
+        self.matrix = (
+            np.stack([np.frombuffer(e, dtype=np.float32) for e in embeddings.values()])
+            if embeddings
+            else None
+        )
+
+    def ensure(self, tags) -> bool:
+        """Embed and store any of ``tags`` not indexed yet. Blocking."""
+        import numpy as np
+
+        tags = {tag for tag in tags if isinstance(tag, str) and tag}
+        with self._lock:
+            if self.matrix is None or tags - self.positions.keys():
+                # Pick up tags other workers have embedded since the last load
+                self._load()
+
+            missing = sorted(tags - self.positions.keys())
+            if not missing:
+                return True
+
+            embedding_model = _get_embedding_model()
+            if not embedding_model:
+                return False
+            try:
+                vectors = np.asarray(embedding_model.encode(missing), dtype=np.float32)
+            except Exception as e:
+                log.error(f"Embedding error: {e}")
+                return False
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-9
+
+            Feedbacks.insert_tag_embeddings(
+                self.model_name,
+                {tag: vector.tobytes() for tag, vector in zip(missing, vectors)},
+            )
+            offset = len(self.positions)
+            self.positions.update({tag: offset + i for i, tag in enumerate(missing)})
+            self.matrix = (
+                vectors if self.matrix is None else np.vstack([self.matrix, vectors])
+            )
+            return True
+
+    def similarities(self, query: str) -> dict[str, float]:
+        """Cosine similarity of the query to every indexed tag."""
+        import numpy as np
 
-            _embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+        embedding_model = _get_embedding_model()
+        if not embedding_model or self.matrix is None:
+            return {}
+        try:
+            query_embedding = np.asarray(
+                embedding_model.encode([query])[0], dtype=np.float32
+            )
         except Exception as e:
-            log.error(f"Embedding model load failed: {e}")
-    return _embedding_model
+            log.error(f"Embedding error: {e}")
+            return {}
+        query_embedding /= np.linalg.norm(query_embedding) + 1e-9
+
+        with self._lock:
+            scores = self.matrix @ query_embedding
+            return dict(zip(self.positions.keys(), scores.tolist()))
+
+
+TAG_EMBEDDINGS = TagEmbeddingIndex(EMBEDDING_MODEL_NAME)
 
 
 def _calculate_elo(
@@ -85,40 +182,11 @@ def _calculate_elo(
 
     Returns: {model_id: {"rating": float, "won": int, "lost": int}}
     """
-    K_FACTOR = 32  # Standard Elo K-factor for rating volatility
     model_stats = {}
 
-    def get_or_create_stats(model_id):
-        if model_id not in model_stats:
-            model_stats[model_id] = {"rating": 1000.0, "won": 0, "lost": 0}
-        return model_stats[model_id]
-
     for feedback in feedbacks:
-        data = feedback.data or {}
-        winner_id = data.get("model_id")
-        rating_value = str(data.get("rating", ""))
-        if not winner_id or rating_value not in ("1", "-1"):
-            continue
-
-        won = rating_value == "1"
         weight = similarities.get(feedback.id, 1.0) if similarities else 1.0
-
-        for opponent_id in data.get("sibling_model_ids") or []:
-            winner = get_or_create_stats(winner_id)
-            opponent = get_or_create_stats(opponent_id)
-            expected = 1 / (1 + 10 ** ((opponent["rating"] - winner["rating"]) / 400))
-
-            winner["rating"] += K_FACTOR * ((1 if won else 0) - expected) * weight
-            opponent["rating"] += (
-                K_FACTOR * ((0 if won else 1) - (1 - expected)) * weight
-            )
-
-            if won:
-                winner["won"] += 1
-                opponent["lost"] += 1
-            else:
-                winner["lost"] += 1
-                opponent["won"] += 1
+        apply_elo_match(model_stats, feedback.data, weight)
 
     return model_stats
 
@@ -166,38 +234,19 @@ def _compute_similarities(feedbacks: list[LeaderboardFeedbackData], query: str)
 
     Returns: {feedback_id: similarity_score (0-1)}
     """
-    import numpy as np
-
-    embedding_model = _get_embedding_model()
-    if not embedding_model:
-        return {}
-
-    all_tags = list(
-        {
-            tag
-            for feedback in feedbacks
-            if feedback.data
-            for tag in feedback.data.get("tags", [])
-        }
-    )
-    if not all_tags:
+    all_tags = {
+        tag
+        for feedback in feedbacks
+        if feedback.data
+        for tag in feedback.data.get("tags", [])
+    }
+    if not all_tags or not TAG_EMBEDDINGS.ensure(all_tags):
         return {}
 
-    try:
-        tag_embeddings = embedding_model.encode(all_tags)
-        query_embedding = embedding_model.encode([query])[0]
-    except Exception as e:
-        log.error(f"Embedding error: {e}")
+    tag_similarity_map = TAG_EMBEDDINGS.similarities(query)
+    if not tag_similarity_map:
         return {}
 
-    # Vectorized cosine similarity
-    tag_norms = np.linalg.norm(tag_embeddings, axis=1)
-    query_norm = np.linalg.norm(query_embedding)
-    similarities = np.dot(tag_embeddings, query_embedding) / (
-        tag_norms * query_norm + 1e-9
-    )
-    tag_similarity_map = dict(zip(all_tags, similarities.tolist()))
-
     return {
         feedback.id: max(
             (
@@ -230,13 +279,28 @@ async def get_leaderboard(
     db: Session = Depends(get_session),
 ):
     """Get model leaderboard with Elo ratings. Query filters by tag similarity."""
-    feedbacks = Feedbacks.get_feedbacks_for_leaderboard(db=db)
+    if not (query and query.strip()):
+        # Unfiltered ratings are maintained as feedback is written
+        stats = await run_in_threadpool(Feedbacks.get_leaderboard_stats)
+        entries = [
+            LeaderboardEntry(
+                model_id=stat.model_id,
+                rating=round(stat.rating),
+                won=stat.won,
+                lost=stat.lost,
+                count=stat.won + stat.lost,
+                top_tags=stat.top_tags,
+            )
+            for stat in stats
+        ]
+        entries.sort(key=lambda e: e.rating, reverse=True)
+        return LeaderboardResponse(entries=entries)
 
-    similarities = None
-    if query and query.strip():
-        similarities = await run_in_threadpool(
-            _compute_similarities, feedbacks, query.strip()
-        )
+    # Query-weighted ratings depend on the query, so replay every feedback
+    feedbacks = Feedbacks.get_feedbacks_for_leaderboard(db=db)
+    similarities = await run_in_threadpool(
+        _compute_similarities, feedbacks, query.strip()
+    )
 
     elo_stats = _calculate_elo(feedbacks, similarities)
     tags_by_model = _get_top_tags(feedbacks)
@@ -260,6 +324,13 @@ async def get_leaderboard(
     return LeaderboardResponse(entries=entries)
 
 
+@router.post("/leaderboard/rebuild")
+async def rebuild_leaderboard(user=Depends(get_admin_user)):
+    """Recompute the materialized leaderboard from all feedback."""
+    count = await run_in_threadpool(Feedbacks.rebuild_leaderboard)
+    return {"status": True, "feedbacks": count}
+
+
 @router.get("/leaderboard/{model_id}/history", response_model=ModelHistoryResponse)
 async def get_model_history(
     model_id: str,
@@ -387,10 +458,19 @@ async def get_feedbacks(
     return result
 
 
+def _index_feedback_tags(
+    background_tasks: BackgroundTasks, feedback: Optional[FeedbackModel]
+):
+    tags = ((feedback.data or {}).get("tags") or []) if feedback else []
+    if tags:
+        background_tasks.add_task(TAG_EMBEDDINGS.ensure, tags)
+
+
 @router.post("/feedback", response_model=FeedbackModel)
 async def create_feedback(
     request: Request,
     form_data: FeedbackForm,
+    background_tasks: BackgroundTasks,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
@@ -403,6 +483,7 @@ async def create_feedback(
             detail=ERROR_MESSAGES.DEFAULT(),
         )
 
+    _index_feedback_tags(background_tasks, feedback)
     return feedback
 
 
@@ -429,6 +510,7 @@ async def get_feedback_by_id(
 async def update_feedback_by_id(
     id: str,
     form_data: FeedbackForm,
+    background_tasks: BackgroundTasks,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
@@ -444,6 +526,7 @@ async def update_feedback_by_id(
             status_code=status.HTTP_404_NOT_FOUND, detail=ERROR_MESSAGES.NOT_FOUND
         )
 
+    _index_feedback_tags(background_tasks, feedback)
     return feedback
 
 
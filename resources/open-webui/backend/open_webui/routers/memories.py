@@ -1,12 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel
 import logging
-import asyncio
 from typing import Optional
 
 from open_webui.models.memories import Memories, MemoryModel
+from open_webui.models.users import Users
+from open_webui.retrieval.memory import (
+    MEMORY_INDEX,
+    add_memories,
+    embed_written_memories,
+    start_reembed_memories,
+)
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
-from open_webui.utils.auth import get_verified_user
+from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.internal.db import get_session
 from sqlalchemy.orm import Session
 
@@ -87,23 +93,73 @@ async def add_memory(
 
     memory = Memories.insert_new_memory(user.id, form_data.content, db=db)
 
-    vector = await request.app.state.EMBEDDING_FUNCTION(memory.content, user=user)
-
-    VECTOR_DB_CLIENT.upsert(
-        collection_name=f"user-memory-{user.id}",
-        items=[
-            {
-                "id": memory.id,
-                "text": memory.content,
-                "vector": vector,
-                "metadata": {"created_at": memory.created_at},
-            }
-        ],
-    )
+    await embed_written_memories(request, user, [memory])
 
     return memory
 
 
+class AddMemoriesForm(BaseModel):
+    contents: list[str]
+
+
+@router.post("/add/bulk", response_model=list[MemoryModel])
+async def add_memories_bulk(
+    request: Request,
+    form_data: AddMemoriesForm,
+    user=Depends(get_verified_user),
+):
+    if not request.app.state.config.ENABLE_MEMORIES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+
+    if not has_permission(
+        user.id, "features.memories", request.app.state.config.USER_PERMISSIONS
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
+        )
+
+    contents = [content for content in form_data.contents if content.strip()]
+    if not contents:
+        return []
+
+    return await add_memories(request, user, contents)
+
+
+class AddUserMemoriesForm(AddMemoriesForm):
+    user_id: str
+
+
+@router.post("/add/bulk/user", response_model=list[MemoryModel])
+async def add_user_memories_bulk(
+    request: Request,
+    form_data: AddUserMemoriesForm,
+    user=Depends(get_admin_user),
+):
+    """Store several memories for any user, e.g. when importing them."""
+    if not request.app.state.config.ENABLE_MEMORIES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+
+    target_user = Users.get_user_by_id(form_data.user_id)
+    if target_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.USER_NOT_FOUND,
+        )
+
+    contents = [content for content in form_data.contents if content.strip()]
+    if not contents:
+        return []
+
+    return await add_memories(request, target_user, contents)
+
+
 ############################
 # QueryMemory
 ############################
@@ -135,19 +191,13 @@ async def query_memory(
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    memories = Memories.get_memories_by_user_id(user.id, db=db)
-    if not memories:
+    index = await MEMORY_INDEX.get(request, user)
+    if not index.memories:
         raise HTTPException(status_code=404, detail="No memories found for user")
 
     vector = await request.app.state.EMBEDDING_FUNCTION(form_data.content, user=user)
 
-    results = VECTOR_DB_CLIENT.search(
-        collection_name=f"user-memory-{user.id}",
-        vectors=[vector],
-        limit=form_data.k,
-    )
-
-    return results
+    return index.search(vector, form_data.k)
 
 
 ############################
@@ -173,34 +223,33 @@ async def reset_memory_from_vector_db(
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    VECTOR_DB_CLIENT.delete_collection(f"user-memory-{user.id}")
+    # Memories used to live in a per-user vector DB collection; drop any left over
+    try:
+        VECTOR_DB_CLIENT.delete_collection(f"user-memory-{user.id}")
+    except Exception as e:
+        log.debug(e)
 
     memories = Memories.get_memories_by_user_id(user.id, db=db)
 
-    # Generate vectors in parallel
-    vectors = await asyncio.gather(
-        *[
-            request.app.state.EMBEDDING_FUNCTION(memory.content, user=user)
-            for memory in memories
-        ]
-    )
+    # Re-embed every memory in batched calls
+    await embed_written_memories(request, user, memories)
 
-    VECTOR_DB_CLIENT.upsert(
-        collection_name=f"user-memory-{user.id}",
-        items=[
-            {
-                "id": memory.id,
-                "text": memory.content,
-                "vector": vectors[idx],
-                "metadata": {
-                    "created_at": memory.created_at,
-                    "updated_at": memory.updated_at,
-                },
-            }
-            for idx, memory in enumerate(memories)
-        ],
-    )
+    return True
 
+
+############################
+# ReembedAllMemories
+############################
+
+
+@router.post("/reembed", response_model=bool)
+async def reembed_all_memories(request: Request, user=Depends(get_admin_user)):
+    """Start a background job re-embedding memories after an embedding model change."""
+    if not start_reembed_memories(request):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=ERROR_MESSAGES.DEFAULT("Memory re-embedding is already running"),
+        )
     return True
 
 
@@ -232,6 +281,7 @@ async def delete_memory_by_user_id(
     result = Memories.delete_memories_by_user_id(user.id, db=db)
 
     if result:
+        await MEMORY_INDEX.invalidate(request, user.id)
         try:
             VECTOR_DB_CLIENT.delete_collection(f"user-memory-{user.id}")
         except Exception as e:
@@ -275,22 +325,7 @@ async def update_memory_by_id(
         raise HTTPException(status_code=404, detail="Memory not found")
 
     if form_data.content is not None:
-        vector = await request.app.state.EMBEDDING_FUNCTION(memory.content, user=user)
-
-        VECTOR_DB_CLIENT.upsert(
-            collection_name=f"user-memory-{user.id}",
-            items=[
-                {
-                    "id": memory.id,
-                    "text": memory.content,
-                    "vector": vector,
-                    "metadata": {
-                        "created_at": memory.created_at,
-                        "updated_at": memory.updated_at,
-                    },
-                }
-            ],
-        )
+        await embed_written_memories(request, user, [memory])
 
     return memory
 
@@ -324,9 +359,7 @@ async def delete_memory_by_id(
     result = Memories.delete_memory_by_id_and_user_id(memory_id, user.id, db=db)
 
     if result:
-        VECTOR_DB_CLIENT.delete(
-            collection_name=f"user-memory-{user.id}", ids=[memory_id]
-        )
+        await MEMORY_INDEX.invalidate(request, user.id)
         return True
 
     return False
@@ -9,27 +9,83 @@ from fastapi import (
     status,
     APIRouter,
 )
+import asyncio
 import aiohttp
 import os
 import logging
-import shutil
-import requests
 from pydantic import BaseModel
 from starlette.responses import FileResponse
 from typing import Optional
 
-from open_webui.env import AIOHTTP_CLIENT_SESSION_SSL
-from open_webui.config import CACHE_DIR
+from open_webui.env import AIOHTTP_CLIENT_SESSION_SSL, AIOHTTP_CLIENT_TIMEOUT_PIPELINE
 from open_webui.constants import ERROR_MESSAGES
 
 
 from open_webui.routers.openai import get_all_models_responses
 
+from open_webui.socket.utils import RedisDict
 from open_webui.utils.auth import get_admin_user
 
 log = logging.getLogger(__name__)
 
 
+##################################
+#
+# Pipeline Client
+#
+##################################
+
+
+class PipelineClient:
+    """
+    Long-lived aiohttp session for pipeline servers, so every filter hop and
+    admin call reuses a warm keep-alive connection instead of opening a new
+    session. A session is bound to its event loop and recreated if the loop
+    changes or it was closed.
+    """
+
+    def __init__(self, limit_per_host: int = 32, keepalive_timeout: float = 60):
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop = None
+
+    def get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = aiohttp.ClientSession(
+                trust_env=True,
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                ),
+            )
+            self._loop = loop
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+PIPELINE_CLIENT = PipelineClient()
+
+
+def get_pipeline_connection(request, urlIdx) -> tuple[str, str, aiohttp.ClientTimeout]:
+    """Base URL, key and filter timeout of a pipeline server (OpenAI connection)."""
+    url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
+    key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
+
+    # A connection's config may set its own "timeout" (seconds)
+    api_config = request.app.state.config.OPENAI_API_CONFIGS.get(
+        str(urlIdx), request.app.state.config.OPENAI_API_CONFIGS.get(url, {})
+    )
+    timeout = api_config.get("timeout", AIOHTTP_CLIENT_TIMEOUT_PIPELINE)
+    return url, key, aiohttp.ClientTimeout(total=timeout)
+
+
 ##################################
 #
 # Pipeline Middleware
@@ -56,113 +112,166 @@ def get_sorted_filters(model_id, models):
     return sorted_filters
 
 
-async def process_pipeline_inlet_filter(request, payload, user, models):
-    user = {"id": user.id, "email": user.email, "name": user.name, "role": user.role}
-    model_id = payload["model"]
-    sorted_filters = get_sorted_filters(model_id, models)
-    model = models[model_id]
+class PipelineFilterChains:
+    """
+    Sorted filter chains per model for the app-wide model list.
 
-    if "pipeline" in model:
-        sorted_filters.append(model)
+    Chains are computed once per model and dropped when the model list is
+    replaced: a new dict object in single-process mode, or a new version of
+    the shared RedisDict. Other model dicts (e.g. direct connections) are not
+    cached.
+    """
 
-    async with aiohttp.ClientSession(trust_env=True) as session:
-        for filter in sorted_filters:
-            urlIdx = filter.get("urlIdx")
+    def __init__(self):
+        self._models = None
+        self._version = None
+        self._chains = {}
 
-            try:
-                urlIdx = int(urlIdx)
-            except:
-                continue
+    def get(self, request, model_id, models) -> tuple[dict, list[dict]]:
+        """Return (model, sorted filters) for ``model_id``."""
+        app_models = request.app.state.MODELS
+        if models is not app_models:
+            return models[model_id], get_sorted_filters(model_id, models)
 
-            url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-            key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
+        version = models.get_version() if isinstance(models, RedisDict) else None
+        if models is not self._models or version != self._version:
+            self._models = models
+            self._version = version
+            self._chains = {}
 
-            if not key:
-                continue
+        if model_id not in self._chains:
+            model = models[model_id]
+            self._chains[model_id] = (model, get_sorted_filters(model_id, models))
+        return self._chains[model_id]
 
-            headers = {"Authorization": f"Bearer {key}"}
-            request_data = {
-                "user": user,
-                "body": payload,
-            }
 
-            try:
-                async with session.post(
-                    f"{url}/{filter['id']}/filter/inlet",
-                    headers=headers,
-                    json=request_data,
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as response:
-                    payload = await response.json()
-                    response.raise_for_status()
-            except aiohttp.ClientResponseError as e:
-                res = (
-                    await response.json()
-                    if response.content_type == "application/json"
-                    else {}
-                )
-                if "detail" in res:
-                    raise Exception(response.status, res["detail"])
-            except Exception as e:
-                log.exception(f"Connection error: {e}")
+PIPELINE_FILTER_CHAINS = PipelineFilterChains()
+
+
+async def _process_pipeline_filter(request, payload, user, filters, stage):
+    user = {"id": user.id, "email": user.email, "name": user.name, "role": user.role}
+    session = PIPELINE_CLIENT.get_session()
+
+    for filter in filters:
+        urlIdx = filter.get("urlIdx")
+
+        try:
+            urlIdx = int(urlIdx)
+        except:
+            continue
+
+        url, key, timeout = get_pipeline_connection(request, urlIdx)
+
+        if not key:
+            continue
+
+        headers = {"Authorization": f"Bearer {key}"}
+        request_data = {
+            "user": user,
+            "body": payload,
+        }
+
+        try:
+            async with session.post(
+                f"{url}/{filter['id']}/filter/{stage}",
+                headers=headers,
+                json=request_data,
+                timeout=timeout,
+            ) as response:
+                if response.status >= 400:
+                    res = (
+                        await response.json()
+                        if "application/json" in response.content_type
+                        else {}
+                    )
+                    # Inlet filters may reject the request; outlet errors are logged
+                    if stage == "inlet" and "detail" in res:
+                        raise Exception(response.status, res["detail"])
+                    log.warning(
+                        f"Pipeline {stage} filter {filter['id']} returned {response.status}"
+                    )
+                    continue
+                payload = await response.json()
+        except asyncio.TimeoutError:
+            log.error(f"Pipeline {stage} filter {filter['id']} timed out")
+        except (aiohttp.ClientError, ValueError) as e:
+            log.exception(f"Connection error: {e}")
 
     return payload
 
 
+async def process_pipeline_inlet_filter(request, payload, user, models):
+    model, sorted_filters = PIPELINE_FILTER_CHAINS.get(
+        request, payload["model"], models
+    )
+
+    if "pipeline" in model:
+        sorted_filters = sorted_filters + [model]
+
+    return await _process_pipeline_filter(
+        request, payload, user, sorted_filters, "inlet"
+    )
+
+
 async def process_pipeline_outlet_filter(request, payload, user, models):
-    user = {"id": user.id, "email": user.email, "name": user.name, "role": user.role}
-    model_id = payload["model"]
-    sorted_filters = get_sorted_filters(model_id, models)
-    model = models[model_id]
+    model, sorted_filters = PIPELINE_FILTER_CHAINS.get(
+        request, payload["model"], models
+    )
 
     if "pipeline" in model:
         sorted_filters = [model] + sorted_filters
 
-    async with aiohttp.ClientSession(trust_env=True) as session:
-        for filter in sorted_filters:
-            urlIdx = filter.get("urlIdx")
+    return await _process_pipeline_filter(
+        request, payload, user, sorted_filters, "outlet"
+    )
 
-            try:
-                urlIdx = int(urlIdx)
-            except:
-                continue
 
-            url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-            key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
+async def _pipeline_admin_request(request, urlIdx, method, path, **kwargs) -> dict:
+    """
+    Call a pipeline server admin endpoint, mapping failures to HTTPException.
 
-            if not key:
-                continue
-
-            headers = {"Authorization": f"Bearer {key}"}
-            request_data = {
-                "user": user,
-                "body": payload,
-            }
+    Admin calls have no total timeout: adding or uploading a pipeline makes the
+    server download it and install its requirements within the request.
+    """
+    status_code = status.HTTP_404_NOT_FOUND
+    detail = None
+    try:
+        url, key, _ = get_pipeline_connection(request, urlIdx)
 
-            try:
-                async with session.post(
-                    f"{url}/{filter['id']}/filter/outlet",
-                    headers=headers,
-                    json=request_data,
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as response:
-                    payload = await response.json()
-                    response.raise_for_status()
-            except aiohttp.ClientResponseError as e:
+        async with PIPELINE_CLIENT.get_session().request(
+            method,
+            f"{url}{path}",
+            headers={"Authorization": f"Bearer {key}"},
+            timeout=aiohttp.ClientTimeout(total=None),
+            **kwargs,
+        ) as r:
+            if r.status >= 400:
+                status_code = r.status
                 try:
-                    res = (
-                        await response.json()
-                        if "application/json" in response.content_type
-                        else {}
-                    )
+                    res = await r.json(content_type=None)
                     if "detail" in res:
-                        raise Exception(response.status, res)
+                        detail = res["detail"]
                 except Exception:
                     pass
-            except Exception as e:
-                log.exception(f"Connection error: {e}")
+                r.raise_for_status()
 
-    return payload
+            data = await r.json(content_type=None)
+            return {**data}
+    except asyncio.TimeoutError as e:
+        log.exception(f"Pipeline request timed out: {e}")
+
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Pipeline server timed out",
+        )
+    except Exception as e:
+        # Handle connection error here
+        log.exception(f"Connection error: {e}")
+
+        raise HTTPException(
+            status_code=status_code,
+            detail=detail if detail else "Pipeline not found",
+        )
 
 
 ##################################
@@ -213,54 +322,13 @@ async def upload_pipeline(
             detail="Only Python (.py) files are allowed.",
         )
 
-    upload_folder = f"{CACHE_DIR}/pipelines"
-    os.makedirs(upload_folder, exist_ok=True)
-    file_path = os.path.join(upload_folder, filename)
+    # Forward the upload as-is instead of staging it on disk
+    data = aiohttp.FormData()
+    data.add_field("file", await file.read(), filename=filename)
 
-    r = None
-    try:
-        # Save the uploaded file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
-
-        with open(file_path, "rb") as f:
-            files = {"file": f}
-            r = requests.post(
-                f"{url}/pipelines/upload",
-                headers={"Authorization": f"Bearer {key}"},
-                files=files,
-            )
-
-        r.raise_for_status()
-        data = r.json()
-
-        return {**data}
-    except Exception as e:
-        # Handle connection error here
-        log.exception(f"Connection error: {e}")
-
-        detail = None
-        status_code = status.HTTP_404_NOT_FOUND
-        if r is not None:
-            status_code = r.status_code
-            try:
-                res = r.json()
-                if "detail" in res:
-                    detail = res["detail"]
-            except Exception:
-                pass
-
-        raise HTTPException(
-            status_code=status_code,
-            detail=detail if detail else "Pipeline not found",
-        )
-    finally:
-        # Ensure the file is deleted after the upload is completed or on failure
-        if os.path.exists(file_path):
-            os.remove(file_path)
+    return await _pipeline_admin_request(
+        request, urlIdx, "POST", "/pipelines/upload", data=data
+    )
 
 
 class AddPipelineForm(BaseModel):
@@ -272,40 +340,13 @@ class AddPipelineForm(BaseModel):
 async def add_pipeline(
     request: Request, form_data: AddPipelineForm, user=Depends(get_admin_user)
 ):
-    r = None
-    try:
-        urlIdx = form_data.urlIdx
-
-        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
-
-        r = requests.post(
-            f"{url}/pipelines/add",
-            headers={"Authorization": f"Bearer {key}"},
-            json={"url": form_data.url},
-        )
-
-        r.raise_for_status()
-        data = r.json()
-
-        return {**data}
-    except Exception as e:
-        # Handle connection error here
-        log.exception(f"Connection error: {e}")
-
-        detail = None
-        if r is not None:
-            try:
-                res = r.json()
-                if "detail" in res:
-                    detail = res["detail"]
-            except Exception:
-                pass
-
-        raise HTTPException(
-            status_code=(r.status_code if r is not None else status.HTTP_404_NOT_FOUND),
-            detail=detail if detail else "Pipeline not found",
-        )
+    return await _pipeline_admin_request(
+        request,
+        form_data.urlIdx,
+        "POST",
+        "/pipelines/add",
+        json={"url": form_data.url},
+    )
 
 
 class DeletePipelineForm(BaseModel):
@@ -317,74 +358,20 @@ class DeletePipelineForm(BaseModel):
 async def delete_pipeline(
     request: Request, form_data: DeletePipelineForm, user=Depends(get_admin_user)
 ):
-    r = None
-    try:
-        urlIdx = form_data.urlIdx
-
-        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
-
-        r = requests.delete(
-            f"{url}/pipelines/delete",
-            headers={"Authorization": f"Bearer {key}"},
-            json={"id": form_data.id},
-        )
-
-        r.raise_for_status()
-        data = r.json()
-
-        return {**data}
-    except Exception as e:
-        # Handle connection error here
-        log.exception(f"Connection error: {e}")
-
-        detail = None
-        if r is not None:
-            try:
-                res = r.json()
-                if "detail" in res:
-                    detail = res["detail"]
-            except Exception:
-                pass
-
-        raise HTTPException(
-            status_code=(r.status_code if r is not None else status.HTTP_404_NOT_FOUND),
-            detail=detail if detail else "Pipeline not found",
-        )
+    return await _pipeline_admin_request(
+        request,
+        form_data.urlIdx,
+        "DELETE",
+        "/pipelines/delete",
+        json={"id": form_data.id},
+    )
 
 
 @router.get("/")
 async def get_pipelines(
     request: Request, urlIdx: Optional[int] = None, user=Depends(get_admin_user)
 ):
-    r = None
-    try:
-        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
-
-        r = requests.get(f"{url}/pipelines", headers={"Authorization": f"Bearer {key}"})
-
-        r.raise_for_status()
-        data = r.json()
-
-        return {**data}
-    except Exception as e:
-        # Handle connection error here
-        log.exception(f"Connection error: {e}")
-
-        detail = None
-        if r is not None:
-            try:
-                res = r.json()
-                if "detail" in res:
-                    detail = res["detail"]
-            except Exception:
-                pass
-
-        raise HTTPException(
-            status_code=(r.status_code if r is not None else status.HTTP_404_NOT_FOUND),
-            detail=detail if detail else "Pipeline not found",
-        )
+    return await _pipeline_admin_request(request, urlIdx, "GET", "/pipelines")
 
 
 @router.get("/{pipeline_id}/valves")
@@ -394,36 +381,9 @@ async def get_pipeline_valves(
     pipeline_id: str,
     user=Depends(get_admin_user),
 ):
-    r = None
-    try:
-        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
-
-        r = requests.get(
-            f"{url}/{pipeline_id}/valves", headers={"Authorization": f"Bearer {key}"}
-        )
-
-        r.raise_for_status()
-        data = r.json()
-
-        return {**data}
-    except Exception as e:
-        # Handle connection error here
-        log.exception(f"Connection error: {e}")
-
-        detail = None
-        if r is not None:
-            try:
-                res = r.json()
-                if "detail" in res:
-                    detail = res["detail"]
-            except Exception:
-                pass
-
-        raise HTTPException(
-            status_code=(r.status_code if r is not None else status.HTTP_404_NOT_FOUND),
-            detail=detail if detail else "Pipeline not found",
-        )
+    return await _pipeline_admin_request(
+        request, urlIdx, "GET", f"/{pipeline_id}/valves"
+    )
 
 
 @router.get("/{pipeline_id}/valves/spec")
@@ -433,37 +393,9 @@ async def get_pipeline_valves_spec(
     pipeline_id: str,
     user=Depends(get_admin_user),
 ):
-    r = None
-    try:
-        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
-
-        r = requests.get(
-            f"{url}/{pipeline_id}/valves/spec",
-            headers={"Authorization": f"Bearer {key}"},
-        )
-
-        r.raise_for_status()
-        data = r.json()
-
-        return {**data}
-    except Exception as e:
-        # Handle connection error here
-        log.exception(f"Connection error: {e}")
-
-        detail = None
-        if r is not None:
-            try:
-                res = r.json()
-                if "detail" in res:
-                    detail = res["detail"]
-            except Exception:
-                pass
-
-        raise HTTPException(
-            status_code=(r.status_code if r is not None else status.HTTP_404_NOT_FOUND),
-            detail=detail if detail else "Pipeline not found",
-        )
+    return await _pipeline_admin_request(
+        request, urlIdx, "GET", f"/{pipeline_id}/valves/spec"
+    )
 
 
 @router.post("/{pipeline_id}/valves/update")
@@ -474,36 +406,10 @@ async def update_pipeline_valves(
     form_data: dict,
     user=Depends(get_admin_user),
 ):
-    r = None
-    try:
-        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
-
-        r = requests.post(
-            f"{url}/{pipeline_id}/valves/update",
-            headers={"Authorization": f"Bearer {key}"},
-            json={**form_data},
-        )
-
-        r.raise_for_status()
-        data = r.json()
-
-        return {**data}
-    except Exception as e:
-        # Handle connection error here
-        log.exception(f"Connection error: {e}")
-
-        detail = None
-
-        if r is not None:
-            try:
-                res = r.json()
-                if "detail" in res:
-                    detail = res["detail"]
-            except Exception:
-                pass
-
-        raise HTTPException(
-            status_code=(r.status_code if r is not None else status.HTTP_404_NOT_FOUND),
-            detail=detail if detail else "Pipeline not found",
-        )
+    return await _pipeline_admin_request(
+        request,
+        urlIdx,
+        "POST",
+        f"/{pipeline_id}/valves/update",
+        json={**form_data},
+    )
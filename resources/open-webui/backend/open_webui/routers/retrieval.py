@@ -1,3 +1,4 @@
+import importlib
 import json
 import logging
 import mimetypes
@@ -8,6 +9,7 @@ import asyncio
 import re
 import uuid
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from typing import Iterator, List, Optional, Sequence, Union
 
@@ -26,7 +28,6 @@ from fastapi import (
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-import tiktoken
 
 
 from langchain_text_splitters import (
@@ -51,31 +52,6 @@ from open_webui.retrieval.loaders.youtube import YoutubeLoader
 
 # Web search engines
 from open_webui.retrieval.web.main import SearchResult
-from open_webui.retrieval.web.utils import get_web_loader
-from open_webui.retrieval.web.ollama import search_ollama_cloud
-from open_webui.retrieval.web.perplexity_search import search_perplexity_search
-from open_webui.retrieval.web.brave import search_brave
-from open_webui.retrieval.web.kagi import search_kagi
-from open_webui.retrieval.web.mojeek import search_mojeek
-from open_webui.retrieval.web.bocha import search_bocha
-from open_webui.retrieval.web.duckduckgo import search_duckduckgo
-from open_webui.retrieval.web.google_pse import search_google_pse
-from open_webui.retrieval.web.jina_search import search_jina
-from open_webui.retrieval.web.searchapi import search_searchapi
-from open_webui.retrieval.web.serpapi import search_serpapi
-from open_webui.retrieval.web.searxng import search_searxng
-from open_webui.retrieval.web.yacy import search_yacy
-from open_webui.retrieval.web.serper import search_serper
-from open_webui.retrieval.web.serply import search_serply
-from open_webui.retrieval.web.serpstack import search_serpstack
-from open_webui.retrieval.web.tavily import search_tavily
-from open_webui.retrieval.web.bing import search_bing
-from open_webui.retrieval.web.azure import search_azure
-from open_webui.retrieval.web.exa import search_exa
-from open_webui.retrieval.web.perplexity import search_perplexity
-from open_webui.retrieval.web.sougou import search_sougou
-from open_webui.retrieval.web.firecrawl import search_firecrawl
-from open_webui.retrieval.web.external import search_external
 
 from open_webui.retrieval.utils import (
     get_content_from_url,
@@ -88,6 +64,7 @@ from open_webui.retrieval.utils import (
     query_doc_with_hybrid_search,
 )
 from open_webui.retrieval.vector.utils import filter_metadata
+from open_webui.retrieval.memory import get_embedding_model_id, start_reembed_memories
 from open_webui.utils.misc import (
     calculate_sha256_string,
     sanitize_text_for_db,
@@ -101,6 +78,9 @@ from open_webui.config import (
     RAG_EMBEDDING_MODEL_TRUST_REMOTE_CODE,
     RAG_RERANKING_MODEL_AUTO_UPDATE,
     RAG_RERANKING_MODEL_TRUST_REMOTE_CODE,
+    RAG_COLBERT_PRECOMPUTE_EMBEDDINGS,
+    RAG_COLBERT_EMBEDDINGS_DIR,
+    RAG_COLBERT_EMBEDDINGS_MAX_SIZE,
     UPLOAD_DIR,
     DEFAULT_LOCALE,
     RAG_EMBEDDING_CONTENT_PREFIX,
@@ -120,6 +100,48 @@ from open_webui.constants import ERROR_MESSAGES
 
 log = logging.getLogger(__name__)
 
+
+def lazy_web_search(module: str, name: str):
+    """
+    Web search provider that imports its module on first call, so only the
+    configured engine (and its client library) is ever loaded.
+    """
+
+    def search(*args, **kwargs):
+        provider = importlib.import_module(f"open_webui.retrieval.web.{module}")
+        return getattr(provider, name)(*args, **kwargs)
+
+    search.__name__ = name
+    return search
+
+
+search_ollama_cloud = lazy_web_search("ollama", "search_ollama_cloud")
+search_perplexity_search = lazy_web_search(
+    "perplexity_search", "search_perplexity_search"
+)
+search_brave = lazy_web_search("brave", "search_brave")
+search_kagi = lazy_web_search("kagi", "search_kagi")
+search_mojeek = lazy_web_search("mojeek", "search_mojeek")
+search_bocha = lazy_web_search("bocha", "search_bocha")
+search_duckduckgo = lazy_web_search("duckduckgo", "search_duckduckgo")
+search_google_pse = lazy_web_search("google_pse", "search_google_pse")
+search_jina = lazy_web_search("jina_search", "search_jina")
+search_searchapi = lazy_web_search("searchapi", "search_searchapi")
+search_serpapi = lazy_web_search("serpapi", "search_serpapi")
+search_searxng = lazy_web_search("searxng", "search_searxng")
+search_yacy = lazy_web_search("yacy", "search_yacy")
+search_serper = lazy_web_search("serper", "search_serper")
+search_serply = lazy_web_search("serply", "search_serply")
+search_serpstack = lazy_web_search("serpstack", "search_serpstack")
+search_tavily = lazy_web_search("tavily", "search_tavily")
+search_bing = lazy_web_search("bing", "search_bing")
+search_azure = lazy_web_search("azure", "search_azure")
+search_exa = lazy_web_search("exa", "search_exa")
+search_perplexity = lazy_web_search("perplexity", "search_perplexity")
+search_sougou = lazy_web_search("sougou", "search_sougou")
+search_firecrawl = lazy_web_search("firecrawl", "search_firecrawl")
+search_external = lazy_web_search("external", "search_external")
+
 ##########################################
 #
 # Utility functions
@@ -170,6 +192,12 @@ def get_rf(
 
                 rf = ColBERT(
                     get_model_path(reranking_model, auto_update),
+                    embedding_dir=(
+                        RAG_COLBERT_EMBEDDINGS_DIR
+                        if RAG_COLBERT_PRECOMPUTE_EMBEDDINGS
+                        else None
+                    ),
+                    embedding_max_size=RAG_COLBERT_EMBEDDINGS_MAX_SIZE,
                     env="docker" if DOCKER else None,
                 )
 
@@ -343,6 +371,7 @@ async def update_embedding_config(
     log.info(
         f"Updating embedding model: {request.app.state.config.RAG_EMBEDDING_MODEL} to {form_data.RAG_EMBEDDING_MODEL}"
     )
+    previous_embedding_model = get_embedding_model_id(request)
     unload_embedding_model(request)
     try:
         request.app.state.config.RAG_EMBEDDING_ENGINE = form_data.RAG_EMBEDDING_ENGINE
@@ -422,6 +451,13 @@ async def update_embedding_config(
             enable_async=request.app.state.config.ENABLE_ASYNC_EMBEDDING,
         )
 
+        # Stored memory vectors belong to the previous model
+        if (
+            request.app.state.config.ENABLE_MEMORIES
+            and get_embedding_model_id(request) != previous_embedding_model
+        ):
+            start_reembed_memories(request)
+
         return {
             "status": True,
             "RAG_EMBEDDING_ENGINE": request.app.state.config.RAG_EMBEDDING_ENGINE,
@@ -1330,6 +1366,8 @@ def merge_docs_to_target_size(
 
     measure_chunk_size = len
     if request.app.state.config.TEXT_SPLITTER == "token":
+        import tiktoken
+
         encoding = tiktoken.get_encoding(
             str(request.app.state.config.TIKTOKEN_ENCODING_NAME)
         )
@@ -1466,6 +1504,8 @@ def save_docs_to_vector_db(
                 f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
             )
 
+            import tiktoken
+
             tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
             text_splitter = TokenTextSplitter(
                 encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
@@ -1565,6 +1605,17 @@ def save_docs_to_vector_db(
         )
 
         log.info(f"added {len(items)} items to collection {collection_name}")
+
+        # Late-interaction rerankers (ColBERT) can store per-chunk token
+        # embeddings now so hybrid search only encodes the query later
+        index_documents = getattr(request.app.state.rf, "index_documents", None)
+        if index_documents is not None:
+            try:
+                indexed = index_documents(texts)
+                log.info(f"stored reranker embeddings for {indexed} new chunks")
+            except Exception as e:
+                log.warning(f"Failed to precompute reranker embeddings: {e}")
+
         return True
     except Exception as e:
         log.exception(e)
@@ -2315,6 +2366,8 @@ async def process_web_search(
                 if hasattr(result, "snippet") and result.snippet is not None
             ]
         else:
+            from open_webui.retrieval.web.utils import get_web_loader
+
             loader = get_web_loader(
                 urls,
                 verify_ssl=request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION,
@@ -2407,8 +2460,8 @@ async def query_doc_handler(
                 collection_name=form_data.collection_name,
                 collection_result=collection_results[form_data.collection_name],
                 query=form_data.query,
-                embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
-                    query, prefix=prefix, user=user
+                embedding_function=partial(
+                    request.app.state.EMBEDDING_FUNCTION, user=user
                 ),
                 k=form_data.k if form_data.k else request.app.state.config.TOP_K,
                 reranking_function=(
@@ -2476,8 +2529,8 @@ async def query_collection_handler(
             return await query_collection_with_hybrid_search(
                 collection_names=form_data.collection_names,
                 queries=[form_data.query],
-                embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
-                    query, prefix=prefix, user=user
+                embedding_function=partial(
+                    request.app.state.EMBEDDING_FUNCTION, user=user
                 ),
                 k=form_data.k if form_data.k else request.app.state.config.TOP_K,
                 reranking_function=(
@@ -2511,8 +2564,8 @@ async def query_collection_handler(
             return await query_collection(
                 collection_names=form_data.collection_names,
                 queries=[form_data.query],
-                embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
-                    query, prefix=prefix, user=user
+                embedding_function=partial(
+                    request.app.state.EMBEDDING_FUNCTION, user=user
                 ),
                 k=form_data.k if form_data.k else request.app.state.config.TOP_K,
             )
@@ -2566,10 +2619,22 @@ def delete_entries_from_collection(
 
 
 @router.post("/reset/db")
-def reset_vector_db(user=Depends(get_admin_user), db: Session = Depends(get_session)):
+def reset_vector_db(
+    request: Request,
+    user=Depends(get_admin_user),
+    db: Session = Depends(get_session),
+):
     VECTOR_DB_CLIENT.reset()
     Knowledges.delete_all_knowledge(db=db)
 
+    # Stored reranker embeddings belong to the chunks that were just deleted
+    if RAG_COLBERT_PRECOMPUTE_EMBEDDINGS:
+        clear_document_embeddings = getattr(
+            request.app.state.rf, "clear_document_embeddings", None
+        )
+        if clear_document_embeddings is not None:
+            clear_document_embeddings()
+
 
 @router.post("/reset/uploads")
 def reset_upload_dir(user=Depends(get_admin_user)) -> bool:
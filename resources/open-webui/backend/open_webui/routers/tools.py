@@ -26,7 +26,7 @@ from open_webui.utils.plugin import (
     replace_imports,
     get_tool_module_from_cache,
 )
-from open_webui.utils.tools import get_tool_specs
+from open_webui.utils.tools import get_tool_specs, invalidate_tool_specs
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access, has_permission
 from open_webui.utils.tools import get_tool_servers
@@ -501,6 +501,7 @@ async def delete_tools_by_id(
         TOOLS = request.app.state.TOOLS
         if id in TOOLS:
             del TOOLS[id]
+        invalidate_tool_specs(id)
 
     return result
 
@@ -1,10 +1,20 @@
+import asyncio
 import json
+import logging
+import time
 import uuid
+from collections import OrderedDict
 from open_webui.utils.redis import get_redis_connection
-from open_webui.env import REDIS_KEY_PREFIX
+from open_webui.env import (
+    REDIS_KEY_PREFIX,
+    YDOC_COMPACTION_BYTES,
+    YDOC_COMPACTION_UPDATE_COUNT,
+)
 from typing import Optional, List, Tuple
 import pycrdt as Y
 
+log = logging.getLogger(__name__)
+
 
 class RedisLock:
     def __init__(
@@ -55,10 +65,16 @@ class RedisDict:
             redis_cluster=redis_cluster,
             decode_responses=True,
         )
+        # Bumped on every write so readers can cache values derived from the dict
+        self.version_key = f"{name}:version"
+
+    def get_version(self) -> int:
+        return int(self.redis.get(self.version_key) or 0)
 
     def __setitem__(self, key, value):
         serialized_value = json.dumps(value)
         self.redis.hset(self.name, key, serialized_value)
+        self.redis.incr(self.version_key)
 
     def __getitem__(self, key):
         value = self.redis.hget(self.name, key)
@@ -70,6 +86,7 @@ class RedisDict:
         result = self.redis.hdel(self.name, key)
         if result == 0:
             raise KeyError(key)
+        self.redis.incr(self.version_key)
 
     def __contains__(self, key):
         return self.redis.hexists(self.name, key)
@@ -92,6 +109,7 @@ class RedisDict:
         pipe.delete(self.name)
         if mapping:
             pipe.hset(self.name, mapping={k: json.dumps(v) for k, v in mapping.items()})
+        pipe.incr(self.version_key)
 
         pipe.execute()
 
@@ -103,6 +121,7 @@ class RedisDict:
 
     def clear(self):
         self.redis.delete(self.name)
+        self.redis.incr(self.version_key)
 
     def update(self, other=None, **kwargs):
         if other is not None:
@@ -117,45 +136,306 @@ class RedisDict:
         return self[key]
 
 
+class AsyncRedisDict:
+    """
+    Async counterpart of RedisDict for state touched from socket handlers.
+
+    Values are JSON encoded in a single Redis hash; multi-key reads and writes
+    are one pipelined round trip. Without ``redis`` the values live in a plain
+    process-local dict. ``cache_ttl`` enables a short-lived local read cache,
+    for mappings that rarely change after they are written (e.g. sid -> user).
+    Deletes made by other workers are not seen here, so a cached entry may be
+    served for up to ``cache_ttl`` seconds after it was removed. The cache is
+    an LRU of at most ``cache_maxsize`` entries.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        redis=None,
+        cache_ttl: float = 0,
+        cache_maxsize: int = 10000,
+    ):
+        self.name = name
+        self._redis = redis
+        self._data = {}
+        self._cache_ttl = cache_ttl
+        self._cache_maxsize = cache_maxsize
+        self._cache = OrderedDict()
+
+    def _cache_get(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return value
+
+    def _cache_set(self, key, value):
+        if self._cache_ttl > 0 and value is not None:
+            self._cache[key] = (time.monotonic() + self._cache_ttl, value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_maxsize:
+                self._cache.popitem(last=False)
+
+    async def get(self, key, default=None):
+        return (await self.get_many([key])).get(key, default)
+
+    async def get_many(self, keys) -> dict:
+        """Return a dict of the keys that exist, fetched in one round trip."""
+        result = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            value = self._cache_get(key)
+            if value is not None:
+                result[key] = value
+            else:
+                missing.append(key)
+
+        if not missing:
+            return result
+
+        if self._redis:
+            values = await self._redis.hmget(self.name, missing)
+            for key, value in zip(missing, values):
+                if value is not None:
+                    result[key] = json.loads(value)
+                    self._cache_set(key, result[key])
+        else:
+            for key in missing:
+                if key in self._data:
+                    result[key] = self._data[key]
+        return result
+
+    async def set(self, key, value):
+        await self.set_many({key: value})
+
+    async def set_many(self, mapping: dict):
+        if not mapping:
+            return
+        if self._redis:
+            await self._redis.hset(
+                self.name, mapping={k: json.dumps(v) for k, v in mapping.items()}
+            )
+        else:
+            self._data.update(mapping)
+        for key, value in mapping.items():
+            self._cache.pop(key, None)
+            self._cache_set(key, value)
+
+    async def delete(self, key) -> bool:
+        return await self.delete_many([key]) > 0
+
+    async def delete_many(self, keys) -> int:
+        keys = list(keys)
+        if not keys:
+            return 0
+        for key in keys:
+            self._cache.pop(key, None)
+        if self._redis:
+            return await self._redis.hdel(self.name, *keys)
+        return sum(self._data.pop(key, None) is not None for key in keys)
+
+    async def contains(self, key) -> bool:
+        if self._cache_get(key) is not None:
+            return True
+        if self._redis:
+            return await self._redis.hexists(self.name, key)
+        return key in self._data
+
+    async def keys(self) -> list:
+        if self._redis:
+            return await self._redis.hkeys(self.name)
+        return list(self._data.keys())
+
+    async def items(self) -> list:
+        if self._redis:
+            return [
+                (k, json.loads(v))
+                for k, v in (await self._redis.hgetall(self.name)).items()
+            ]
+        return list(self._data.items())
+
+
 class YdocManager:
+    """
+    Stores collaborative (Yjs) documents as a state snapshot plus a log of the
+    binary updates applied since. When the log grows past the count or byte
+    threshold it is merged into the snapshot in the background, so the cost
+    of loading a document is bounded by its size rather than its history.
+
+    In Redis mode ``binary_redis`` must be a client created with
+    ``decode_responses=False``; ``redis`` (decoded) is used for the user sets.
+    """
+
     def __init__(
         self,
         redis=None,
         redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:ydoc:documents",
+        binary_redis=None,
+        compaction_update_count: int = YDOC_COMPACTION_UPDATE_COUNT,
+        compaction_bytes: int = YDOC_COMPACTION_BYTES,
     ):
         self._updates = {}
+        self._snapshots = {}
         self._users = {}
+        if redis is not None and binary_redis is None:
+            raise ValueError(
+                "YdocManager needs a binary_redis client (decode_responses=False) "
+                "to store Yjs updates in Redis"
+            )
+
         self._redis = redis
+        self._binary_redis = binary_redis
         self._redis_key_prefix = redis_key_prefix
+        self._compaction_update_count = compaction_update_count
+        self._compaction_bytes = compaction_bytes
+        self._compacting = set()
+
+    def _keys(self, document_id: str) -> dict:
+        # Hash tag keeps a document's keys in one cluster slot so compaction
+        # can update them in a single transaction
+        base = f"{self._redis_key_prefix}:{{{document_id}}}"
+        return {
+            "log": f"{base}:log",
+            "log_bytes": f"{base}:log_bytes",
+            "snapshot": f"{base}:snapshot",
+            "lock": f"{base}:compaction_lock",
+            # JSON-encoded updates written before binary storage. It has no
+            # hash tag, so it must only be used in single-key commands
+            "legacy": f"{self._redis_key_prefix}:{document_id}:updates",
+        }
 
     async def append_to_updates(self, document_id: str, update: bytes):
         document_id = document_id.replace(":", "_")
+        update = bytes(update)
+
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.rpush(redis_key, json.dumps(list(update)))
+            keys = self._keys(document_id)
+            async with self._binary_redis.pipeline(transaction=False) as pipe:
+                pipe.rpush(keys["log"], update)
+                pipe.incrby(keys["log_bytes"], len(update))
+                log_length, log_bytes = await pipe.execute()
         else:
             if document_id not in self._updates:
                 self._updates[document_id] = []
             self._updates[document_id].append(update)
+            log_length = len(self._updates[document_id])
+            log_bytes = sum(len(u) for u in self._updates[document_id])
+
+        if (
+            log_length >= self._compaction_update_count
+            or log_bytes >= self._compaction_bytes
+        ) and document_id not in self._compacting:
+            self._compacting.add(document_id)
+            asyncio.create_task(self._compact_in_background(document_id))
 
     async def get_updates(self, document_id: str) -> List[bytes]:
+        """The snapshot (if any) followed by the updates logged after it."""
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            updates = await self._redis.lrange(redis_key, 0, -1)
-            return [bytes(json.loads(update)) for update in updates]
+            keys = self._keys(document_id)
+            # Read the legacy log before the snapshot: compaction writes the
+            # snapshot before deleting it, so no legacy update can be missed
+            legacy = await self._get_legacy_updates(keys)
+            async with self._binary_redis.pipeline(transaction=True) as pipe:
+                pipe.get(keys["snapshot"])
+                pipe.lrange(keys["log"], 0, -1)
+                snapshot, updates = await pipe.execute()
+
+            return legacy + ([snapshot] if snapshot else []) + list(updates)
         else:
-            return self._updates.get(document_id, [])
+            snapshot = self._snapshots.get(document_id)
+            return ([snapshot] if snapshot else []) + self._updates.get(document_id, [])
+
+    async def _get_legacy_updates(self, keys: dict) -> List[bytes]:
+        legacy = await self._binary_redis.lrange(keys["legacy"], 0, -1)
+        return [bytes(json.loads(update)) for update in legacy]
+
+    async def get_state(self, document_id: str) -> bytes:
+        """Encode the whole document as a single Yjs update."""
+        ydoc = Y.Doc()
+        for update in await self.get_updates(document_id):
+            ydoc.apply_update(update)
+        return ydoc.get_update()
+
+    async def _compact_in_background(self, document_id: str):
+        try:
+            await self.compact(document_id)
+        except Exception as e:
+            log.error(f"Error compacting document {document_id}: {e}")
+        finally:
+            self._compacting.discard(document_id)
+
+    async def compact(self, document_id: str) -> bool:
+        """
+        Merge the snapshot and logged updates into a new snapshot.
+
+        Updates appended while compacting are left in the log. Returns False
+        if another worker holds the compaction lock.
+        """
+        document_id = document_id.replace(":", "_")
+
+        if not self._redis:
+            updates = self._updates.get(document_id, [])
+            merged = len(updates)
+            state = await self.get_state(document_id)
+            self._snapshots[document_id] = state
+            self._updates[document_id] = self._updates.get(document_id, [])[merged:]
+            return True
+
+        keys = self._keys(document_id)
+        if not await self._binary_redis.set(keys["lock"], b"1", nx=True, ex=60):
+            return False
+
+        try:
+            legacy = await self._get_legacy_updates(keys)
+            async with self._binary_redis.pipeline(transaction=True) as pipe:
+                pipe.get(keys["snapshot"])
+                pipe.lrange(keys["log"], 0, -1)
+                snapshot, updates = await pipe.execute()
+
+            ydoc = Y.Doc()
+            for update in legacy:
+                ydoc.apply_update(update)
+            if snapshot:
+                ydoc.apply_update(snapshot)
+            for update in updates:
+                ydoc.apply_update(update)
+            state = ydoc.get_update()
+
+            async with self._binary_redis.pipeline(transaction=True) as pipe:
+                pipe.set(keys["snapshot"], state)
+                # Keep anything appended after the log was read
+                pipe.ltrim(keys["log"], len(updates), -1)
+                pipe.decrby(keys["log_bytes"], sum(len(u) for u in updates))
+                await pipe.execute()
+            if legacy:
+                await self._binary_redis.delete(keys["legacy"])
+
+            log.debug(
+                f"Compacted {len(legacy) + len(updates)} updates of document "
+                f"{document_id} into a {len(state)} byte snapshot"
+            )
+            return True
+        finally:
+            await self._binary_redis.delete(keys["lock"])
 
     async def document_exists(self, document_id: str) -> bool:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            return await self._redis.exists(redis_key) > 0
+            keys = self._keys(document_id)
+            return (
+                await self._binary_redis.exists(keys["log"], keys["snapshot"]) > 0
+                or await self._binary_redis.exists(keys["legacy"]) > 0
+            )
         else:
-            return document_id in self._updates
+            return document_id in self._updates or document_id in self._snapshots
 
     async def get_users(self, document_id: str) -> List[str]:
         document_id = document_id.replace(":", "_")
@@ -216,12 +496,17 @@ class YdocManager:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.delete(redis_key)
+            keys = self._keys(document_id)
+            await self._binary_redis.delete(
+                keys["log"], keys["log_bytes"], keys["snapshot"]
+            )
+            await self._binary_redis.delete(keys["legacy"])
             redis_users_key = f"{self._redis_key_prefix}:{document_id}:users"
             await self._redis.delete(redis_users_key)
         else:
             if document_id in self._updates:
                 del self._updates[document_id]
+            if document_id in self._snapshots:
+                del self._snapshots[document_id]
             if document_id in self._users:
                 del self._users[document_id]
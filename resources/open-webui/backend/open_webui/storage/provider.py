@@ -30,7 +30,6 @@ from open_webui.config import (
 from google.cloud import storage
 from google.cloud.exceptions import GoogleCloudError, NotFound
 from open_webui.constants import ERROR_MESSAGES
-from azure.identity import DefaultAzureCredential
 from azure.storage.blob import BlobServiceClient
 from azure.core.exceptions import ResourceNotFoundError
 
@@ -301,6 +300,8 @@ class AzureStorageProvider(StorageProvider):
         else:
             # Configure using the Azure Storage Account Endpoint and DefaultAzureCredential
             # If the key is not configured, then the DefaultAzureCredential will be used to support Managed Identity authentication
+            from azure.identity import DefaultAzureCredential
+
             self.blob_service_client = BlobServiceClient(
                 account_url=self.endpoint, credential=DefaultAzureCredential()
             )
@@ -0,0 +1,105 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from open_webui.models.memories import Memories
+from open_webui.models.users import Users
+from open_webui.routers import memories
+from open_webui.utils.auth import get_admin_user, get_verified_user
+
+
+@pytest.fixture
+def client():
+    async def embedding_function(texts, prefix=None, user=None):
+        return [[float(len(text)), 1.0] for text in texts]
+
+    app = FastAPI()
+    app.state.config = SimpleNamespace(
+        ENABLE_MEMORIES=True,
+        RAG_EMBEDDING_ENGINE="",
+        RAG_EMBEDDING_MODEL="model",
+        RAG_EMBEDDING_BATCH_SIZE=8,
+    )
+    app.state.EMBEDDING_FUNCTION = embedding_function
+    app.include_router(memories.router, prefix="/memories")
+    app.dependency_overrides[get_admin_user] = lambda: SimpleNamespace(
+        id="admin", role="admin"
+    )
+    return TestClient(app)
+
+
+@pytest.fixture
+def user():
+    user_id = f"test_{uuid.uuid4().hex}"
+    user = Users.insert_new_user(user_id, "Test", f"{user_id}@example.com")
+    yield user
+    Memories.delete_memories_by_user_id(user_id)
+    Users.delete_user_by_id(user_id)
+
+
+class TestAddUserMemoriesBulk:
+    def test_adds_memories_for_another_user(self, client, user):
+        response = client.post(
+            "/memories/add/bulk/user",
+            json={"user_id": user.id, "contents": ["likes tea", " ", "lives in Oslo"]},
+        )
+
+        assert response.status_code == 200
+        assert [memory["content"] for memory in response.json()] == [
+            "likes tea",
+            "lives in Oslo",
+        ]
+        assert all(memory["user_id"] == user.id for memory in response.json())
+
+        stored = Memories.get_memory_embeddings_by_user_id(user.id)
+        assert len(stored) == 2
+        assert all(embedding is not None for _, embedding, _ in stored)
+
+    def test_unknown_user(self, client):
+        response = client.post(
+            "/memories/add/bulk/user",
+            json={"user_id": "missing", "contents": ["likes tea"]},
+        )
+        assert response.status_code == 404
+
+
+class TestEmbeddingFailures:
+    @pytest.fixture
+    def failing_client(self, client, user):
+        async def embedding_function(texts, prefix=None, user=None):
+            raise RuntimeError("embedding engine unavailable")
+
+        app = client.app
+        app.state.EMBEDDING_FUNCTION = embedding_function
+        app.state.config.USER_PERMISSIONS = {"features": {"memories": True}}
+        app.dependency_overrides[get_verified_user] = lambda: user
+        return client
+
+    def test_writes_are_stored_and_invalidate_the_index(self, failing_client, user):
+        entries = memories.MEMORY_INDEX._entries
+
+        entries[user.id] = object()
+        response = failing_client.post("/memories/add", json={"content": "likes tea"})
+        assert response.status_code == 200
+        assert user.id not in entries
+
+        entries[user.id] = object()
+        response = failing_client.post(
+            f"/memories/{response.json()['id']}/update",
+            json={"content": "likes coffee"},
+        )
+        assert response.status_code == 200
+        assert user.id not in entries
+
+        entries[user.id] = object()
+        assert failing_client.post("/memories/reset").status_code == 200
+        assert user.id not in entries
+
+        # Left for MemoryIndex.get to embed on the next lookup
+        stored = Memories.get_memory_embeddings_by_user_id(user.id)
+        assert [(m.content, embedding) for m, embedding, _ in stored] == [
+            ("likes coffee", None)
+        ]
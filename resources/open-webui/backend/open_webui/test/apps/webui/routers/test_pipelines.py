@@ -0,0 +1,262 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from fastapi import HTTPException
+
+from open_webui.routers import pipelines
+from open_webui.routers.pipelines import (
+    PIPELINE_CLIENT,
+    PipelineFilterChains,
+    process_pipeline_inlet_filter,
+    process_pipeline_outlet_filter,
+)
+
+
+def filter_model(id, priority, targets=("*",)):
+    return {
+        "id": id,
+        "urlIdx": 0,
+        "pipeline": {
+            "type": "filter",
+            "priority": priority,
+            "pipelines": list(targets),
+        },
+    }
+
+
+def make_models():
+    return {
+        "llm": {"id": "llm"},
+        "late": filter_model("late", 2),
+        "early": filter_model("early", 1),
+        "other": filter_model("other", 0, targets=["other-llm"]),
+    }
+
+
+def make_request(models, url="http://pipelines", configs=None):
+    config = SimpleNamespace(
+        OPENAI_API_BASE_URLS=[url],
+        OPENAI_API_KEYS=["key"],
+        OPENAI_API_CONFIGS=configs or {},
+    )
+    return SimpleNamespace(
+        app=SimpleNamespace(state=SimpleNamespace(config=config, MODELS=models))
+    )
+
+
+class VersionedDict(dict):
+    version = 0
+
+    def get_version(self):
+        return self.version
+
+
+@pytest.fixture
+def sort_calls(monkeypatch):
+    calls = []
+    sort = pipelines.get_sorted_filters
+
+    def counting_sort(model_id, models):
+        calls.append(model_id)
+        return sort(model_id, models)
+
+    monkeypatch.setattr(pipelines, "get_sorted_filters", counting_sort)
+    return calls
+
+
+class TestPipelineFilterChains:
+    def test_caches_sorted_chain_per_model(self, sort_calls):
+        models = make_models()
+        request = make_request(models)
+        chains = PipelineFilterChains()
+
+        model, filters = chains.get(request, "llm", models)
+        assert model["id"] == "llm"
+        assert [f["id"] for f in filters] == ["early", "late"]
+        assert chains.get(request, "llm", models)[1] is filters
+        assert sort_calls == ["llm"]
+
+    def test_invalidates_when_models_are_replaced(self, sort_calls):
+        models = make_models()
+        request = make_request(models)
+        chains = PipelineFilterChains()
+        chains.get(request, "llm", models)
+
+        request.app.state.MODELS = new_models = make_models()
+        del new_models["late"]
+        _, filters = chains.get(request, "llm", new_models)
+
+        assert [f["id"] for f in filters] == ["early"]
+        assert sort_calls == ["llm", "llm"]
+
+    def test_invalidates_on_shared_dict_version(self, sort_calls, monkeypatch):
+        monkeypatch.setattr(pipelines, "RedisDict", VersionedDict)
+        models = VersionedDict(make_models())
+        request = make_request(models)
+        chains = PipelineFilterChains()
+
+        chains.get(request, "llm", models)
+        chains.get(request, "llm", models)
+        models.version += 1
+        chains.get(request, "llm", models)
+
+        assert sort_calls == ["llm", "llm"]
+
+    def test_does_not_cache_other_model_lists(self, sort_calls):
+        request = make_request(make_models())
+        chains = PipelineFilterChains()
+        direct_models = make_models()
+
+        chains.get(request, "llm", direct_models)
+        chains.get(request, "llm", direct_models)
+
+        assert sort_calls == ["llm", "llm"]
+
+
+@pytest_asyncio.fixture
+async def pipeline_server():
+    """A pipelines server whose filters append their id to body["trace"]."""
+    calls = []
+
+    async def handle_filter(request):
+        filter_id = request.match_info["id"]
+        stage = request.match_info["stage"]
+        calls.append((filter_id, stage, request.headers["Authorization"]))
+        data = await request.json()
+        if filter_id == "late" and stage == "outlet":
+            return web.json_response({"detail": "broken"}, status=500)
+        if filter_id == "late" and data["body"].get("reject"):
+            return web.json_response({"detail": "rejected"}, status=400)
+        body = data["body"]
+        body["trace"] = body.get("trace", []) + [filter_id]
+        return web.json_response(body)
+
+    async def handle_add(request):
+        # Stands in for downloading a pipeline and installing its requirements
+        await asyncio.sleep(0.3)
+        return web.json_response({"added": (await request.json())["url"]})
+
+    app = web.Application()
+    app.router.add_post("/{id}/filter/{stage}", handle_filter)
+    app.router.add_post("/pipelines/add", handle_add)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    yield f"http://127.0.0.1:{port}", calls
+
+    await PIPELINE_CLIENT.close()
+    await runner.cleanup()
+
+
+USER = SimpleNamespace(id="u1", email="u1@example.com", name="User", role="user")
+
+
+class TestPipelineFilters:
+    @pytest.mark.asyncio
+    async def test_inlet_and_outlet_run_chain_in_order(self, pipeline_server):
+        url, calls = pipeline_server
+        models = make_models()
+        del models["late"]
+        request = make_request(models, url)
+
+        payload = await process_pipeline_inlet_filter(
+            request, {"model": "llm"}, USER, models
+        )
+        session = PIPELINE_CLIENT.get_session()
+        payload = await process_pipeline_outlet_filter(request, payload, USER, models)
+
+        assert payload["trace"] == ["early", "early"]
+        assert calls == [
+            ("early", "inlet", "Bearer key"),
+            ("early", "outlet", "Bearer key"),
+        ]
+        # Both hops reused the same pooled session
+        assert PIPELINE_CLIENT.get_session() is session
+
+    @pytest.mark.asyncio
+    async def test_inlet_rejection_raises(self, pipeline_server):
+        url, _ = pipeline_server
+        models = make_models()
+
+        with pytest.raises(Exception) as exc_info:
+            await process_pipeline_inlet_filter(
+                make_request(models, url),
+                {"model": "llm", "reject": True},
+                USER,
+                models,
+            )
+
+        assert exc_info.value.args == (400, "rejected")
+
+    @pytest.mark.asyncio
+    async def test_failing_outlet_filter_keeps_payload(self, pipeline_server):
+        url, calls = pipeline_server
+        models = make_models()
+
+        payload = await process_pipeline_outlet_filter(
+            make_request(models, url), {"model": "llm"}, USER, models
+        )
+
+        assert payload == {"model": "llm", "trace": ["early"]}
+        assert [call[0] for call in calls] == ["early", "late"]
+
+    @pytest.mark.asyncio
+    async def test_unreachable_server_is_skipped(self):
+        models = make_models()
+
+        payload = await process_pipeline_inlet_filter(
+            make_request(models, "http://127.0.0.1:9"), {"model": "llm"}, USER, models
+        )
+
+        assert payload == {"model": "llm"}
+        await PIPELINE_CLIENT.close()
+
+
+class TestPipelineAdminRequest:
+    @pytest.mark.asyncio
+    async def test_maps_error_status_and_detail(self, pipeline_server):
+        url, _ = pipeline_server
+
+        with pytest.raises(HTTPException) as exc_info:
+            await pipelines._pipeline_admin_request(
+                make_request({}, url),
+                0,
+                "POST",
+                "/late/filter/inlet",
+                json={"body": {"reject": True}},
+            )
+
+        assert exc_info.value.status_code == 400
+        assert "rejected" in str(exc_info.value.detail)
+
+    @pytest.mark.asyncio
+    async def test_is_not_bounded_by_filter_timeout(self, pipeline_server):
+        url, _ = pipeline_server
+        request = make_request({}, url, configs={"0": {"timeout": 0.1}})
+
+        res = await pipelines._pipeline_admin_request(
+            request, 0, "POST", "/pipelines/add", json={"url": "http://x/p.py"}
+        )
+
+        assert res == {"added": "http://x/p.py"}
+
+    @pytest.mark.asyncio
+    async def test_maps_timeout_to_gateway_timeout(self, monkeypatch):
+        class TimingOutSession:
+            def request(self, *args, **kwargs):
+                raise asyncio.TimeoutError()
+
+        monkeypatch.setattr(PIPELINE_CLIENT, "get_session", TimingOutSession)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await pipelines._pipeline_admin_request(
+                make_request({}), 0, "GET", "/pipelines"
+            )
+
+        assert exc_info.value.status_code == 504
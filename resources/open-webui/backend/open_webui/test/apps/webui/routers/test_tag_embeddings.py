@@ -0,0 +1,110 @@
+import uuid
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from open_webui.internal.db import get_db
+from open_webui.models.feedbacks import FeedbackTagEmbedding, Feedbacks
+from open_webui.routers import evaluations
+from open_webui.routers.evaluations import TagEmbeddingIndex, _compute_similarities
+
+VECTORS = {
+    "code": [1.0, 0.0, 0.0],
+    "python": [0.9, 0.1, 0.0],
+    "cooking": [0.0, 1.0, 0.0],
+    "travel": [0.0, 0.0, 2.0],
+}
+
+
+class FakeEncoder:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts):
+        self.encoded.append(list(texts))
+        return [VECTORS[text] for text in texts]
+
+
+@pytest.fixture
+def encoder(monkeypatch):
+    encoder = FakeEncoder()
+    monkeypatch.setattr(evaluations, "_get_embedding_model", lambda: encoder)
+    return encoder
+
+
+@pytest.fixture
+def model_name():
+    model_name = f"test_{uuid.uuid4().hex}"
+    yield model_name
+    with get_db() as db:
+        db.query(FeedbackTagEmbedding).filter_by(model=model_name).delete()
+        db.commit()
+
+
+def feedback(id, *tags):
+    return SimpleNamespace(id=id, data={"model_id": "m", "tags": list(tags)})
+
+
+class TestTagEmbeddingIndex:
+    def test_embeds_each_tag_once_and_persists(self, encoder, model_name):
+        index = TagEmbeddingIndex(model_name)
+
+        assert index.ensure(["code", "cooking"])
+        assert index.ensure(["cooking", "code", "python"])
+        assert encoder.encoded == [["code", "cooking"], ["python"]]
+
+        stored = Feedbacks.get_tag_embeddings(model_name)
+        assert sorted(stored) == ["code", "cooking", "python"]
+        vector = np.frombuffer(stored["python"], dtype=np.float32)
+        assert np.linalg.norm(vector) == pytest.approx(1.0, abs=1e-6)
+
+    def test_loads_tags_embedded_by_other_workers(self, encoder, model_name):
+        first, second = TagEmbeddingIndex(model_name), TagEmbeddingIndex(model_name)
+        first.ensure(["code"])
+        second.ensure(["code"])
+        first.ensure(["travel"])
+
+        # An unknown tag makes the second index reload instead of re-encoding
+        assert second.ensure(["travel"])
+        assert encoder.encoded == [["code"], ["travel"]]
+        assert set(second.positions) == {"code", "travel"}
+
+    def test_similarities(self, encoder, model_name, monkeypatch):
+        index = TagEmbeddingIndex(model_name)
+        index.ensure(["code", "cooking", "travel"])
+        monkeypatch.setitem(VECTORS, "query", [1.0, 1.0, 0.0])
+
+        scores = index.similarities("query")
+
+        assert scores["code"] == pytest.approx(scores["cooking"])
+        assert scores["code"] == pytest.approx(2**-0.5, abs=1e-6)
+        assert scores["travel"] == pytest.approx(0.0, abs=1e-6)
+
+    def test_without_model(self, monkeypatch, model_name):
+        monkeypatch.setattr(evaluations, "_get_embedding_model", lambda: None)
+        index = TagEmbeddingIndex(model_name)
+
+        assert not index.ensure(["code"])
+        assert index.similarities("code") == {}
+
+
+class TestComputeSimilarities:
+    def test_weights_feedback_by_best_matching_tag(
+        self, encoder, model_name, monkeypatch
+    ):
+        monkeypatch.setattr(
+            evaluations, "TAG_EMBEDDINGS", TagEmbeddingIndex(model_name)
+        )
+        feedbacks = [
+            feedback("a", "cooking", "python"),
+            feedback("b", "travel"),
+            feedback("c"),
+        ]
+
+        weights = _compute_similarities(feedbacks, "code")
+
+        assert weights["a"] == pytest.approx(0.9 / np.linalg.norm([0.9, 0.1]))
+        assert weights["b"] == pytest.approx(0.0, abs=1e-6)
+        assert weights["c"] == 0
+        assert encoder.encoded[0] == ["cooking", "python", "travel"]
@@ -0,0 +1,83 @@
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from open_webui.internal.db import engine
+from open_webui.models.chats import ChatForm, ChatListItemModel, Chats
+
+
+@pytest.fixture
+def user_id():
+    user_id = f"test_{uuid.uuid4().hex}"
+    yield user_id
+    Chats.delete_chats_by_user_id(user_id)
+
+
+@pytest.fixture
+def statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def insert_chat(user_id, title):
+    chat = {
+        "title": title,
+        "messages": [{"role": "user", "content": "x" * 10_000}],
+    }
+    return Chats.insert_new_chat(user_id, ChatForm(chat=chat))
+
+
+def selects_chat_column(statement):
+    select = statement.split(" FROM ", 1)[0]
+    return "chat.chat" in select
+
+
+class TestChatListProjection:
+    def test_list_queries_never_select_chat_column(self, user_id, statements):
+        pinned = insert_chat(user_id, "Pinned plans")
+        archived = insert_chat(user_id, "Archived plans")
+        in_folder = insert_chat(user_id, "Folder plans")
+        Chats.toggle_chat_pinned_by_id(pinned.id)
+        Chats.toggle_chat_archive_by_id(archived.id)
+        Chats.update_chat_folder_id_by_id_and_user_id(in_folder.id, user_id, "f1")
+
+        statements.clear()
+        results = {
+            "list": Chats.get_chat_list_by_user_id(user_id),
+            "archived": Chats.get_archived_chat_list_by_user_id(user_id),
+            "pinned": Chats.get_pinned_chats_by_user_id(user_id),
+            "folder": Chats.get_chats_by_folder_id_and_user_id("f1", user_id),
+            "search": Chats.get_chats_by_user_id_and_search_text(user_id, "plans"),
+        }
+
+        assert statements
+        assert not [s for s in statements if selects_chat_column(s)]
+        assert {
+            name: sorted(chat.title for chat in chats)
+            for name, chats in results.items()
+        } == {
+            "list": ["Folder plans", "Pinned plans"],
+            "archived": ["Archived plans"],
+            "pinned": ["Pinned plans"],
+            "folder": ["Folder plans"],
+            "search": ["Folder plans", "Pinned plans"],
+        }
+        for chats in results.values():
+            for chat in chats:
+                assert isinstance(chat, ChatListItemModel)
+                assert "chat" not in chat.model_dump()
+
+    def test_get_chat_title_by_id_reads_title_only(self, user_id, statements):
+        chat = insert_chat(user_id, "Title only")
+
+        statements.clear()
+        assert Chats.get_chat_title_by_id(chat.id) == "Title only"
+        assert not [s for s in statements if selects_chat_column(s)]
+        assert Chats.get_chat_title_by_id("missing") is None
@@ -0,0 +1,153 @@
+import importlib.util
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+
+import open_webui
+from open_webui.models.chats import FULL_TEXT_INDEX_AVAILABLE, Chat, ChatForm, Chats
+
+MIGRATION = (
+    Path(open_webui.__file__).parent
+    / "migrations/versions/9d3f6a2b8c41_add_chat_full_text_search.py"
+)
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location("chat_fts_migration", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_chat(title, *contents):
+    return {
+        "title": title,
+        "messages": [{"role": "user", "content": content} for content in contents],
+    }
+
+
+def search(user_id, query):
+    return [
+        chat.title
+        for chat in Chats.get_chats_by_user_id_and_search_text(user_id, query)
+    ]
+
+
+@pytest.fixture
+def user_id():
+    user_id = f"test_{uuid.uuid4().hex}"
+    yield user_id
+    Chats.delete_chats_by_user_id(user_id)
+
+
+class TestChatFullTextMigration:
+    def test_backfills_and_tracks_changes(self):
+        migration = load_migration()
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            Chat.__table__.create(conn)
+            conn.execute(
+                Chat.__table__.insert(),
+                {
+                    "id": "c1",
+                    "user_id": "u",
+                    "title": "Old",
+                    "chat": make_chat("Old", "hello world"),
+                },
+            )
+
+            migration.upgrade_sqlite(conn)
+
+            def matches(query):
+                return [
+                    row[0]
+                    for row in conn.execute(
+                        text(
+                            "SELECT chat_search.chat_id FROM chat_fts "
+                            "JOIN chat_search ON chat_search.rowid = chat_fts.rowid "
+                            "WHERE chat_fts MATCH :q"
+                        ),
+                        {"q": query},
+                    )
+                ]
+
+            assert matches("hello") == ["c1"]
+
+            conn.execute(
+                Chat.__table__.insert(),
+                {
+                    "id": "c2",
+                    "user_id": "u",
+                    "title": "Recipes",
+                    "chat": make_chat("Recipes"),
+                },
+            )
+            conn.execute(
+                Chat.__table__.update()
+                .where(Chat.__table__.c.id == "c1")
+                .values(title="Renamed", chat=make_chat("Renamed", "goodbye"))
+            )
+            assert matches("recipes") == ["c2"]
+            assert matches("hello") == []
+            assert matches("goodbye") == ["c1"]
+
+            conn.execute(Chat.__table__.delete().where(Chat.__table__.c.id == "c2"))
+            assert matches("recipes") == []
+
+            migration.op = SimpleNamespace(get_bind=lambda: conn)
+            migration.downgrade()
+            tables = {
+                row[0] for row in conn.execute(text("SELECT name FROM sqlite_master"))
+            }
+            assert not {"chat_fts", "chat_search", "chat_search_ai"} & tables
+
+
+class TestChatSearch:
+    def test_prefix_matches_ranked(self, user_id):
+        Chats.insert_new_chat(
+            user_id, ChatForm(chat=make_chat("Trip planning", "flights to Lisbon"))
+        )
+        Chats.insert_new_chat(
+            user_id, ChatForm(chat=make_chat("Lisbon food", "where to eat in lisbon"))
+        )
+        Chats.insert_new_chat(user_id, ChatForm(chat=make_chat("Taxes")))
+
+        assert sorted(search(user_id, "lisb")) == ["Lisbon food", "Trip planning"]
+        assert search(user_id, "lisbon eat") == ["Lisbon food"]
+        assert search(user_id, "berlin") == []
+
+    def test_substring_and_cjk_matches(self, user_id):
+        Chats.insert_new_chat(
+            user_id, ChatForm(chat=make_chat("Notes", "我喜欢学习机器学习算法"))
+        )
+        Chats.insert_new_chat(
+            user_id, ChatForm(chat=make_chat("Config", "set the foobar flag"))
+        )
+
+        assert search(user_id, "机器学习") == ["Notes"]
+        # Shorter than a trigram: matched with LIKE instead of the index
+        assert search(user_id, "机器") == ["Notes"]
+        assert search(user_id, "bar") == ["Config"]
+        assert search(user_id, "ob") == ["Config"]
+
+    def test_updates_and_deletes_are_indexed(self, user_id):
+        chat = Chats.insert_new_chat(user_id, ChatForm(chat=make_chat("Draft")))
+        Chats.update_chat_by_id(chat.id, make_chat("Final report", "quarterly numbers"))
+
+        assert search(user_id, "draft") == []
+        assert search(user_id, "quarterly") == ["Final report"]
+
+        Chats.delete_chat_by_id(chat.id)
+        assert search(user_id, "quarterly") == []
+
+    def test_like_fallback_without_index(self, user_id, monkeypatch):
+        Chats.insert_new_chat(
+            user_id, ChatForm(chat=make_chat("Trip planning", "flights to Lisbon"))
+        )
+        monkeypatch.setattr(Chats, "_has_full_text_index", lambda db: False)
+
+        assert search(user_id, "to lisbon") == ["Trip planning"]
+        assert search(user_id, "lisbon to") == []
@@ -0,0 +1,165 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from open_webui.internal.db import get_db
+from open_webui.models import feedbacks
+from open_webui.models.feedbacks import (
+    FeedbackForm,
+    FeedbackModelDaily,
+    FeedbackModelStat,
+    FeedbackModelTag,
+    Feedbacks,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Distinct creation times, so replay order matches insertion order
+    now = [time.time()]
+
+    def tick():
+        now[0] += 1
+        return now[0]
+
+    monkeypatch.setattr(feedbacks.time, "time", tick)
+
+
+@pytest.fixture
+def models():
+    prefix = f"test_{uuid.uuid4().hex}"
+    user_id = f"{prefix}_user"
+    yield prefix, [f"{prefix}_{name}" for name in ["a", "b", "c"]], user_id
+    Feedbacks.delete_feedbacks_by_user_id(user_id)
+    Feedbacks.rebuild_leaderboard()
+
+
+def rating(model_id, rating, siblings, tags=()):
+    return FeedbackForm(
+        type="rating",
+        data={
+            "model_id": model_id,
+            "rating": rating,
+            "sibling_model_ids": siblings,
+            "tags": list(tags),
+        },
+    )
+
+
+def snapshot(prefix):
+    with get_db() as db:
+        like = f"{prefix}%"
+        return {
+            "stats": {
+                row.model_id: (pytest.approx(row.rating), row.won, row.lost)
+                for row in db.query(FeedbackModelStat).filter(
+                    FeedbackModelStat.model_id.like(like)
+                )
+                if row.won or row.lost
+            },
+            "daily": {
+                (row.model_id, row.date): (row.won, row.lost)
+                for row in db.query(FeedbackModelDaily).filter(
+                    FeedbackModelDaily.model_id.like(like)
+                )
+                if row.won or row.lost
+            },
+            "tags": {
+                (row.model_id, row.tag): row.count
+                for row in db.query(FeedbackModelTag).filter(
+                    FeedbackModelTag.model_id.like(like)
+                )
+                if row.count
+            },
+        }
+
+
+def assert_matches_replay(prefix):
+    materialized = snapshot(prefix)
+    Feedbacks.rebuild_leaderboard()
+    assert materialized == snapshot(prefix)
+
+
+def is_stale():
+    with get_db() as db:
+        return Feedbacks._is_leaderboard_stale(db)
+
+
+class TestLeaderboardAggregates:
+    def test_matches_full_replay_after_insert_update_delete(self, models, clock):
+        prefix, (a, b, c), user_id = models
+        Feedbacks.rebuild_leaderboard()
+
+        first = Feedbacks.insert_new_feedback(user_id, rating(a, 1, [b, c], ["code"]))
+        Feedbacks.insert_new_feedback(user_id, rating(b, -1, [a], ["code", "math"]))
+        last = Feedbacks.insert_new_feedback(user_id, rating(c, 1, [a]))
+        Feedbacks.insert_new_feedback(user_id, FeedbackForm(type="comment"))
+
+        assert not is_stale()
+        assert snapshot(prefix)["stats"][a][1:] == (3, 1)
+        assert_matches_replay(prefix)
+
+        # Changing only the tags keeps the ratings current
+        Feedbacks.update_feedback_by_id(first.id, rating(a, 1, [b, c], ["prose"]))
+        assert not is_stale()
+        assert_matches_replay(prefix)
+
+        Feedbacks.update_feedback_by_id(first.id, rating(a, -1, [b], ["prose"]))
+        assert is_stale()
+        stale = snapshot(prefix)
+        Feedbacks.get_leaderboard_stats()
+        assert not is_stale()
+        fresh = snapshot(prefix)
+        # Counts are exact even before the ratings are rebuilt
+        assert {k: v[1:] for k, v in stale["stats"].items()} == {
+            k: v[1:] for k, v in fresh["stats"].items()
+        }
+        assert stale["daily"] == fresh["daily"]
+        assert stale["tags"] == fresh["tags"]
+
+        Feedbacks.delete_feedback_by_id(last.id)
+        assert is_stale()
+        Feedbacks.get_leaderboard_stats()
+        assert_matches_replay(prefix)
+
+    def test_leaderboard_stats(self, models, clock):
+        prefix, (a, b, _), user_id = models
+        for tags in [["code"], ["code", "math"], ["math"], ["code"]]:
+            Feedbacks.insert_new_feedback(user_id, rating(a, 1, [b], tags))
+
+        stats = {
+            stat.model_id: stat
+            for stat in Feedbacks.get_leaderboard_stats(tag_limit=1)
+            if stat.model_id.startswith(prefix)
+        }
+
+        assert (stats[a].won, stats[a].lost) == (4, 0)
+        assert (stats[b].won, stats[b].lost) == (0, 4)
+        assert stats[a].rating > 1000 > stats[b].rating
+        assert stats[a].top_tags == [{"tag": "code", "count": 3}]
+
+
+class TestLeaderboardRebuild:
+    def test_concurrent_stale_reads_rebuild_once(self, models, monkeypatch):
+        prefix, (a, b, _), user_id = models
+        Feedbacks.insert_new_feedback(user_id, rating(a, 1, [b]))
+        feedback = Feedbacks.insert_new_feedback(user_id, rating(b, 1, [a]))
+        Feedbacks.delete_feedback_by_id(feedback.id)
+        assert is_stale()
+
+        rebuild = Feedbacks.rebuild_leaderboard
+        replays = []
+
+        def recording_rebuild(*args, **kwargs):
+            replays.append(rebuild(*args, **kwargs))
+            time.sleep(0.05)
+            return replays[-1]
+
+        monkeypatch.setattr(Feedbacks, "rebuild_leaderboard", recording_rebuild)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: Feedbacks.get_leaderboard_stats(), range(8)))
+
+        assert len([count for count in replays if count]) == 1
+        assert not is_stale()
@@ -0,0 +1,153 @@
+import importlib.util
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+
+import open_webui
+from open_webui.models.notes import Note, NoteForm, Notes, NoteUpdateForm
+
+MIGRATION = (
+    Path(open_webui.__file__).parent
+    / "migrations/versions/b3f8c1d7e2a6_add_note_full_text_search.py"
+)
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location("note_fts_migration", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def note_data(md):
+    return {"content": {"json": None, "html": "", "md": md}}
+
+
+@pytest.fixture
+def user_id():
+    user_id = f"test_{uuid.uuid4().hex}"
+    yield user_id
+    for note in Notes.get_notes_by_user_id(user_id, permission="write", limit=None):
+        Notes.delete_note_by_id(note.id)
+
+
+def insert_note(user_id, title, md=""):
+    return Notes.insert_new_note(user_id, NoteForm(title=title, data=note_data(md)))
+
+
+def search(user_id, query, **filter):
+    result = Notes.search_notes(
+        user_id,
+        {"query": query, "view_option": "created", "user_id": user_id, **filter},
+    )
+    return [note.title for note in result.items]
+
+
+class TestNoteFullTextMigration:
+    def test_backfills_and_tracks_changes(self):
+        migration = load_migration()
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            Note.__table__.create(conn)
+            insert = Note.__table__.insert()
+            conn.execute(
+                insert,
+                {
+                    "id": "n1",
+                    "user_id": "u",
+                    "title": "Old",
+                    "data": note_data("hello"),
+                },
+            )
+            # Malformed content is indexed by title only
+            conn.execute(
+                insert, {"id": "n2", "user_id": "u", "title": "Bare", "data": {}}
+            )
+
+            migration.upgrade_sqlite(conn)
+
+            def matches(query):
+                return sorted(
+                    row[0]
+                    for row in conn.execute(
+                        text(
+                            "SELECT note_search.note_id FROM note_fts "
+                            "JOIN note_search ON note_search.rowid = note_fts.rowid "
+                            "WHERE note_fts MATCH :q"
+                        ),
+                        {"q": query},
+                    )
+                )
+
+            assert matches("hello") == ["n1"]
+            assert matches("bare") == ["n2"]
+
+            conn.execute(
+                Note.__table__.update()
+                .where(Note.__table__.c.id == "n1")
+                .values(title="Renamed", data=note_data("goodbye"))
+            )
+            assert matches("hello") == []
+            assert matches("renamed AND goodbye") == ["n1"]
+
+            conn.execute(Note.__table__.delete().where(Note.__table__.c.id == "n2"))
+            assert matches("bare") == []
+
+            migration.op = SimpleNamespace(get_bind=lambda: conn)
+            migration.downgrade()
+            tables = {
+                row[0] for row in conn.execute(text("SELECT name FROM sqlite_master"))
+            }
+            assert not {"note_fts", "note_search", "note_search_ai"} & tables
+
+
+class TestNoteSearch:
+    def test_ranks_prefix_matches_title_first(self, user_id):
+        insert_note(user_id, "Groceries", "buy tomatoes and basil")
+        insert_note(user_id, "Tomato soup", "simmer for an hour")
+        insert_note(user_id, "Taxes", "receipts")
+
+        assert search(user_id, "tomat") == ["Tomato soup", "Groceries"]
+        assert search(user_id, "tomatoes basil") == ["Groceries"]
+        assert search(user_id, "berlin") == []
+
+    def test_substring_and_cjk_matches(self, user_id):
+        insert_note(user_id, "学习笔记", "我喜欢学习机器学习算法")
+        insert_note(user_id, "Config", "set the foobar flag")
+
+        assert search(user_id, "机器学习") == ["学习笔记"]
+        # Shorter than a trigram: matched with ilike instead of the index
+        assert search(user_id, "机器") == ["学习笔记"]
+        assert search(user_id, "bar") == ["Config"]
+        assert search(user_id, "ob") == ["Config"]
+
+    def test_updates_and_deletes_are_indexed(self, user_id):
+        note = insert_note(user_id, "Draft", "first version")
+        Notes.update_note_by_id(
+            note.id, NoteUpdateForm(title="Final", data=note_data("second version"))
+        )
+
+        assert search(user_id, "draft") == []
+        assert search(user_id, "final second") == ["Final"]
+
+        Notes.delete_note_by_id(note.id)
+        assert search(user_id, "final") == []
+
+    def test_explicit_order_overrides_relevance(self, user_id):
+        insert_note(user_id, "b plan", "plan plan plan")
+        insert_note(user_id, "a plan", "")
+
+        assert search(user_id, "plan", order_by="name", direction="asc") == [
+            "a plan",
+            "b plan",
+        ]
+
+    def test_substring_fallback_without_index(self, user_id, monkeypatch):
+        insert_note(user_id, "To-do list", "call the bank")
+        monkeypatch.setattr(Notes, "_has_full_text_index", lambda db: False)
+
+        assert search(user_id, "todo") == ["To-do list"]
+        assert search(user_id, "the bank") == ["To-do list"]
@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+
+from open_webui.retrieval.models.colbert_store import ColBERTEmbeddingStore
+
+
+class TestColBERTEmbeddingStore:
+    def test_round_trip_as_fp16_memmap(self, tmp_path):
+        store = ColBERTEmbeddingStore(str(tmp_path), "colbert-ir/colbertv2.0")
+        embeddings = np.random.rand(5, 8).astype(np.float32)
+
+        assert store.get("chunk") is None
+        store.put("chunk", embeddings)
+
+        loaded = store.get("chunk")
+        assert isinstance(loaded, np.memmap)
+        assert loaded.dtype == np.float16
+        np.testing.assert_allclose(loaded, embeddings, atol=1e-3)
+
+    def test_keyed_by_model_and_text(self, tmp_path):
+        store = ColBERTEmbeddingStore(str(tmp_path), "model-a")
+        store.put("chunk", np.ones((2, 4), dtype=np.float32))
+
+        assert store.get("other chunk") is None
+        assert ColBERTEmbeddingStore(str(tmp_path), "model-b").get("chunk") is None
+
+    def test_unreadable_file_is_a_miss(self, tmp_path):
+        store = ColBERTEmbeddingStore(str(tmp_path), "model")
+        store.put("chunk", np.ones((2, 4), dtype=np.float32))
+        with open(store._path("chunk"), "wb") as f:
+            f.write(b"not an array")
+
+        assert store.get("chunk") is None
+
+    def test_evicts_least_recently_used_past_max_size(self, tmp_path):
+        matrix = np.ones((64, 8), dtype=np.float32)
+        store = ColBERTEmbeddingStore(str(tmp_path), "model")
+        store.put("probe", matrix)
+        file_size = os.path.getsize(store._path("probe"))
+        store.clear()
+
+        store = ColBERTEmbeddingStore(str(tmp_path), "model", max_size=3 * file_size)
+        for age, text in enumerate(["a", "b", "c"]):
+            store.put(text, matrix)
+            # Older writes get older modification times
+            os.utime(store._path(text), (1000 + age, 1000 + age))
+        # Reading "a" marks it as recently used
+        assert store.get("a") is not None
+
+        store.put("d", matrix)
+
+        assert store.get("b") is None
+        assert store.get("c") is None
+        assert store.get("a") is not None
+        assert store.get("d") is not None
+
+    def test_existing_files_count_towards_max_size(self, tmp_path):
+        matrix = np.ones((64, 8), dtype=np.float32)
+        previous = ColBERTEmbeddingStore(str(tmp_path), "model")
+        previous.put("old", matrix)
+        os.utime(previous._path("old"), (1000, 1000))
+        file_size = os.path.getsize(previous._path("old"))
+
+        store = ColBERTEmbeddingStore(str(tmp_path), "model", max_size=1.5 * file_size)
+        store.put("new", matrix)
+
+        assert store.get("old") is None
+        assert store.get("new") is not None
+
+    def test_clear_removes_every_file(self, tmp_path):
+        store = ColBERTEmbeddingStore(str(tmp_path), "model")
+        store.put("chunk", np.ones((2, 4), dtype=np.float32))
+
+        store.clear()
+
+        assert store.get("chunk") is None
+        store.put("chunk", np.ones((2, 4), dtype=np.float32))
+        assert store.get("chunk") is not None
+
+    def test_clear_keeps_unrelated_files(self, tmp_path):
+        store = ColBERTEmbeddingStore(str(tmp_path), "model")
+        store.put("chunk", np.ones((2, 4), dtype=np.float32))
+        (tmp_path / "webui.db").write_text("data")
+        (tmp_path / os.path.basename(store.directory) / "notes.txt").write_text("x")
+
+        store.clear()
+
+        assert (tmp_path / "webui.db").read_text() == "data"
+        assert os.listdir(store.directory) == ["notes.txt"]
@@ -0,0 +1,96 @@
+import asyncio
+import gc
+import threading
+
+import numpy as np
+import pytest
+
+from open_webui.retrieval.utils import (
+    EMBEDDING_BATCHERS,
+    EmbeddingBatcher,
+    get_embedding_batcher,
+)
+
+
+class FakeModel:
+    def __init__(self, delay: float = 0):
+        self.calls = []
+        self.delay = delay
+        self.started = threading.Event()
+
+    def encode(self, texts, batch_size=32, prompt=None):
+        self.calls.append((list(texts), prompt))
+        self.started.set()
+        if self.delay:
+            threading.Event().wait(self.delay)
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+
+class TestEmbeddingBatcher:
+    def teardown_method(self):
+        for batcher in list(EMBEDDING_BATCHERS.values()):
+            batcher.stop()
+        EMBEDDING_BATCHERS.clear()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_encode(self):
+        model = FakeModel()
+        batcher = EmbeddingBatcher(model, 32, max_wait_ms=50)
+
+        results = await asyncio.gather(
+            batcher.encode("a"),
+            batcher.encode(["bb", "ccc"]),
+            batcher.encode("dddd", prefix="q: "),
+        )
+
+        assert results == [[1.0, 1.0], [[2.0, 1.0], [3.0, 1.0]], [4.0, 1.0]]
+        # One encode per prefix
+        assert sorted(model.calls, key=lambda call: call[1] or "") == [
+            (["a", "bb", "ccc"], None),
+            (["dddd"], "q: "),
+        ]
+        batcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_fails_pending_requests(self):
+        model = FakeModel(delay=0.2)
+        batcher = EmbeddingBatcher(model, 32, max_wait_ms=1)
+
+        in_flight = asyncio.ensure_future(batcher.encode("a"))
+        await asyncio.get_running_loop().run_in_executor(None, model.started.wait, 1)
+        queued = asyncio.ensure_future(batcher.encode("b"))
+        await asyncio.sleep(0)
+
+        batcher.stop()
+        for request in (in_flight, queued):
+            with pytest.raises(RuntimeError):
+                await request
+        with pytest.raises(RuntimeError):
+            await batcher.encode("c")
+
+    @pytest.mark.asyncio
+    async def test_replacing_the_model_stops_the_old_batcher(self):
+        old_model = FakeModel()
+        old_batcher = get_embedding_batcher(old_model, 32)
+        assert get_embedding_batcher(old_model, 32) is old_batcher
+        await old_batcher.encode("a")
+        ((_, old_task),) = old_batcher._workers.values()
+
+        new_model = FakeModel()
+        new_batcher = get_embedding_batcher(new_model, 32)
+
+        assert new_batcher is not old_batcher
+        assert old_batcher.stopped
+        await asyncio.wait_for(asyncio.gather(old_task, return_exceptions=True), 1)
+        assert old_task.cancelled()
+        assert list(EMBEDDING_BATCHERS.values()) == [new_batcher]
+
+    def test_collecting_the_model_stops_its_batcher(self):
+        model = FakeModel()
+        batcher = get_embedding_batcher(model, 32)
+
+        del model
+        gc.collect()
+
+        assert batcher.stopped
+        assert len(EMBEDDING_BATCHERS) == 0
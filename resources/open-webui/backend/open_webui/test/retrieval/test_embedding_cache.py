@@ -0,0 +1,135 @@
+import asyncio
+from functools import partial
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from open_webui.retrieval.utils import EmbeddingCache, RerankCompressor, select_top_k
+
+
+def make_embedding_function(calls: list, cache_key=None):
+    async def embedding_function(query, prefix=None, user=None):
+        texts = query if isinstance(query, list) else [query]
+        calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    if cache_key is not None:
+        embedding_function.cache_key = cache_key
+    return embedding_function
+
+
+class TestEmbeddingCache:
+    @pytest.mark.asyncio
+    async def test_hit_across_requests(self):
+        """Per-request partials of the app's embedding function share entries"""
+        calls = []
+        app_embedding_function = make_embedding_function(
+            calls, cache_key=("openai", "text-embedding-3-small", "http://x")
+        )
+        cache = EmbeddingCache(max_size=10)
+
+        first = await cache.embed(
+            partial(app_embedding_function, user="a"), ["hello", "world"], "q: "
+        )
+        second = await cache.embed(
+            partial(app_embedding_function, user="b"), ["world", "hello"], "q: "
+        )
+
+        assert calls == [["hello", "world"]]
+        np.testing.assert_array_equal(first[::-1], second)
+
+    @pytest.mark.asyncio
+    async def test_same_model_new_function_object(self):
+        """Rebuilding the embedding function for the same model keeps the cache"""
+        calls = []
+        key = ("ollama", "nomic-embed-text", "http://ollama")
+        cache = EmbeddingCache(max_size=10)
+
+        await cache.embed(make_embedding_function(calls, key), ["a"])
+        await cache.embed(make_embedding_function(calls, key), ["a"])
+        await cache.embed(make_embedding_function(calls, key[:1] + ("other",)), ["a"])
+
+        assert calls == [["a"], ["a"]]
+
+    @pytest.mark.asyncio
+    async def test_prefix_is_part_of_key(self):
+        calls = []
+        embedding_function = make_embedding_function(calls, ("", "model", None))
+        cache = EmbeddingCache(max_size=10)
+
+        await cache.embed(embedding_function, ["a"], "query: ")
+        await cache.embed(embedding_function, ["a"], "passage: ")
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        calls = []
+        embedding_function = make_embedding_function(calls, ("", "model", None))
+        cache = EmbeddingCache(max_size=2)
+
+        await cache.embed(embedding_function, ["a", "b"])
+        await cache.embed(embedding_function, ["a"])
+        await cache.embed(embedding_function, ["c"])  # evicts "b"
+        await cache.embed(embedding_function, ["a", "b"])
+
+        assert calls == [["a", "b"], ["c"], ["b"]]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_eviction_during_embedding(self):
+        calls = []
+        fast = make_embedding_function(calls, ("", "model", None))
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow(query, prefix=None, user=None):
+            started.set()
+            await release.wait()
+            return await fast(query, prefix)
+
+        slow.cache_key = fast.cache_key
+        cache = EmbeddingCache(max_size=2)
+        await cache.embed(fast, ["a"])
+
+        task = asyncio.create_task(cache.embed(slow, ["a", "b"]))
+        await started.wait()
+        # Evicts "a" while the first call is waiting on the embedding engine
+        await cache.embed(fast, ["c", "d"])
+        release.set()
+        result = await task
+
+        np.testing.assert_array_equal(result, [[1.0, 1.0], [1.0, 1.0]])
+        assert len(cache._get_cache(fast)) == 2
+
+
+class TestRerankCompressor:
+    def test_select_top_k(self):
+        scores = np.array([0.1, 0.9, 0.5, 0.9, 0.3])
+        top = select_top_k(scores, np.arange(len(scores)), 3)
+        # Ties keep retriever order
+        assert top.tolist() == [1, 3, 2]
+        assert select_top_k(scores, np.array([0, 4]), 5).tolist() == [4, 0]
+        assert select_top_k(scores, np.arange(5), 0).tolist() == []
+
+    @pytest.mark.asyncio
+    async def test_cosine_rerank(self):
+        vectors = {"q": [1.0, 0.0], "near": [0.9, 0.1], "far": [0.0, 1.0]}
+
+        async def embedding_function(query, prefix=None, user=None):
+            return [vectors[text] for text in query]
+
+        compressor = RerankCompressor(
+            embedding_function=embedding_function,
+            top_n=1,
+            reranking_function=None,
+            r_score=0,
+        )
+        documents = [
+            Document(page_content="far", metadata={}),
+            Document(page_content="near", metadata={}),
+        ]
+        result = await compressor.acompress_documents(documents, "q")
+
+        assert [doc.page_content for doc in result] == ["near"]
+        assert result[0].metadata["score"] == pytest.approx(0.9 / np.hypot(0.9, 0.1))
@@ -0,0 +1,95 @@
+import threading
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from open_webui.retrieval.models.lazy import LazyModel
+from open_webui.retrieval.utils import RerankCompressor, get_reranking_function
+
+
+class Reranker:
+    def predict(self, pairs):
+        return [float(len(doc)) for _, doc in pairs]
+
+
+def failing_loader():
+    raise RuntimeError("weights not found")
+
+
+class TestLazyModel:
+    def test_loads_once_and_forwards_attributes(self):
+        loads = []
+        warmups = []
+
+        def loader():
+            loads.append(1)
+            return Reranker()
+
+        model = LazyModel("reranking", loader, warmup=warmups.append)
+        assert model.status == "loading"
+
+        assert model.predict([("q", "ab")]) == [2.0]
+        assert model.predict([("q", "abc")]) == [3.0]
+        assert model.status == "ready"
+        assert len(loads) == 1
+        assert len(warmups) == 1
+
+    @pytest.mark.asyncio
+    async def test_callers_wait_for_background_load(self):
+        release = threading.Event()
+
+        def loader():
+            release.wait(5)
+            return Reranker()
+
+        model = LazyModel("reranking", loader)
+        task = model.load_async()
+        waiter = threading.Thread(target=lambda: model.predict([("q", "a")]))
+        waiter.start()
+        release.set()
+        assert isinstance(await task, Reranker)
+        waiter.join(5)
+        assert not waiter.is_alive()
+
+    def test_failed_load(self):
+        model = LazyModel("reranking", failing_loader)
+        assert model.load() is None
+        assert model.status == "failed"
+        with pytest.raises(AttributeError):
+            model.predict
+
+
+class TestRerankingFallback:
+    def test_failed_model_reranks_to_none(self):
+        rerank = get_reranking_function(
+            "", "model", LazyModel("reranking", failing_loader)
+        )
+        assert rerank("q", [Document(page_content="a")]) is None
+
+    def test_loaded_model_reranks(self):
+        rerank = get_reranking_function("", "model", LazyModel("reranking", Reranker))
+        documents = [Document(page_content="a"), Document(page_content="abc")]
+        assert rerank("q", documents) == [1.0, 3.0]
+
+    @pytest.mark.asyncio
+    async def test_compressor_falls_back_to_cosine(self):
+        async def embedding_function(texts, prefix=None, user=None):
+            return [
+                [1.0, 0.0] if text in ("q", "match") else [0.0, 1.0] for text in texts
+            ]
+
+        compressor = RerankCompressor(
+            embedding_function=embedding_function,
+            top_n=1,
+            reranking_function=get_reranking_function(
+                "", "model", LazyModel("reranking", failing_loader)
+            ),
+            r_score=0,
+        )
+        results = await compressor.acompress_documents(
+            [Document(page_content="other"), Document(page_content="match")], "q"
+        )
+
+        assert [doc.page_content for doc in results] == ["match"]
+        np.testing.assert_allclose(results[0].metadata["score"], 1.0)
@@ -0,0 +1,143 @@
+import uuid
+from types import SimpleNamespace
+
+import fakeredis
+import numpy as np
+import pytest
+from sqlalchemy import inspect
+
+from open_webui.internal.db import engine
+from open_webui.models.memories import Memories
+from open_webui.retrieval.memory import MemoryIndex, add_memories
+
+VECTORS = {
+    "cats": [1.0, 0.0, 0.0],
+    "dogs": [0.0, 1.0, 0.0],
+    "not cats": [-1.0, 0.0, 0.0],
+}
+
+
+def make_request(calls: list, model: str = "model-a", redis=None):
+    async def embedding_function(texts, prefix=None, user=None):
+        calls.append(list(texts))
+        return [VECTORS[text] for text in texts]
+
+    config = SimpleNamespace(
+        RAG_EMBEDDING_ENGINE="",
+        RAG_EMBEDDING_MODEL=model,
+        RAG_EMBEDDING_BATCH_SIZE=2,
+    )
+    return SimpleNamespace(
+        app=SimpleNamespace(
+            state=SimpleNamespace(
+                config=config, EMBEDDING_FUNCTION=embedding_function, redis=redis
+            )
+        )
+    )
+
+
+@pytest.fixture
+def user():
+    user = SimpleNamespace(id=f"test_{uuid.uuid4().hex}")
+    yield user
+    Memories.delete_memories_by_user_id(user.id)
+
+
+def test_memory_embedding_columns_are_migrated():
+    columns = {column["name"] for column in inspect(engine).get_columns("memory")}
+    assert {"embedding", "embedding_model"} <= columns
+    assert "memory_version" in inspect(engine).get_table_names()
+
+
+class TestMemoryIndex:
+    @pytest.mark.asyncio
+    async def test_embeds_missing_vectors_once(self, user):
+        calls = []
+        request = make_request(calls)
+        for content in VECTORS:
+            Memories.insert_new_memory(user.id, content)
+
+        index = MemoryIndex(max_users=10)
+        entry = await index.get(request, user)
+
+        assert sorted(text for batch in calls for text in batch) == sorted(VECTORS)
+        assert [len(batch) for batch in calls] == [2, 1]
+        assert await index.get(request, user) is entry
+
+        # Vectors are persisted, so another worker does not embed again
+        calls.clear()
+        await MemoryIndex(max_users=10).get(request, user)
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_scores_use_vector_db_scale(self, user):
+        request = make_request([])
+        await add_memories(request, user, list(VECTORS))
+
+        result = await MemoryIndex(max_users=10).search(request, user, [2.0, 0, 0], 3)
+
+        assert result.documents[0] == ["cats", "dogs", "not cats"]
+        np.testing.assert_allclose(result.distances[0], [1.0, 0.5, 0.0], atol=1e-6)
+
+    @pytest.mark.asyncio
+    async def test_detects_writes_from_other_workers(self, user):
+        request = make_request([])
+        Memories.insert_new_memory(user.id, "cats")
+        index = MemoryIndex(max_users=10)
+        assert len((await index.get(request, user)).memories) == 1
+
+        # Written without invalidating this index, as another worker would
+        memory = Memories.insert_new_memory(user.id, "dogs")
+        entry = await index.get(request, user)
+        assert sorted(m.content for m in entry.memories) == ["cats", "dogs"]
+
+        Memories.delete_memory_by_id(memory.id)
+        entry = await index.get(request, user)
+        assert [m.content for m in entry.memories] == ["cats"]
+
+    @pytest.mark.asyncio
+    async def test_detects_same_second_edits_from_other_workers(self, user):
+        request = make_request([])
+        first = Memories.insert_new_memory(user.id, "cats")
+        second = Memories.insert_new_memory(user.id, "dogs")
+        index = MemoryIndex(max_users=10)
+        await index.get(request, user)
+
+        # Neither the count nor the latest updated_at changes within a second
+        Memories.update_memory_by_id_and_user_id(first.id, user.id, "not cats")
+        entry = await index.get(request, user)
+        assert sorted(m.content for m in entry.memories) == ["dogs", "not cats"]
+
+        Memories.delete_memory_by_id(second.id)
+        Memories.insert_new_memory(user.id, "cats")
+        entry = await index.get(request, user)
+        assert sorted(m.content for m in entry.memories) == ["cats", "not cats"]
+
+    @pytest.mark.asyncio
+    async def test_uses_redis_version_without_db_check(self, user, monkeypatch):
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        request = make_request([], redis=redis)
+        Memories.insert_new_memory(user.id, "cats")
+        index, other_worker = MemoryIndex(max_users=10), MemoryIndex(max_users=10)
+        entry = await index.get(request, user)
+
+        def no_db_version(user_id):
+            raise AssertionError("version read from the database")
+
+        monkeypatch.setattr(Memories, "get_memory_version_by_user_id", no_db_version)
+        assert await index.get(request, user) is entry
+
+        Memories.insert_new_memory(user.id, "dogs")
+        await other_worker.invalidate(request, user.id)
+        entry = await index.get(request, user)
+        assert sorted(m.content for m in entry.memories) == ["cats", "dogs"]
+
+    @pytest.mark.asyncio
+    async def test_embedding_model_change_rebuilds(self, user):
+        calls = []
+        Memories.insert_new_memory(user.id, "cats")
+        index = MemoryIndex(max_users=10)
+        await index.get(make_request(calls, model="model-a"), user)
+        await index.get(make_request(calls, model="model-b"), user)
+
+        assert calls == [["cats"], ["cats"]]
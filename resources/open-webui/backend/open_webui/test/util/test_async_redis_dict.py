@@ -0,0 +1,132 @@
+import fakeredis
+import pytest
+
+from open_webui.socket import utils
+from open_webui.socket.utils import AsyncRedisDict
+
+
+class CountingRedis:
+    """Counts the commands sent to the wrapped client."""
+
+    def __init__(self, redis):
+        self._redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        command = getattr(self._redis, name)
+
+        async def call(*args, **kwargs):
+            self.calls.append(name)
+            return await command(*args, **kwargs)
+
+        return call
+
+
+@pytest.fixture(params=["memory", "redis"])
+def make_dict(request):
+    def make(**kwargs):
+        redis = None
+        if request.param == "redis":
+            redis = CountingRedis(fakeredis.FakeAsyncRedis(decode_responses=True))
+        return AsyncRedisDict("test:pool", redis=redis, **kwargs)
+
+    return make
+
+
+class TestAsyncRedisDict:
+    @pytest.mark.asyncio
+    async def test_round_trip(self, make_dict):
+        pool = make_dict()
+        await pool.set("a", {"id": "u1"})
+        await pool.set_many({"b": {"id": "u2"}, "c": [1, 2]})
+
+        assert await pool.get("a") == {"id": "u1"}
+        assert await pool.get("missing", "default") == "default"
+        assert await pool.get_many(["a", "c", "missing", "a"]) == {
+            "a": {"id": "u1"},
+            "c": [1, 2],
+        }
+        assert await pool.contains("b")
+        assert sorted(await pool.keys()) == ["a", "b", "c"]
+        assert sorted(await pool.items()) == [
+            ("a", {"id": "u1"}),
+            ("b", {"id": "u2"}),
+            ("c", [1, 2]),
+        ]
+
+        assert await pool.delete("a")
+        assert not await pool.delete("a")
+        assert await pool.delete_many(["b", "c", "missing"]) == 2
+        assert await pool.keys() == []
+
+    @pytest.mark.asyncio
+    async def test_multi_key_calls_are_one_round_trip(self):
+        redis = CountingRedis(fakeredis.FakeAsyncRedis(decode_responses=True))
+        pool = AsyncRedisDict("test:pool", redis=redis)
+
+        await pool.set_many({f"sid{i}": {"id": f"u{i}"} for i in range(50)})
+        users = await pool.get_many([f"sid{i}" for i in range(50)])
+
+        assert len(users) == 50
+        assert redis.calls == ["hset", "hmget"]
+
+    @pytest.mark.asyncio
+    async def test_cache_serves_reads_until_ttl(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(utils.time, "monotonic", lambda: now[0])
+        redis = CountingRedis(fakeredis.FakeAsyncRedis(decode_responses=True))
+        pool = AsyncRedisDict("test:pool", redis=redis, cache_ttl=5)
+        await pool.set("sid", {"id": "u1"})
+        redis.calls.clear()
+
+        assert await pool.get("sid") == {"id": "u1"}
+        assert await pool.contains("sid")
+        assert redis.calls == []
+
+        now[0] += 6
+        assert await pool.get("sid") == {"id": "u1"}
+        assert redis.calls == ["hmget"]
+
+    @pytest.mark.asyncio
+    async def test_writes_and_deletes_replace_cached_values(self):
+        redis = CountingRedis(fakeredis.FakeAsyncRedis(decode_responses=True))
+        pool = AsyncRedisDict("test:pool", redis=redis, cache_ttl=60)
+        await pool.set("sid", {"id": "u1"})
+        await pool.set("sid", {"id": "u2"})
+        assert await pool.get("sid") == {"id": "u2"}
+
+        await pool.delete("sid")
+        assert await pool.get("sid") is None
+        assert not await pool.contains("sid")
+
+    @pytest.mark.asyncio
+    async def test_cache_evicts_least_recently_used(self):
+        redis = CountingRedis(fakeredis.FakeAsyncRedis(decode_responses=True))
+        pool = AsyncRedisDict("test:pool", redis=redis, cache_ttl=60, cache_maxsize=2)
+        await pool.set_many({"a": 1, "b": 2})
+        await pool.get("a")
+        await pool.set("c", 3)
+        redis.calls.clear()
+
+        assert await pool.get_many(["a", "c"]) == {"a": 1, "c": 3}
+        assert redis.calls == []
+        assert await pool.get("b") == 2
+        assert redis.calls == ["hmget"]
+        assert len(pool._cache) == 2
+
+
+class TestRoomLookups:
+    @pytest.mark.asyncio
+    async def test_get_user_ids_from_room(self, monkeypatch):
+        from open_webui.socket import main
+
+        pool = AsyncRedisDict("test:session_pool")
+        await pool.set_many(
+            {"s1": {"id": "u1"}, "s2": {"id": "u1"}, "s3": {"id": "u2"}}
+        )
+        monkeypatch.setattr(main, "SESSION_POOL", pool)
+        monkeypatch.setattr(
+            main, "get_session_ids_from_room", lambda room: ["s1", "s2", "s3", "s4"]
+        )
+
+        assert sorted(await main.get_user_ids_from_room("room")) == ["u1", "u2"]
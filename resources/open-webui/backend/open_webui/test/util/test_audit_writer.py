@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from starlette.requests import Request
+
+from open_webui.models.users import UserModel
+from open_webui.utils.audit import AuditLoggingMiddleware, AuditLogWriter
+
+
+class RecordingLogger:
+    def __init__(self, delay=0.0, fail_on=None):
+        self.entries = []
+        self.threads = set()
+        self.delay = delay
+        self.fail_on = fail_on
+
+    def write(self, entry):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        if entry == self.fail_on:
+            raise ValueError("sink failed")
+        self.entries.append(entry)
+
+
+class TestAuditLogWriter:
+    @pytest.mark.asyncio
+    async def test_writes_off_the_event_loop_and_flushes_on_stop(self):
+        audit_logger = RecordingLogger()
+        writer = AuditLogWriter(audit_logger, max_queue_size=100, batch_size=10)
+
+        for i in range(25):
+            assert writer.submit(i)
+        await writer.stop()
+
+        assert audit_logger.entries == list(range(25))
+        assert writer.written == 25
+        assert threading.get_ident() not in audit_logger.threads
+
+    @pytest.mark.asyncio
+    async def test_drops_entries_when_queue_is_full(self):
+        audit_logger = RecordingLogger(delay=0.05)
+        writer = AuditLogWriter(audit_logger, max_queue_size=2, batch_size=1)
+
+        results = [writer.submit(i) for i in range(5)]
+        await writer.stop()
+
+        assert results == [True, True, False, False, False]
+        assert writer.dropped == 3
+        assert audit_logger.entries == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_failed_entry_does_not_stop_the_worker(self):
+        audit_logger = RecordingLogger(fail_on=1)
+        writer = AuditLogWriter(audit_logger, batch_size=2)
+
+        for i in range(3):
+            writer.submit(i)
+        await writer.stop()
+
+        assert audit_logger.entries == [0, 2]
+        assert writer.written == 2
+
+    @pytest.mark.asyncio
+    async def test_restarts_after_stop(self):
+        audit_logger = RecordingLogger()
+        writer = AuditLogWriter(audit_logger)
+        writer.submit("a")
+        await writer.stop()
+
+        writer.submit("b")
+        await writer.stop()
+
+        assert audit_logger.entries == ["a", "b"]
+
+
+class TestAuditMiddlewareUser:
+    @pytest.mark.asyncio
+    async def test_reuses_user_resolved_by_route(self, monkeypatch):
+        user = UserModel(
+            id="u1",
+            name="User",
+            email="u1@example.com",
+            role="user",
+            profile_image_url="",
+            last_active_at=0,
+            updated_at=0,
+            created_at=0,
+        )
+        request = Request({"type": "http", "headers": [], "state": {"user": user}})
+        monkeypatch.setattr(
+            "open_webui.utils.audit.get_current_user",
+            lambda *args, **kwargs: pytest.fail("user should not be resolved again"),
+        )
+
+        middleware = AuditLoggingMiddleware(app=None)
+        assert await middleware._get_authenticated_user(request) is user
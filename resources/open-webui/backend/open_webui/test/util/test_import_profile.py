@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+
+from open_webui.utils.import_profile import format_report, parse_importtime
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     encodings.idna
+import time:      2500 |       3000 |   requests.adapters
+import time:       500 |       3500 | requests
+"""
+
+
+class TestImportProfile:
+    def test_parse_importtime(self):
+        assert parse_importtime(IMPORTTIME_OUTPUT) == [
+            {"module": "encodings.idna", "self_us": 120, "cumulative_us": 120},
+            {"module": "requests.adapters", "self_us": 2500, "cumulative_us": 3000},
+            {"module": "requests", "self_us": 500, "cumulative_us": 3500},
+        ]
+
+    def test_report_without_rss(self):
+        report = {
+            "module": "open_webui.main",
+            "seconds": 1.5,
+            "max_rss_mb": None,
+            "modules": [],
+            "packages": [],
+        }
+        assert "peak RSS n/a MB" in format_report(report)
+
+
+def test_optional_clients_are_not_imported_at_startup():
+    """Routers that only use these clients on request import them on demand."""
+    modules = [
+        "azure.identity",
+        "langchain_community.document_loaders.web_base",
+        "open_webui.retrieval.web.utils",
+        "pydub",
+    ]
+    code = (
+        "import sys\n"
+        "import open_webui.routers.openai, open_webui.routers.retrieval\n"
+        "import open_webui.routers.audio, open_webui.storage.provider\n"
+        f"print([m for m in {modules!r} if m in sys.modules])\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=os.environ,
+        cwd=os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        ),
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert result.stdout.strip().splitlines()[-1] == "[]"
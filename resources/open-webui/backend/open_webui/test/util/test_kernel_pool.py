@@ -0,0 +1,219 @@
+import asyncio
+import time
+
+import pytest
+
+from open_webui.utils.code_interpreter import (
+    JupyterKernelPool,
+    JupyterKernelPools,
+    PooledKernel,
+    ResultModel,
+)
+
+
+class FakeClient:
+    def __init__(self, pool, code, kernel_id):
+        self.pool = pool
+        self.code = code
+        self.kernel_id = kernel_id
+        self.failed = False
+        self.timed_out = False
+
+    async def execute_code(self):
+        self.pool.executions.append((self.kernel_id, self.code))
+
+    async def run(self):
+        await asyncio.sleep(0.01)
+        self.pool.executions.append((self.kernel_id, self.code))
+        self.failed = self.code == "fail"
+        self.timed_out = self.code == "timeout"
+        return ResultModel(stdout=self.kernel_id)
+
+
+class FakePool(JupyterKernelPool):
+    """Kernel pool against an in-process fake Jupyter server."""
+
+    def __init__(self, **kwargs):
+        super().__init__("http://jupyter", **kwargs)
+        self.started = []
+        self.deleted = []
+        self.executions = []
+        self.max_alive = 0
+
+    def _client(self, code: str = "", timeout: int = 60, kernel_id: str = ""):
+        return FakeClient(self, code, kernel_id)
+
+    async def _start_kernel(self) -> PooledKernel:
+        await asyncio.sleep(0.01)
+        kernel = PooledKernel(f"k{len(self.started)}")
+        self.started.append(kernel.id)
+        self.max_alive = max(self.max_alive, len(self.started) - len(self.deleted))
+        return kernel
+
+    async def _delete_kernel(self, kernel: PooledKernel):
+        self.deleted.append(kernel.id)
+
+    async def settle(self):
+        while self._tasks:
+            await asyncio.gather(*self._tasks)
+
+
+class TestJupyterKernelPool:
+    @pytest.mark.asyncio
+    async def test_cold_start_then_warm_kernels(self):
+        pool = FakePool(max_size=4, min_idle=1)
+
+        result = await pool.execute("print(1)")
+        await pool.settle()
+
+        assert result.stdout == "k0"
+        # The anonymous kernel is recycled and a spare pre-started (and booted)
+        assert pool.deleted == ["k0"]
+        assert [kernel.id for kernel in pool.warm] == ["k1"]
+        assert pool.executions == [("k0", "print(1)"), ("k1", "")]
+
+        result = await pool.execute("print(2)")
+        assert result.stdout == "k1"
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_chat_kernels_keep_state_between_executions(self):
+        pool = FakePool(max_size=4, min_idle=1)
+
+        first = await pool.execute("x = 1", chat_id="chat")
+        await pool.settle()
+        second = await pool.execute("print(x)", chat_id="chat")
+        other = await pool.execute("print(x)", chat_id="other")
+        await pool.settle()
+
+        assert first.stdout == second.stdout
+        assert other.stdout != first.stdout
+        assert first.stdout not in pool.deleted
+        assert list(pool.chats) == [(None, "chat"), (None, "other")]
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_without_chat_affinity_chat_kernels_are_recycled(self):
+        pool = FakePool(max_size=4, min_idle=1, chat_affinity=False)
+
+        first = await pool.execute("x = 1", chat_id="chat")
+        await pool.settle()
+        second = await pool.execute("print(x)", chat_id="chat")
+        await pool.settle()
+
+        assert first.stdout != second.stdout
+        assert pool.chats == {}
+        assert pool.deleted == [first.stdout, second.stdout]
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_users_never_share_a_chat_kernel(self):
+        pool = FakePool(max_size=4, min_idle=1)
+
+        alice = await pool.execute("x = 1", chat_id="local:chat", user_id="alice")
+        await pool.settle()
+        bob = await pool.execute("print(x)", chat_id="local:chat", user_id="bob")
+        await pool.settle()
+        again = await pool.execute("print(x)", chat_id="local:chat", user_id="alice")
+
+        assert bob.stdout != alice.stdout
+        assert again.stdout == alice.stdout
+        assert set(pool.chats) == {("alice", "local:chat"), ("bob", "local:chat")}
+        await pool.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("code", ["fail", "timeout"])
+    async def test_failed_execution_recycles_chat_kernel(self, code):
+        pool = FakePool(max_size=4, min_idle=0)
+
+        failed = await pool.execute(code, chat_id="chat")
+        await pool.settle()
+        retried = await pool.execute("print(1)", chat_id="chat")
+
+        assert pool.deleted == [failed.stdout]
+        assert retried.stdout != failed.stdout
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_waits_when_pool_is_full(self):
+        pool = FakePool(max_size=2, min_idle=1)
+
+        results = await asyncio.gather(*[pool.execute(f"{i}") for i in range(6)])
+        await pool.settle()
+
+        assert all(result.stdout for result in results)
+        assert pool.max_alive <= 2
+        assert pool._size() <= 2
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_full_pool_reaps_idle_chat_kernel(self):
+        pool = FakePool(max_size=1, min_idle=0)
+
+        first = await pool.execute("x = 1", chat_id="a")
+        second = await pool.execute("x = 2", chat_id="b")
+        await pool.settle()
+
+        assert pool.deleted == [first.stdout]
+        assert list(pool.chats) == [(None, "b")]
+        assert second.stdout != first.stdout
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_start_failure_is_reported_and_frees_slot(self):
+        pool = FakePool(max_size=1, min_idle=0)
+
+        async def broken_start():
+            raise RuntimeError("server down")
+
+        pool._start_kernel = broken_start
+        result = await pool.execute("print(1)")
+
+        assert result.stderr == "Error: server down"
+        assert pool._size() == 0
+
+    @pytest.mark.asyncio
+    async def test_reap_idle_kernels(self):
+        pool = FakePool(max_size=4, min_idle=1, idle_timeout=60)
+        chat = await pool.execute("x = 1", chat_id="chat")
+        await pool.settle()
+
+        def idle_for(seconds):
+            # Backdate instead of patching time.monotonic, which the event
+            # loop shares
+            pool.last_used = pool.chats[(None, "chat")].last_used = (
+                time.monotonic() - seconds
+            )
+
+        idle_for(30)
+        assert not await pool.reap()
+        assert chat.stdout not in pool.deleted
+
+        idle_for(61)
+        assert await pool.reap()
+        assert chat.stdout in pool.deleted
+        assert pool.warm == [] and not pool.chats
+
+    @pytest.mark.asyncio
+    async def test_close_deletes_every_kernel(self):
+        pool = FakePool(max_size=4, min_idle=2)
+        await pool.execute("x = 1", chat_id="chat")
+        await pool.settle()
+
+        await pool.close()
+
+        assert sorted(pool.deleted) == sorted(pool.started)
+
+
+class TestJupyterKernelPools:
+    @pytest.mark.asyncio
+    async def test_pools_are_keyed_by_server_and_credentials(self):
+        pools = JupyterKernelPools(max_size=2)
+
+        pool = pools.get("http://a", "token")
+        assert pools.get("http://a", "token") is pool
+        assert pools.get("http://a", "other") is not pool
+        assert pools.get("http://b", "token") is not pool
+
+        await pools.close()
+        assert pools.pools == {}
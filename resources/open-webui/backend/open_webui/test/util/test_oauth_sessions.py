@@ -0,0 +1,169 @@
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+
+from open_webui.models.oauth_sessions import OAuthSessions
+from open_webui.utils import oauth
+from open_webui.utils.oauth import (
+    OAUTH_SESSION_CACHE,
+    OAuthManager,
+    OAuthSessionCache,
+    refresh_oauth_session,
+)
+
+
+def make_token(access_token, expires_in=3600):
+    return {
+        "access_token": access_token,
+        "refresh_token": f"refresh-{access_token}",
+        "expires_at": int(time.time()) + expires_in,
+    }
+
+
+@pytest.fixture
+def user_id():
+    user_id = f"test_{uuid.uuid4().hex}"
+    yield user_id
+    OAuthSessions.delete_sessions_by_user_id(user_id)
+
+
+class CountingRefresh:
+    def __init__(self, result=True):
+        self.calls = 0
+        self.result = result
+
+    async def __call__(self, session):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return make_token(f"new-{self.calls}") if self.result else None
+
+
+class TestOAuthSessionCache:
+    def session(self, id="s1", expires_in=3600):
+        return SimpleNamespace(id=id, expires_at=int(time.time()) + expires_in)
+
+    def test_ttl_and_refresh_margin(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(oauth.time, "monotonic", lambda: now[0])
+        cache = OAuthSessionCache(ttl=60)
+        cache.set("fresh", self.session())
+        cache.set("expiring", self.session(expires_in=60))
+
+        assert cache.get("fresh").id == "s1"
+        assert cache.get("expiring") is None
+
+        now[0] += 61
+        assert cache.get("fresh") is None
+
+    def test_lru_eviction_and_invalidate(self):
+        cache = OAuthSessionCache(maxsize=2, ttl=60)
+        cache.set("a", self.session("s1"))
+        cache.set("b", self.session("s2"))
+        cache.get("a")
+        cache.set("c", self.session("s3"))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+        cache.invalidate("s1")
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+
+    def test_disabled_with_zero_ttl(self):
+        cache = OAuthSessionCache(ttl=0)
+        cache.set("a", self.session())
+        assert cache.get("a") is None
+
+
+class TestRefreshOAuthSession:
+    @pytest.mark.asyncio
+    async def test_concurrent_refreshes_call_provider_once(self, user_id):
+        session = OAuthSessions.create_session(
+            user_id, "provider", make_token("old", expires_in=60)
+        )
+        refresh = CountingRefresh()
+
+        results = await asyncio.gather(
+            *[refresh_oauth_session(session, refresh) for _ in range(5)]
+        )
+
+        assert refresh.calls == 1
+        assert {r.token["access_token"] for r in results} == {"new-1"}
+
+    @pytest.mark.asyncio
+    async def test_waits_for_refresh_held_by_another_worker(self, user_id):
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        session = OAuthSessions.create_session(
+            user_id, "provider", make_token("old", expires_in=60)
+        )
+        lock_key = f"{oauth.REDIS_KEY_PREFIX}:oauth:refresh:{session.id}"
+        await redis.set(lock_key, "other-worker")
+        refresh = CountingRefresh()
+
+        async def other_worker_finishes():
+            await asyncio.sleep(0.1)
+            OAuthSessions.update_session_by_id(session.id, make_token("theirs"))
+            await redis.delete(lock_key)
+
+        result, _ = await asyncio.gather(
+            refresh_oauth_session(session, refresh, redis=redis),
+            other_worker_finishes(),
+        )
+
+        assert refresh.calls == 0
+        assert result.token["access_token"] == "theirs"
+
+    @pytest.mark.asyncio
+    async def test_releases_only_its_own_redis_lock(self, user_id):
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        session = OAuthSessions.create_session(
+            user_id, "provider", make_token("old", expires_in=60)
+        )
+
+        result = await refresh_oauth_session(session, CountingRefresh(), redis=redis)
+
+        assert result.token["access_token"] == "new-1"
+        assert await redis.keys("*") == []
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_deletes_session(self, user_id):
+        session = OAuthSessions.create_session(
+            user_id, "provider", make_token("old", expires_in=60)
+        )
+
+        assert await refresh_oauth_session(session, CountingRefresh(False)) is None
+        assert OAuthSessions.get_session_by_id(session.id) is None
+
+    @pytest.mark.asyncio
+    async def test_force_refresh_replaces_a_valid_token(self, user_id):
+        session = OAuthSessions.create_session(user_id, "provider", make_token("old"))
+        refresh = CountingRefresh()
+
+        assert await refresh_oauth_session(session, refresh) == session
+        result = await refresh_oauth_session(session, refresh, force_refresh=True)
+
+        assert refresh.calls == 1
+        assert result.token["access_token"] == "new-1"
+
+
+class TestGetOAuthToken:
+    @pytest.mark.asyncio
+    async def test_serves_cached_token_without_database(self, user_id, monkeypatch):
+        session = OAuthSessions.create_session(user_id, "provider", make_token("a"))
+        manager = OAuthManager.__new__(OAuthManager)
+        manager.app = SimpleNamespace(state=SimpleNamespace())
+
+        token = await manager.get_oauth_token(user_id, session.id)
+        assert token["access_token"] == "a"
+
+        monkeypatch.setattr(
+            OAuthSessions,
+            "get_session_by_id_and_user_id",
+            lambda *args: pytest.fail("cached token should not hit the database"),
+        )
+        assert await manager.get_oauth_token(user_id, session.id) == token
+        OAUTH_SESSION_CACHE.invalidate(session.id)
@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.utils import plugin
+
+
+def make_function(requirements: str):
+    return SimpleNamespace(content=f'"""\nrequirements: {requirements}\n"""\n')
+
+
+@pytest.fixture
+def env(monkeypatch, tmp_path):
+    env = SimpleNamespace(installs=[], functions=[make_function("requests")])
+    monkeypatch.setattr(plugin.Functions, "get_functions", lambda **_: env.functions)
+    monkeypatch.setattr(plugin.Tools, "get_tools", lambda: [])
+    monkeypatch.setattr(
+        plugin.sysconfig, "get_paths", lambda: {"purelib": str(tmp_path)}
+    )
+    monkeypatch.setattr(plugin, "install_frontmatter_requirements", env.installs.append)
+    monkeypatch.setattr(plugin, "OFFLINE_MODE", False)
+    return env
+
+
+class TestInstallToolAndFunctionDependencies:
+    def test_skips_unchanged_requirements(self, env):
+        plugin.install_tool_and_function_dependencies()
+        plugin.install_tool_and_function_dependencies()
+
+        assert env.installs == ["requests"]
+
+    def test_reinstalls_when_requirements_change(self, env):
+        plugin.install_tool_and_function_dependencies()
+        env.functions.append(make_function("numpy"))
+        plugin.install_tool_and_function_dependencies()
+
+        assert env.installs == ["requests", "requests, numpy"]
+
+    def test_failed_install_is_retried(self, env, monkeypatch):
+        def fail(requirements):
+            raise RuntimeError("pip failed")
+
+        monkeypatch.setattr(plugin, "install_frontmatter_requirements", fail)
+        plugin.install_tool_and_function_dependencies()
+        monkeypatch.setattr(
+            plugin, "install_frontmatter_requirements", env.installs.append
+        )
+        plugin.install_tool_and_function_dependencies()
+
+        assert env.installs == ["requests"]
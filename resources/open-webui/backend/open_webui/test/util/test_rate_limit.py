@@ -0,0 +1,104 @@
+import fakeredis
+import pytest
+import redis
+
+from open_webui.utils import rate_limit
+from open_webui.utils.rate_limit import RateLimiter
+from open_webui.utils.redis import SentinelRedisProxy
+
+
+class FakeSentinel:
+    def __init__(self, server):
+        self.server = server
+
+    def master_for(self, service, **kwargs):
+        return fakeredis.FakeAsyncRedis(server=self.server, **kwargs)
+
+
+class FailingRedis:
+    async def evalsha(self, *args):
+        raise redis.exceptions.ConnectionError("down")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(rate_limit.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture(params=["memory", "redis", "sentinel"])
+def client(request):
+    server = fakeredis.FakeServer()
+    if request.param == "redis":
+        return fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    if request.param == "sentinel":
+        return SentinelRedisProxy(
+            FakeSentinel(server), "mymaster", decode_responses=True
+        )
+    return None
+
+
+class TestRateLimiter:
+    @pytest.mark.asyncio
+    async def test_limits_within_window(self, client, clock):
+        limiter = RateLimiter(client, limit=3, window=120, bucket_size=60)
+
+        assert [await limiter.is_limited("user@x") for _ in range(4)] == [
+            False,
+            False,
+            False,
+            True,
+        ]
+        assert await limiter.get_count("user@x") == 4
+        assert await limiter.remaining("user@x") == 0
+        assert await limiter.get_count("other") == 0
+        # Redis-backed limiters must not have fallen back to memory
+        assert bool(limiter._memory_store) == (client is None)
+
+        clock[0] += 60
+        assert await limiter.get_count("user@x") == 4
+        clock[0] += 120
+        assert await limiter.get_count("user@x") == 0
+        assert not await limiter.is_limited("user@x")
+
+    @pytest.mark.asyncio
+    async def test_reloads_script_missing_on_master(self, clock):
+        server = fakeredis.FakeServer()
+        client = SentinelRedisProxy(FakeSentinel(server), "mymaster")
+        limiter = RateLimiter(client, limit=5, window=60)
+        await limiter.is_limited("key")
+
+        # A freshly promoted master has an empty script cache
+        await client.script_flush()
+
+        assert not await limiter.is_limited("key")
+        assert await limiter.get_count("key") == 2
+        assert not limiter._memory_store
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_memory_when_redis_fails(self, clock):
+        limiter = RateLimiter(FailingRedis(), limit=1, window=60)
+
+        assert not await limiter.is_limited("key")
+        assert await limiter.is_limited("key")
+        assert await limiter.get_count("key") == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, clock):
+        limiter = RateLimiter(None, limit=0, window=60, enabled=False)
+
+        assert not await limiter.is_limited("key")
+        assert await limiter.get_count("key") == 0
+
+    @pytest.mark.asyncio
+    async def test_memory_store_is_bounded(self, clock):
+        limiter = RateLimiter(None, limit=10, window=60, max_memory_keys=2)
+        for key in ["a", "b", "c"]:
+            await limiter.is_limited(key)
+
+        assert list(limiter._memory_store) == ["b", "c"]
+
+        clock[0] += 180
+        await limiter.is_limited("d")
+        assert list(limiter._memory_store) == ["d"]
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from open_webui.utils.tools import run_tool_call
+
+
+class TestRunToolCall:
+    @pytest.mark.asyncio
+    async def test_calls_run_concurrently_up_to_limit(self):
+        running = 0
+        peak = 0
+
+        async def tool(value):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return value
+
+        semaphore = asyncio.Semaphore(3)
+        results = await asyncio.gather(
+            *[run_tool_call(tool(i), semaphore, None) for i in range(8)]
+        )
+
+        assert results == list(range(8))
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_timeout_applies_per_call(self):
+        async def tool(delay):
+            await asyncio.sleep(delay)
+            return delay
+
+        semaphore = asyncio.Semaphore(1)
+        slow, fast = await asyncio.gather(
+            run_tool_call(tool(1), semaphore, 0.05),
+            run_tool_call(tool(0.01), semaphore, 0.05),
+            return_exceptions=True,
+        )
+
+        # The second call waited for the slot but its timeout started afterwards
+        assert isinstance(slow, asyncio.TimeoutError)
+        assert fast == 0.01
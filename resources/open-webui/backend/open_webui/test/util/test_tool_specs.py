@@ -0,0 +1,118 @@
+import uuid
+from types import SimpleNamespace
+
+from open_webui.models.tools import (
+    ToolForm,
+    ToolMeta,
+    Tools,
+    get_user_valves_from_settings,
+)
+from open_webui.utils.tools import (
+    PREPARED_TOOL_SPECS,
+    get_tool_version,
+    invalidate_tool_specs,
+    prepare_tool_specs,
+)
+
+
+def make_tool(updated_at=1):
+    specs = [
+        {
+            "name": "search",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {"type": "str"},
+                    "__user__": {"type": "object"},
+                },
+            },
+        }
+    ]
+    return SimpleNamespace(specs=specs, updated_at=updated_at)
+
+
+class Module:
+    def search(self, query: str):
+        """
+        Search the web.
+        :param query: What to look for
+        """
+
+
+class TestPrepareToolSpecs:
+    def setup_method(self):
+        PREPARED_TOOL_SPECS.clear()
+
+    def test_normalizes_specs(self):
+        tool = make_tool()
+        module = Module()
+        specs = prepare_tool_specs(
+            "t", tool, module, get_tool_version(tool, module, {})
+        )
+
+        assert specs[0]["parameters"]["properties"] == {"query": {"type": "string"}}
+        assert specs[0]["description"].strip() == "Search the web."
+        # The stored tool row is left untouched
+        assert tool.specs[0]["parameters"]["properties"]["query"] == {"type": "str"}
+
+    def test_reuses_specs_until_version_changes(self):
+        tool = make_tool()
+        module = Module()
+        first = prepare_tool_specs(
+            "t", tool, module, get_tool_version(tool, module, {"a": 1})
+        )
+        assert (
+            prepare_tool_specs(
+                "t", tool, module, get_tool_version(tool, module, {"a": 1})
+            )
+            is first
+        )
+
+        # Valve changes, tool edits and module reloads all rebuild the specs
+        for version in [
+            get_tool_version(tool, module, {"a": 2}),
+            get_tool_version(make_tool(updated_at=2), module, {"a": 1}),
+            get_tool_version(tool, Module(), {"a": 1}),
+        ]:
+            assert prepare_tool_specs("t", tool, module, version) is not first
+
+    def test_invalidate(self):
+        tool = make_tool()
+        module = Module()
+        version = get_tool_version(tool, module, {})
+        first = prepare_tool_specs("t", tool, module, version)
+
+        invalidate_tool_specs("t")
+        invalidate_tool_specs("missing")
+        assert prepare_tool_specs("t", tool, module, version) is not first
+
+
+class TestBulkToolLoading:
+    def test_get_tools_with_valves_by_ids(self):
+        ids = [f"test_{uuid.uuid4().hex}" for _ in range(2)]
+        try:
+            for tool_id in ids:
+                Tools.insert_new_tool(
+                    "user",
+                    ToolForm(id=tool_id, name=tool_id, content="", meta=ToolMeta()),
+                    [],
+                )
+            Tools.update_tool_valves_by_id(ids[0], {"api_key": "secret"})
+
+            tools = Tools.get_tools_with_valves_by_ids([*ids, "missing"])
+
+            assert set(tools) == set(ids)
+            assert tools[ids[0]][0].id == ids[0]
+            assert tools[ids[0]][1] == {"api_key": "secret"}
+            assert tools[ids[1]][1] == {}
+            assert Tools.get_tools_with_valves_by_ids([]) == {}
+        finally:
+            for tool_id in ids:
+                Tools.delete_tool_by_id(tool_id)
+
+    def test_get_user_valves_from_settings(self):
+        assert get_user_valves_from_settings(None) == {}
+        assert get_user_valves_from_settings({"ui": {}}) == {}
+        assert get_user_valves_from_settings(
+            {"tools": {"valves": {"t": {"key": "v"}}}}
+        ) == {"t": {"key": "v"}}
@@ -0,0 +1,167 @@
+import asyncio
+import json
+
+import fakeredis
+import pycrdt as Y
+import pytest
+from redis.crc import key_slot
+
+from open_webui.socket.utils import YdocManager
+
+
+def check_same_slot(keys):
+    slots = {key_slot(key.encode() if isinstance(key, str) else key) for key in keys}
+    assert len(slots) <= 1, f"CROSSSLOT: {keys}"
+
+
+class SlotCheckedPipeline:
+    def __init__(self, pipe):
+        self._pipe = pipe
+        self._keys = []
+
+    async def __aenter__(self):
+        await self._pipe.__aenter__()
+        return self
+
+    async def __aexit__(self, *args):
+        return await self._pipe.__aexit__(*args)
+
+    def __getattr__(self, name):
+        command = getattr(self._pipe, name)
+
+        def queue(key, *args, **kwargs):
+            self._keys.append(key)
+            return command(key, *args, **kwargs)
+
+        return queue
+
+    async def execute(self):
+        check_same_slot(self._keys)
+        return await self._pipe.execute()
+
+
+class SlotCheckedRedis:
+    """Fails multi-key commands and pipelines that would span cluster slots."""
+
+    def __init__(self, redis):
+        self._redis = redis
+
+    def __getattr__(self, name):
+        return getattr(self._redis, name)
+
+    def pipeline(self, transaction=True):
+        return SlotCheckedPipeline(self._redis.pipeline(transaction=transaction))
+
+    async def exists(self, *keys):
+        check_same_slot(keys)
+        return await self._redis.exists(*keys)
+
+    async def delete(self, *keys):
+        check_same_slot(keys)
+        return await self._redis.delete(*keys)
+
+
+def make_updates(*texts):
+    doc = Y.Doc()
+    doc["text"] = text = Y.Text()
+    updates = []
+    for value in texts:
+        before = doc.get_state()
+        text += value
+        updates.append(doc.get_update(before))
+    return updates
+
+
+def read_text(state: bytes) -> str:
+    doc = Y.Doc()
+    doc["text"] = text = Y.Text()
+    doc.apply_update(state)
+    return str(text)
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def manager(server):
+    return YdocManager(
+        redis=fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+        redis_key_prefix="test:ydoc",
+        binary_redis=SlotCheckedRedis(fakeredis.FakeAsyncRedis(server=server)),
+        compaction_update_count=1000,
+        compaction_bytes=1_000_000,
+    )
+
+
+class TestYdocManager:
+    def test_requires_binary_client_with_redis(self):
+        with pytest.raises(ValueError):
+            YdocManager(redis=fakeredis.FakeAsyncRedis(decode_responses=True))
+
+    @pytest.mark.asyncio
+    async def test_in_memory_round_trip_and_compaction(self):
+        manager = YdocManager()
+        for update in make_updates("hello", " world"):
+            await manager.append_to_updates("doc:1", update)
+
+        assert await manager.compact("doc:1")
+        assert manager._updates["doc_1"] == []
+        assert read_text(await manager.get_state("doc:1")) == "hello world"
+
+    @pytest.mark.asyncio
+    async def test_redis_round_trip_and_compaction(self, manager):
+        for update in make_updates("hello", " world"):
+            await manager.append_to_updates("doc:1", update)
+
+        assert await manager.document_exists("doc:1")
+        assert len(await manager.get_updates("doc:1")) == 2
+
+        assert await manager.compact("doc:1")
+        keys = manager._keys("doc_1")
+        assert await manager._binary_redis.llen(keys["log"]) == 0
+        assert int(await manager._binary_redis.get(keys["log_bytes"])) == 0
+        assert read_text(await manager.get_state("doc:1")) == "hello world"
+
+    @pytest.mark.asyncio
+    async def test_compacts_in_background_past_threshold(self, server):
+        manager = YdocManager(
+            redis=fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+            redis_key_prefix="test:ydoc",
+            binary_redis=SlotCheckedRedis(fakeredis.FakeAsyncRedis(server=server)),
+            compaction_update_count=3,
+        )
+        for update in make_updates("a", "b", "c"):
+            await manager.append_to_updates("doc", update)
+        while manager._compacting:
+            await asyncio.sleep(0.01)
+
+        assert len(await manager.get_updates("doc")) == 1
+        assert read_text(await manager.get_state("doc")) == "abc"
+
+    @pytest.mark.asyncio
+    async def test_legacy_updates_are_read_and_compacted(self, manager):
+        legacy, update = make_updates("legacy", " binary")
+        keys = manager._keys("doc")
+        await manager._binary_redis.rpush(keys["legacy"], json.dumps(list(legacy)))
+        assert await manager.document_exists("doc")
+
+        await manager.append_to_updates("doc", update)
+        assert read_text(await manager.get_state("doc")) == "legacy binary"
+
+        assert await manager.compact("doc")
+        assert not await manager._binary_redis.exists(keys["legacy"])
+        assert read_text(await manager.get_state("doc")) == "legacy binary"
+
+    @pytest.mark.asyncio
+    async def test_clear_document(self, manager):
+        (update,) = make_updates("gone")
+        await manager.append_to_updates("doc", update)
+        await manager._binary_redis.rpush(manager._keys("doc")["legacy"], "[]")
+        await manager.add_user("doc", "sid")
+
+        await manager.clear_document("doc")
+
+        assert not await manager.document_exists("doc")
+        assert await manager.get_users("doc") == []
@@ -767,9 +767,17 @@ async def search_chats(
             if end_timestamp and chat.updated_at > end_timestamp:
                 continue
 
+            # Search results omit message history; load it only for the chats
+            # that are returned
+            full_chat = Chats.get_chat_by_id(chat.id)
+
             # Find a matching message snippet
             snippet = ""
-            messages = chat.chat.get("history", {}).get("messages", {})
+            messages = (
+                full_chat.chat.get("history", {}).get("messages", {})
+                if full_chat
+                else {}
+            )
             lower_query = query.lower()
 
             for msg_id, msg in messages.items():
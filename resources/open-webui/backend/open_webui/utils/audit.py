@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 from dataclasses import asdict, dataclass
 from enum import Enum
@@ -24,7 +25,12 @@ from asgiref.typing import (
 from loguru import logger
 from starlette.requests import Request
 
-from open_webui.env import AUDIT_LOG_LEVEL, MAX_BODY_LOG_SIZE
+from open_webui.env import (
+    AUDIT_LOG_BATCH_SIZE,
+    AUDIT_LOG_LEVEL,
+    AUDIT_LOG_QUEUE_SIZE,
+    MAX_BODY_LOG_SIZE,
+)
 from open_webui.utils.auth import get_current_user, get_http_authorization_cred
 from open_webui.models.users import UserModel
 
@@ -88,6 +94,86 @@ class AuditLogger:
         )
 
 
+class AuditLogWriter:
+    """
+    Hands audit entries to a bounded queue drained by a background task, so
+    serializing and writing them through the (blocking) loguru sinks happens
+    off the request path.
+
+    The worker writes up to ``batch_size`` queued entries per thread hop. When
+    the queue is full new entries are dropped and counted in ``dropped``.
+    """
+
+    def __init__(
+        self,
+        audit_logger: AuditLogger,
+        max_queue_size: int = AUDIT_LOG_QUEUE_SIZE,
+        batch_size: int = AUDIT_LOG_BATCH_SIZE,
+    ):
+        self.audit_logger = audit_logger
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+
+        self.written = 0
+        self.dropped = 0
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_worker(self):
+        # Started lazily so the writer binds to the serving event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    def submit(self, audit_entry: AuditLogEntry) -> bool:
+        """Queue an entry; returns False if it was dropped."""
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(audit_entry)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(
+                    f"Audit log queue full, {self.dropped} entries dropped so far"
+                )
+            return False
+
+    def _write_batch(self, batch: list[AuditLogEntry]):
+        for audit_entry in batch:
+            try:
+                self.audit_logger.write(audit_entry)
+                self.written += 1
+            except Exception as e:
+                logger.error(f"Failed to log audit entry: {str(e)}")
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def stop(self):
+        """Write out queued entries and stop the background worker."""
+        if self._worker is None:
+            return
+        if not self._worker.done():
+            await self._queue.join()
+        self._worker.cancel()
+        await asyncio.gather(self._worker, return_exceptions=True)
+        self._worker = None
+
+
+AUDIT_LOG_WRITER = AuditLogWriter(AuditLogger(logger))
+
+
 class AuditContext:
     """
     Captures and aggregates the HTTP request and response bodies during the processing of a request. It ensures that only a configurable maximum amount of data is stored to prevent excessive memory usage.
@@ -134,7 +220,7 @@ class AuditLoggingMiddleware:
         audit_level: AuditLevel = AuditLevel.NONE,
     ) -> None:
         self.app = app
-        self.audit_logger = AuditLogger(logger)
+        self.audit_writer = AUDIT_LOG_WRITER
         self.excluded_paths = excluded_paths or []
         self.max_body_size = max_body_size
         self.audit_level = audit_level
@@ -191,6 +277,12 @@ class AuditLoggingMiddleware:
             await self._log_audit_entry(request, context)
 
     async def _get_authenticated_user(self, request: Request) -> Optional[UserModel]:
+        # Routes resolve the user through get_current_user, which leaves it on
+        # the request state; only resolve it again for routes that did not
+        user = getattr(request.state, "user", None)
+        if isinstance(user, UserModel):
+            return user
+
         auth_header = request.headers.get("Authorization")
 
         try:
@@ -278,6 +370,6 @@ class AuditLoggingMiddleware:
                 response_object=response_body,
             )
 
-            self.audit_logger.write(entry)
+            self.audit_writer.submit(entry)
         except Exception as e:
             logger.error(f"Failed to log audit entry: {str(e)}")
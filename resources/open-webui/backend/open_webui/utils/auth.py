@@ -304,6 +304,8 @@ async def get_current_user(
             current_span.set_attribute("client.user.role", user.role)
             current_span.set_attribute("client.auth.type", "api_key")
 
+        # Reused by middleware (e.g. audit logging) instead of resolving again
+        request.state.user = user
         return user
 
     # auth by jwt token
@@ -352,6 +354,8 @@ async def get_current_user(
                 # to prevent blocking the request
                 if background_tasks:
                     background_tasks.add_task(Users.update_last_active_by_id, user.id)
+
+                request.state.user = user
             return user
         else:
             raise HTTPException(
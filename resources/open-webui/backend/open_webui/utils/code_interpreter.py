@@ -1,13 +1,21 @@
 import asyncio
 import json
 import logging
+import time
 import uuid
+from collections import OrderedDict
 from typing import Optional
 
 import aiohttp
 import websockets
 from pydantic import BaseModel
 
+from open_webui.env import (
+    CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT,
+    CODE_INTERPRETER_JUPYTER_KERNEL_POOL_MIN_IDLE,
+    CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE,
+    UVICORN_WORKERS,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +42,8 @@ class JupyterCodeExecuter:
         token: str = "",
         password: str = "",
         timeout: int = 60,
+        session: Optional[aiohttp.ClientSession] = None,
+        kernel_id: str = "",
     ):
         """
         :param base_url: Jupyter server URL (e.g., "http://localhost:8888")
@@ -41,41 +51,51 @@ class JupyterCodeExecuter:
         :param token: Jupyter authentication token (optional)
         :param password: Jupyter password (optional)
         :param timeout: WebSocket timeout in seconds (default: 60s)
+        :param session: Signed-in session to reuse (optional)
+        :param kernel_id: Running kernel to execute in (optional)
         """
         self.base_url = base_url
         self.code = code
         self.token = token
         self.password = password
         self.timeout = timeout
-        self.kernel_id = ""
+        self.kernel_id = kernel_id
         if self.base_url[-1] != "/":
             self.base_url += "/"
-        self.session = aiohttp.ClientSession(trust_env=True, base_url=self.base_url)
-        self.params = {}
+        # A given session and kernel are owned by the caller (JupyterKernelPool),
+        # which signs in beforehand and cleans both up
+        self.owns_kernel = session is None
+        self.session = session or aiohttp.ClientSession(
+            trust_env=True, base_url=self.base_url
+        )
+        self.params = {"token": self.token} if self.token else {}
         self.result = ResultModel()
+        self.failed = False
+        self.timed_out = False
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if not self.owns_kernel:
+            return
         if self.kernel_id:
             try:
-                async with self.session.delete(
-                    f"api/kernels/{self.kernel_id}", params=self.params
-                ) as response:
-                    response.raise_for_status()
+                await self.delete_kernel(self.kernel_id)
             except Exception as err:
                 logger.exception("close kernel failed, %s", err)
         await self.session.close()
 
     async def run(self) -> ResultModel:
         try:
-            await self.sign_in()
-            await self.init_kernel()
+            if self.owns_kernel:
+                await self.sign_in()
+                await self.init_kernel()
             await self.execute_code()
         except Exception as err:
             logger.exception("execute code failed, %s", err)
             self.result.stderr = f"Error: {err}"
+            self.failed = True
         return self.result
 
     async def sign_in(self) -> None:
@@ -106,6 +126,12 @@ class JupyterCodeExecuter:
             kernel_data = await response.json()
             self.kernel_id = kernel_data["id"]
 
+    async def delete_kernel(self, kernel_id: str) -> None:
+        async with self.session.delete(
+            f"api/kernels/{kernel_id}", params=self.params
+        ) as response:
+            response.raise_for_status()
+
     def init_ws(self) -> (str, dict):
         ws_base = self.base_url.replace("http", "ws", 1)
         ws_params = "?" + "&".join([f"{key}={val}" for key, val in self.params.items()])
@@ -192,15 +218,344 @@ class JupyterCodeExecuter:
 
             except asyncio.TimeoutError:
                 stderr += "\nExecution timed out."
+                self.timed_out = True
                 break
         self.result.stdout = stdout.strip()
         self.result.stderr = stderr.strip()
         self.result.result = "\n".join(result).strip() if result else ""
 
 
+class PooledKernel:
+    def __init__(self, kernel_id: str, chat_key: Optional[tuple] = None):
+        self.id = kernel_id
+        # (user_id, chat_id) the kernel is pinned to
+        self.chat_key = chat_key
+        self.busy = False
+        self.last_used = time.monotonic()
+
+
+class JupyterKernelPool:
+    """
+    Pre-started Jupyter kernels for one server.
+
+    Executions take a warm kernel instead of creating one. A kernel used with
+    a ``chat_id`` stays pinned to that user's chat, keeping its state for the
+    chat's next code block, until it has been idle for ``idle_timeout``
+    seconds. Chat ids alone aren't trusted to be unique across users (e.g.
+    ``local:`` ids of temporary chats), so users never share a kernel.
+    Kernels used without a chat, or whose execution failed or timed out, are
+    recycled (deleted) after use and replaced in the background. At most
+    ``max_size`` kernels exist at once; when all are busy, executions wait.
+
+    Pools are per process. With ``chat_affinity`` off, chat ids are ignored and
+    every execution gets a fresh kernel, for deployments where a chat's code
+    blocks may reach different workers.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str = "",
+        password: str = "",
+        max_size: int = 8,
+        min_idle: int = 1,
+        idle_timeout: float = 600,
+        chat_affinity: bool = True,
+    ):
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.token = token
+        self.password = password
+        self.max_size = max_size
+        self.min_idle = min(min_idle, max_size)
+        self.idle_timeout = idle_timeout
+        self.chat_affinity = chat_affinity
+
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.signed_in = False
+        self.warm: list[PooledKernel] = []
+        self.chats: "OrderedDict[tuple, PooledKernel]" = OrderedDict()
+        self.in_use: set[PooledKernel] = set()
+        self.starting = 0
+        self.last_used = time.monotonic()
+
+        self._condition = asyncio.Condition()
+        self._tasks: set[asyncio.Task] = set()
+
+    def _client(self, code: str = "", timeout: int = 60, kernel_id: str = ""):
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(trust_env=True, base_url=self.base_url)
+            self.signed_in = False
+        return JupyterCodeExecuter(
+            self.base_url,
+            code,
+            self.token,
+            self.password,
+            timeout,
+            session=self.session,
+            kernel_id=kernel_id,
+        )
+
+    def _size(self) -> int:
+        chat_kernels = set(self.chats.values())
+        return (
+            len(self.warm)
+            + len(chat_kernels)
+            + len(self.in_use - chat_kernels)
+            + self.starting
+        )
+
+    def _spawn(self, coro):
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _start_kernel(self) -> PooledKernel:
+        client = self._client()
+        if not self.signed_in:
+            await client.sign_in()
+            self.signed_in = True
+        try:
+            await client.init_kernel()
+        except Exception:
+            # The server may have restarted and dropped our login
+            self.signed_in = False
+            raise
+        return PooledKernel(client.kernel_id)
+
+    async def _delete_kernel(self, kernel: PooledKernel):
+        try:
+            await self._client().delete_kernel(kernel.id)
+        except Exception as err:
+            logger.warning("close kernel %s failed, %s", kernel.id, err)
+
+    async def _replenish(self):
+        while True:
+            async with self._condition:
+                if len(self.warm) >= self.min_idle or self._size() >= self.max_size:
+                    return
+                self.starting += 1
+            kernel = None
+            try:
+                kernel = await self._start_kernel()
+                # Run an empty cell so the spare is fully booted before it is used
+                await self._client(kernel_id=kernel.id).execute_code()
+            except Exception as err:
+                logger.warning("pre-start kernel failed, %s", err)
+                if kernel is not None:
+                    await self._delete_kernel(kernel)
+                async with self._condition:
+                    self.starting -= 1
+                    self._condition.notify_all()
+                return
+            async with self._condition:
+                self.starting -= 1
+                self.warm.append(kernel)
+                self._condition.notify_all()
+
+    async def acquire(self, chat_key: Optional[tuple] = None) -> PooledKernel:
+        async with self._condition:
+            while True:
+                self.last_used = time.monotonic()
+                kernel = self.chats.get(chat_key) if chat_key else None
+                if kernel is not None:
+                    if not kernel.busy:
+                        self.chats.move_to_end(chat_key)
+                        break
+                elif self.warm:
+                    kernel = self.warm.pop()
+                    break
+                else:
+                    # Make room by reaping the least recently used idle chat kernel
+                    if self._size() >= self.max_size:
+                        for idle_chat_key, idle in self.chats.items():
+                            if not idle.busy:
+                                del self.chats[idle_chat_key]
+                                self._spawn(self._delete_kernel(idle))
+                                break
+                    if self._size() < self.max_size:
+                        self.starting += 1
+                        kernel = None
+                        break
+                await self._condition.wait()
+
+            if kernel is not None:
+                kernel.busy = True
+                self.in_use.add(kernel)
+                if chat_key:
+                    kernel.chat_key = chat_key
+                    self.chats[chat_key] = kernel
+                self._spawn(self._replenish())
+                return kernel
+
+        # Pool is cold or exhausted: start a kernel for this execution
+        try:
+            kernel = await self._start_kernel()
+        except Exception:
+            async with self._condition:
+                self.starting -= 1
+                self._condition.notify_all()
+            raise
+
+        async with self._condition:
+            self.starting -= 1
+            kernel.busy = True
+            self.in_use.add(kernel)
+            if chat_key:
+                kernel.chat_key = chat_key
+                self.chats[chat_key] = kernel
+        return kernel
+
+    async def release(self, kernel: PooledKernel, recycle: bool = False):
+        async with self._condition:
+            kernel.busy = False
+            kernel.last_used = time.monotonic()
+            self.in_use.discard(kernel)
+            if recycle or not kernel.chat_key:
+                if kernel.chat_key and self.chats.get(kernel.chat_key) is kernel:
+                    del self.chats[kernel.chat_key]
+                self._spawn(self._delete_kernel(kernel))
+            self._condition.notify_all()
+        self._spawn(self._replenish())
+
+    async def execute(
+        self,
+        code: str,
+        timeout: int = 60,
+        chat_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> ResultModel:
+        chat_key = (user_id, chat_id) if chat_id and self.chat_affinity else None
+        try:
+            kernel = await self.acquire(chat_key)
+        except Exception as err:
+            logger.exception("execute code failed, %s", err)
+            return ResultModel(stderr=f"Error: {err}")
+
+        client = self._client(code, timeout, kernel_id=kernel.id)
+        try:
+            result = await client.run()
+        finally:
+            await self.release(kernel, recycle=client.failed or client.timed_out)
+        return result
+
+    async def reap(self) -> bool:
+        """
+        Delete chat kernels idle for longer than ``idle_timeout``, and every
+        kernel if the pool itself went unused that long.
+
+        Returns True when the pool is empty and can be discarded.
+        """
+        now = time.monotonic()
+        async with self._condition:
+            expired = [
+                chat_key
+                for chat_key, kernel in self.chats.items()
+                if not kernel.busy and now - kernel.last_used > self.idle_timeout
+            ]
+            kernels = [self.chats.pop(chat_key) for chat_key in expired]
+            unused = now - self.last_used > self.idle_timeout and not self.in_use
+            if unused:
+                kernels += self.warm
+                self.warm = []
+
+        for kernel in kernels:
+            await self._delete_kernel(kernel)
+        return unused and self._size() == 0
+
+    async def close(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        async with self._condition:
+            kernels = self.warm + list(set(self.chats.values()) | self.in_use)
+            self.warm, self.chats, self.in_use = [], OrderedDict(), set()
+        for kernel in kernels:
+            await self._delete_kernel(kernel)
+        if self.session is not None:
+            await self.session.close()
+
+
+class JupyterKernelPools:
+    """
+    Kernel pools keyed by server and credentials, with a background task that
+    reaps idle kernels and pools whose server is no longer used.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 8,
+        min_idle: int = 1,
+        idle_timeout: float = 600,
+        chat_affinity: bool = True,
+    ):
+        self.max_size = max_size
+        self.min_idle = min_idle
+        self.idle_timeout = idle_timeout
+        self.chat_affinity = chat_affinity
+        self.pools: dict[tuple, JupyterKernelPool] = {}
+        self._reaper: Optional[asyncio.Task] = None
+
+    def get(self, base_url: str, token: str = "", password: str = ""):
+        key = (base_url, token or "", password or "")
+        if key not in self.pools:
+            self.pools[key] = JupyterKernelPool(
+                base_url,
+                token,
+                password,
+                max_size=self.max_size,
+                min_idle=self.min_idle,
+                idle_timeout=self.idle_timeout,
+                chat_affinity=self.chat_affinity,
+            )
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.get_running_loop().create_task(self._reap())
+        return self.pools[key]
+
+    async def _reap(self):
+        while self.pools:
+            await asyncio.sleep(max(self.idle_timeout / 4, 1))
+            for key, pool in list(self.pools.items()):
+                try:
+                    if await pool.reap():
+                        self.pools.pop(key, None)
+                        await pool.close()
+                except Exception as err:
+                    logger.warning("reap kernels failed, %s", err)
+
+    async def close(self):
+        if self._reaper is not None:
+            self._reaper.cancel()
+            await asyncio.gather(self._reaper, return_exceptions=True)
+            self._reaper = None
+        pools, self.pools = list(self.pools.values()), {}
+        for pool in pools:
+            await pool.close()
+
+
+JUPYTER_KERNEL_POOLS = JupyterKernelPools(
+    max_size=CODE_INTERPRETER_JUPYTER_KERNEL_POOL_SIZE,
+    min_idle=CODE_INTERPRETER_JUPYTER_KERNEL_POOL_MIN_IDLE,
+    idle_timeout=CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT,
+    # Other workers can't see this worker's chat kernels
+    chat_affinity=UVICORN_WORKERS == 1,
+)
+
+
 async def execute_code_jupyter(
-    base_url: str, code: str, token: str = "", password: str = "", timeout: int = 60
+    base_url: str,
+    code: str,
+    token: str = "",
+    password: str = "",
+    timeout: int = 60,
+    chat_id: Optional[str] = None,
+    user_id: Optional[str] = None,
 ) -> dict:
+    if JUPYTER_KERNEL_POOLS.max_size > 0:
+        pool = JUPYTER_KERNEL_POOLS.get(base_url, token, password)
+        result = await pool.execute(code, timeout, chat_id=chat_id, user_id=user_id)
+        return result.model_dump()
+
     async with JupyterCodeExecuter(
         base_url, code, token, password, timeout
     ) as executor:
@@ -0,0 +1,118 @@
+import json
+import subprocess
+import sys
+from typing import Optional
+
+
+# Printed by the child process after the import so the parent can read the
+# import wall time and peak RSS without depending on psutil
+_STATS_MARKER = "__open_webui_import_stats__"
+
+
+def parse_importtime(output: str) -> list[dict]:
+    """
+    Parse `python -X importtime` output into one entry per module with its
+    self and cumulative import time in microseconds.
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3:
+            continue
+        try:
+            self_us = int(fields[0].strip())
+            cumulative_us = int(fields[1].strip())
+        except ValueError:
+            # Header line
+            continue
+        modules.append(
+            {
+                "module": fields[2].strip(),
+                "self_us": self_us,
+                "cumulative_us": cumulative_us,
+            }
+        )
+    return modules
+
+
+def profile_imports(module: str = "open_webui.main") -> dict:
+    """
+    Import ``module`` in a fresh interpreter with -X importtime and report the
+    total wall time, peak RSS and per-module import cost.
+
+    Top-level packages are aggregated by self time, which is what points at
+    the dependency worth deferring.
+    """
+    code = (
+        "import sys, time\n"
+        "try:\n"
+        "    import resource\n"
+        "except ImportError:\n"
+        "    resource = None  # Windows: no peak RSS\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - start\n"
+        "rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0\n"
+        "if sys.platform == 'darwin':\n"
+        "    rss //= 1024  # bytes on macOS, KB elsewhere\n"
+        f"print('{_STATS_MARKER}', rss, elapsed)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-4000:]}")
+
+    max_rss_kb: Optional[int] = None
+    seconds: Optional[float] = None
+    for line in result.stdout.splitlines():
+        if line.startswith(_STATS_MARKER):
+            _, rss, elapsed = line.split()
+            max_rss_kb = int(rss)
+            seconds = float(elapsed)
+
+    modules = parse_importtime(result.stderr)
+
+    packages = {}
+    for entry in modules:
+        package = entry["module"].split(".")[0]
+        packages[package] = packages.get(package, 0) + entry["self_us"]
+
+    return {
+        "module": module,
+        "seconds": seconds,
+        "max_rss_mb": round(max_rss_kb / 1024, 1) if max_rss_kb else None,
+        "modules": sorted(modules, key=lambda m: m["cumulative_us"], reverse=True),
+        "packages": sorted(
+            ({"package": name, "self_us": us} for name, us in packages.items()),
+            key=lambda p: p["self_us"],
+            reverse=True,
+        ),
+    }
+
+
+def format_report(report: dict, top: int = 25) -> str:
+    lines = [
+        f"Import of {report['module']}: {report['seconds']:.2f}s, "
+        f"peak RSS {report['max_rss_mb'] or 'n/a'} MB",
+        "",
+        f"Top {top} packages by self time:",
+    ]
+    for entry in report["packages"][:top]:
+        lines.append(f"  {entry['self_us'] / 1000:10.1f} ms  {entry['package']}")
+
+    lines += ["", f"Top {top} modules by cumulative time:"]
+    for entry in report["modules"][:top]:
+        lines.append(
+            f"  {entry['cumulative_us'] / 1000:10.1f} ms  "
+            f"(self {entry['self_us'] / 1000:8.1f} ms)  {entry['module']}"
+        )
+    return "\n".join(lines)
+
+
+def dump_report(report: dict) -> str:
+    return json.dumps(report, indent=2)
@@ -7,6 +7,7 @@ import textwrap
 
 import asyncio
 from aiocache import cached
+from functools import partial
 from typing import Any, Optional
 import random
 import json
@@ -97,6 +98,7 @@ from open_webui.utils.tools import (
     get_tools,
     get_updated_tool_function,
     has_tool_server_access,
+    run_tool_call,
 )
 from open_webui.utils.plugin import load_function_module_by_id
 from open_webui.utils.filter import (
@@ -120,6 +122,8 @@ from open_webui.env import (
     ENABLE_CHAT_RESPONSE_BASE64_IMAGE_URL_CONVERSION,
     CHAT_RESPONSE_STREAM_DELTA_CHUNK_SIZE,
     CHAT_RESPONSE_MAX_TOOL_CALL_RETRIES,
+    CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS,
+    CHAT_RESPONSE_TOOL_CALL_TIMEOUT,
     BYPASS_MODEL_ACCESS_CONTROL,
     ENABLE_REALTIME_CHAT_SAVE,
     ENABLE_QUERIES_CACHE,
@@ -1250,8 +1254,8 @@ async def chat_completion_files_handler(
                 request=request,
                 items=files,
                 queries=queries,
-                embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
-                    query, prefix=prefix, user=user
+                embedding_function=partial(
+                    request.app.state.EMBEDDING_FUNCTION, user=user
                 ),
                 k=request.app.state.config.TOP_K,
                 reranking_function=(
@@ -3231,9 +3235,14 @@ async def process_chat_response(
 
                     tools = metadata.get("tools", {})
 
-                    results = []
+                    # Independent tool calls in one turn run concurrently, bounded by
+                    # CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS. Each call is post-processed
+                    # as soon as it finishes; results keep the model's call order.
+                    tool_call_semaphore = asyncio.Semaphore(
+                        CHAT_RESPONSE_MAX_CONCURRENT_TOOL_CALLS
+                    )
 
-                    for tool_call in response_tool_calls:
+                    async def execute_tool_call(tool_call):
                         tool_call_id = tool_call.get("id", "")
                         tool_function_name = tool_call.get("function", {}).get(
                             "name", ""
@@ -3292,7 +3301,7 @@ async def process_chat_response(
                                 }
 
                                 if direct_tool:
-                                    tool_result = await event_caller(
+                                    tool_call_coroutine = event_caller(
                                         {
                                             "type": "execute:tool",
                                             "data": {
@@ -3318,10 +3327,18 @@ async def process_chat_response(
                                         },
                                     )
 
-                                    tool_result = await tool_function(
+                                    tool_call_coroutine = tool_function(
                                         **tool_function_params
                                     )
 
+                                tool_result = await run_tool_call(
+                                    tool_call_coroutine,
+                                    tool_call_semaphore,
+                                    CHAT_RESPONSE_TOOL_CALL_TIMEOUT,
+                                )
+
+                            except asyncio.TimeoutError:
+                                tool_result = f"Tool call timed out after {CHAT_RESPONSE_TOOL_CALL_TIMEOUT} seconds"
                             except Exception as e:
                                 tool_result = str(e)
 
@@ -3338,6 +3355,7 @@ async def process_chat_response(
                         )
 
                         # Extract citation sources from tool results
+                        citation_sources = []
                         if (
                             tool_function_name
                             in [
@@ -3354,26 +3372,35 @@ async def process_chat_response(
                                     tool_result=tool_result,
                                     tool_id=tool.get("tool_id", "") if tool else "",
                                 )
-                                tool_call_sources.extend(citation_sources)
                             except Exception as e:
                                 log.exception(f"Error extracting citation source: {e}")
 
-                        results.append(
-                            {
-                                "tool_call_id": tool_call_id,
-                                "content": tool_result or "",
-                                **(
-                                    {"files": tool_result_files}
-                                    if tool_result_files
-                                    else {}
-                                ),
-                                **(
-                                    {"embeds": tool_result_embeds}
-                                    if tool_result_embeds
-                                    else {}
-                                ),
-                            }
-                        )
+                        return citation_sources, {
+                            "tool_call_id": tool_call_id,
+                            "content": tool_result or "",
+                            **(
+                                {"files": tool_result_files}
+                                if tool_result_files
+                                else {}
+                            ),
+                            **(
+                                {"embeds": tool_result_embeds}
+                                if tool_result_embeds
+                                else {}
+                            ),
+                        }
+
+                    tool_call_outputs = await asyncio.gather(
+                        *[
+                            execute_tool_call(tool_call)
+                            for tool_call in response_tool_calls
+                        ]
+                    )
+
+                    results = []
+                    for citation_sources, result in tool_call_outputs:
+                        tool_call_sources.extend(citation_sources)
+                        results.append(result)
 
                     content_blocks[-1]["results"] = results
                     content_blocks.append(
@@ -3468,17 +3495,20 @@ async def process_chat_response(
 
                                         BLOCKED_MODULES = {CODE_INTERPRETER_BLOCKED_MODULES}
 
-                                        _real_import = builtins.__import__
-                                        def restricted_import(name, globals=None, locals=None, fromlist=(), level=0):
-                                            if name.split('.')[0] in BLOCKED_MODULES:
-                                                importer_name = globals.get('__name__') if globals else None
-                                                if importer_name == '__main__':
-                                                    raise ImportError(
-                                                        f"Direct import of module {{name}} is restricted."
-                                                    )
-                                            return _real_import(name, globals, locals, fromlist, level)
+                                        # Install once: a chat's Jupyter kernel keeps state between code blocks
+                                        if not getattr(builtins.__import__, "_restricted", False):
+                                            _real_import = builtins.__import__
+                                            def restricted_import(name, globals=None, locals=None, fromlist=(), level=0):
+                                                if name.split('.')[0] in BLOCKED_MODULES:
+                                                    importer_name = globals.get('__name__') if globals else None
+                                                    if importer_name == '__main__':
+                                                        raise ImportError(
+                                                            f"Direct import of module {{name}} is restricted."
+                                                        )
+                                                return _real_import(name, globals, locals, fromlist, level)
 
-                                        builtins.__import__ = restricted_import
+                                            restricted_import._restricted = True
+                                            builtins.__import__ = restricted_import
                                     """
                                     )
                                     code = blocking_code + "\n" + code
@@ -3519,6 +3549,8 @@ async def process_chat_response(
                                             else None
                                         ),
                                         request.app.state.config.CODE_INTERPRETER_JUPYTER_TIMEOUT,
+                                        chat_id=metadata.get("chat_id"),
+                                        user_id=user.id,
                                     )
                                 else:
                                     output = {
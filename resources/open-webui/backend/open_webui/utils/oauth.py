@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import copy
 import hashlib
@@ -13,6 +14,8 @@ import re
 import fnmatch
 import time
 import secrets
+import weakref
+from collections import OrderedDict
 from cryptography.fernet import Fernet
 from typing import Literal
 
@@ -28,7 +31,7 @@ from typing import Optional
 
 
 from open_webui.models.auths import Auths
-from open_webui.models.oauth_sessions import OAuthSessions
+from open_webui.models.oauth_sessions import OAuthSessions, OAuthSessionModel
 from open_webui.models.users import Users
 
 
@@ -69,6 +72,8 @@ from open_webui.env import (
     ENABLE_OAUTH_ID_TOKEN_COOKIE,
     ENABLE_OAUTH_EMAIL_FALLBACK,
     OAUTH_CLIENT_INFO_ENCRYPTION_KEY,
+    OAUTH_SESSION_CACHE_TTL,
+    REDIS_KEY_PREFIX,
 )
 from open_webui.utils.misc import parse_duration
 from open_webui.utils.auth import get_password_hash, create_token
@@ -165,6 +170,142 @@ def decrypt_data(data: str):
         raise
 
 
+# Tokens are refreshed once they are within this margin of expiring
+OAUTH_TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+OAUTH_REFRESH_LOCK_TIMEOUT = 30
+
+
+def is_token_expiring(session: OAuthSessionModel) -> bool:
+    return datetime.now() + OAUTH_TOKEN_REFRESH_MARGIN >= datetime.fromtimestamp(
+        session.expires_at
+    )
+
+
+class OAuthSessionCache:
+    """
+    Per-process LRU of decrypted OAuth sessions, so handing a token to a tool
+    or MCP call does not cost a database read and a Fernet decrypt.
+
+    Entries live for at most ``ttl`` seconds and are never served once the
+    token is within the refresh margin; the caller then goes to the database.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = OAUTH_SESSION_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    def get(self, key) -> Optional[OAuthSessionModel]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        cached_at, session = entry
+        if time.monotonic() - cached_at > self.ttl or is_token_expiring(session):
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return session
+
+    def set(self, key, session: OAuthSessionModel):
+        if self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic(), session)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, session_id: str):
+        for key, (_, session) in list(self._entries.items()):
+            if session.id == session_id:
+                del self._entries[key]
+
+
+OAUTH_SESSION_CACHE = OAuthSessionCache()
+
+# One in-process refresh per session; waiters reuse its result
+_REFRESH_LOCKS = weakref.WeakValueDictionary()
+
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+async def refresh_oauth_session(
+    session: OAuthSessionModel, perform_refresh, redis=None, force_refresh=False
+) -> Optional[OAuthSessionModel]:
+    """
+    Refresh a session's token at most once per expiry window.
+
+    Concurrent callers in this process share an asyncio lock, and workers
+    share a Redis lock, so only one of them calls the identity provider
+    (rotating refresh tokens are single use). Everyone else re-reads the
+    session and returns the token the winner stored. The session is deleted
+    only when the provider refresh itself fails.
+    """
+    lock = _REFRESH_LOCKS.get(session.id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _REFRESH_LOCKS[session.id] = lock
+
+    stale_access_token = session.token.get("access_token")
+
+    def is_refreshed(current) -> bool:
+        if force_refresh:
+            return current.token.get("access_token") != stale_access_token
+        return not is_token_expiring(current)
+
+    async with lock:
+        lock_key = f"{REDIS_KEY_PREFIX}:oauth:refresh:{session.id}"
+        lock_id = str(uuid.uuid4())
+        deadline = time.monotonic() + OAUTH_REFRESH_LOCK_TIMEOUT
+
+        while True:
+            current = OAuthSessions.get_session_by_id(session.id)
+            if current is None:
+                return None
+            if is_refreshed(current):
+                return current
+
+            if redis is None or await redis.set(
+                lock_key, lock_id, nx=True, ex=OAUTH_REFRESH_LOCK_TIMEOUT
+            ):
+                break
+
+            if time.monotonic() > deadline:
+                log.warning(f"Timed out waiting for token refresh of {session.id}")
+                return None
+            await asyncio.sleep(0.25)
+
+        try:
+            # Re-read under the lock: another worker may have just finished
+            current = OAuthSessions.get_session_by_id(session.id)
+            if current is None:
+                return None
+            if is_refreshed(current):
+                return current
+
+            refreshed_token = await perform_refresh(current)
+            if not refreshed_token:
+                log.warning(
+                    f"Token refresh failed for user {current.user_id}, provider {current.provider}, deleting session {current.id}"
+                )
+                OAuthSessions.delete_session_by_id(current.id)
+                OAUTH_SESSION_CACHE.invalidate(current.id)
+                return None
+
+            updated = OAuthSessions.update_session_by_id(current.id, refreshed_token)
+            log.info(f"Successfully refreshed token for session {current.id}")
+            return updated
+        finally:
+            if redis is not None:
+                await redis.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, lock_id)
+
+
 def _build_oauth_callback_error_message(e: Exception) -> str:
     """
     Produce a user-facing callback error string with actionable context.
@@ -671,7 +812,13 @@ class OAuthClientManager:
         Returns:
             dict: OAuth token data with access_token, or None if no valid token available
         """
+        cache_key = ("provider", client_id, user_id)
         try:
+            if not force_refresh:
+                session = OAUTH_SESSION_CACHE.get(cache_key)
+                if session:
+                    return session.token
+
             # Get the OAuth session
             session = OAuthSessions.get_session_by_provider_and_user_id(
                 client_id, user_id
@@ -682,52 +829,39 @@ class OAuthClientManager:
                 )
                 return None
 
-            if force_refresh or datetime.now() + timedelta(
-                minutes=5
-            ) >= datetime.fromtimestamp(session.expires_at):
+            if force_refresh or is_token_expiring(session):
                 log.debug(
                     f"Token refresh needed for user {user_id}, client_id {session.provider}"
                 )
-                refreshed_token = await self._refresh_token(session)
-                if refreshed_token:
-                    return refreshed_token
-                else:
-                    log.warning(
-                        f"Token refresh failed for user {user_id}, client_id {session.provider}, deleting session {session.id}"
-                    )
-                    OAuthSessions.delete_session_by_id(session.id)
+                session = await self._refresh_token(session, force_refresh)
+                if not session:
                     return None
+
+            OAUTH_SESSION_CACHE.set(cache_key, session)
             return session.token
 
         except Exception as e:
             log.error(f"Error getting OAuth token for user {user_id}: {e}")
             return None
 
-    async def _refresh_token(self, session) -> dict:
+    async def _refresh_token(self, session, force_refresh: bool = False):
         """
         Refresh an OAuth token if needed, with concurrency protection.
 
         Args:
             session: The OAuth session object
+            force_refresh: Refresh even if another caller's token is still valid
 
         Returns:
-            dict: Refreshed token data, or None if refresh failed
+            OAuthSessionModel: The refreshed session, or None if refresh failed
         """
         try:
-            # Perform the actual refresh
-            refreshed_token = await self._perform_token_refresh(session)
-
-            if refreshed_token:
-                # Update the session with new token data
-                session = OAuthSessions.update_session_by_id(
-                    session.id, refreshed_token
-                )
-                log.info(f"Successfully refreshed token for session {session.id}")
-                return session.token
-            else:
-                log.error(f"Failed to refresh token for session {session.id}")
-                return None
-
+            return await refresh_oauth_session(
+                session,
+                self._perform_token_refresh,
+                redis=getattr(self.app.state, "redis", None),
+                force_refresh=force_refresh,
+            )
         except Exception as e:
             log.error(f"Error refreshing token for session {session.id}: {e}")
             return None
@@ -881,6 +1015,7 @@ class OAuthClientManager:
                     for session in sessions:
                         if session.provider == client_id:
                             OAuthSessions.delete_session_by_id(session.id)
+                            OAUTH_SESSION_CACHE.invalidate(session.id)
 
                     session = OAuthSessions.create_session(
                         user_id=user_id,
@@ -966,7 +1101,13 @@ class OAuthManager:
         Returns:
             dict: OAuth token data with access_token, or None if no valid token available
         """
+        cache_key = ("session", session_id, user_id)
         try:
+            if not force_refresh:
+                session = OAUTH_SESSION_CACHE.get(cache_key)
+                if session:
+                    return session.token
+
             # Get the OAuth session
             session = OAuthSessions.get_session_by_id_and_user_id(session_id, user_id)
             if not session:
@@ -975,53 +1116,39 @@ class OAuthManager:
                 )
                 return None
 
-            if force_refresh or datetime.now() + timedelta(
-                minutes=5
-            ) >= datetime.fromtimestamp(session.expires_at):
+            if force_refresh or is_token_expiring(session):
                 log.debug(
                     f"Token refresh needed for user {user_id}, provider {session.provider}"
                 )
-                refreshed_token = await self._refresh_token(session)
-                if refreshed_token:
-                    return refreshed_token
-                else:
-                    log.warning(
-                        f"Token refresh failed for user {user_id}, provider {session.provider}, deleting session {session.id}"
-                    )
-                    OAuthSessions.delete_session_by_id(session.id)
-
+                session = await self._refresh_token(session, force_refresh)
+                if not session:
                     return None
+
+            OAUTH_SESSION_CACHE.set(cache_key, session)
             return session.token
 
         except Exception as e:
             log.error(f"Error getting OAuth token for user {user_id}: {e}")
             return None
 
-    async def _refresh_token(self, session) -> dict:
+    async def _refresh_token(self, session, force_refresh: bool = False):
         """
         Refresh an OAuth token if needed, with concurrency protection.
 
         Args:
             session: The OAuth session object
+            force_refresh: Refresh even if another caller's token is still valid
 
         Returns:
-            dict: Refreshed token data, or None if refresh failed
+            OAuthSessionModel: The refreshed session, or None if refresh failed
         """
         try:
-            # Perform the actual refresh
-            refreshed_token = await self._perform_token_refresh(session)
-
-            if refreshed_token:
-                # Update the session with new token data
-                session = OAuthSessions.update_session_by_id(
-                    session.id, refreshed_token
-                )
-                log.info(f"Successfully refreshed token for session {session.id}")
-                return session.token
-            else:
-                log.error(f"Failed to refresh token for session {session.id}")
-                return None
-
+            return await refresh_oauth_session(
+                session,
+                self._perform_token_refresh,
+                redis=getattr(self.app.state, "redis", None),
+                force_refresh=force_refresh,
+            )
         except Exception as e:
             log.error(f"Error refreshing token for session {session.id}: {e}")
             return None
@@ -1684,6 +1811,7 @@ class OAuthManager:
             for session in sessions:
                 if session.provider == provider:
                     OAuthSessions.delete_session_by_id(session.id, db=db)
+                    OAUTH_SESSION_CACHE.invalidate(session.id)
 
             session = OAuthSessions.create_session(
                 user_id=user.id,
@@ -1,7 +1,9 @@
 import os
 import re
+import hashlib
 import subprocess
 import sys
+import sysconfig
 from importlib import util
 import types
 import tempfile
@@ -293,6 +295,10 @@ def install_tool_and_function_dependencies():
     By first collecting all dependencies from the frontmatter of each tool and function,
     and then installing them using pip. Duplicates or similar version specifications are
     handled by pip as much as possible.
+
+    The installed requirement set is fingerprinted inside site-packages (so the
+    fingerprint disappears with the packages when the environment is rebuilt),
+    and restarts with unchanged tools and functions skip pip entirely.
     """
     function_list = Functions.get_functions(active_only=True)
     tool_list = Tools.get_tools()
@@ -310,6 +316,31 @@ def install_tool_and_function_dependencies():
                 if dependencies := frontmatter.get("requirements"):
                     all_dependencies += f"{dependencies}, "
 
-        install_frontmatter_requirements(all_dependencies.strip(", "))
+        requirements = all_dependencies.strip(", ")
+        fingerprint = hashlib.sha256(
+            "\n".join(
+                [sys.executable, *PIP_OPTIONS, *PIP_PACKAGE_INDEX_OPTIONS]
+                + sorted({req.strip() for req in requirements.split(",")})
+            ).encode()
+        ).hexdigest()
+        fingerprint_path = os.path.join(
+            sysconfig.get_paths()["purelib"], ".open_webui_requirements.sha256"
+        )
+
+        if os.path.exists(fingerprint_path):
+            with open(fingerprint_path) as f:
+                if f.read().strip() == fingerprint:
+                    log.info(
+                        "Tool and function requirements unchanged, skipping install."
+                    )
+                    return
+
+        install_frontmatter_requirements(requirements)
+        if not OFFLINE_MODE:
+            try:
+                with open(fingerprint_path, "w") as f:
+                    f.write(fingerprint)
+            except OSError as e:
+                log.debug(f"Could not record requirements fingerprint: {e}")
     except Exception as e:
         log.error(f"Error installing requirements: {e}")
@@ -1,16 +1,44 @@
+import hashlib
 import time
+from collections import OrderedDict
 from typing import Optional, Dict
+from redis.exceptions import NoScriptError
+
 from open_webui.env import REDIS_KEY_PREFIX
 
 
+# Increments the current bucket and sums the window in one atomic call.
+# KEYS are the window's buckets, newest first; ARGV[1] is the bucket TTL and
+# ARGV[2] is 1 to record a hit or 0 to only read the count.
+RATE_LIMIT_SCRIPT = """
+if ARGV[2] == "1" then
+    local attempts = redis.call("INCR", KEYS[1])
+    if attempts == 1 then
+        redis.call("EXPIRE", KEYS[1], tonumber(ARGV[1]))
+    end
+end
+local total = 0
+for _, count in ipairs(redis.call("MGET", unpack(KEYS))) do
+    if count then
+        total = total + tonumber(count)
+    end
+end
+return total
+"""
+RATE_LIMIT_SCRIPT_SHA = hashlib.sha1(RATE_LIMIT_SCRIPT.encode()).hexdigest()
+
+
 class RateLimiter:
     """
     General-purpose rate limiter using Redis with a rolling window strategy.
     Falls back to in-memory storage if Redis is not available.
-    """
 
-    # In-memory fallback storage
-    _memory_store: Dict[str, Dict[int, int]] = {}
+    Each check is a single server-side script call on the async Redis client,
+    by EVALSHA with an EVAL fallback so it also works through the Sentinel
+    proxy and after a failover to a master that has not loaded the script.
+    The in-memory fallback keeps at most ``max_memory_keys`` keys, evicting
+    the least recently used and any whose window has passed.
+    """
 
     def __init__(
         self,
@@ -19,13 +47,15 @@ class RateLimiter:
         window: int,
         bucket_size: int = 60,
         enabled: bool = True,
+        max_memory_keys: int = 10000,
     ):
         """
-        :param redis_client: Redis client instance or None
+        :param redis_client: Async Redis client instance or None
         :param limit: Max allowed events in the window
         :param window: Time window in seconds
         :param bucket_size: Bucket resolution
         :param enabled: Turn on/off rate limiting globally
+        :param max_memory_keys: Max keys kept by the in-memory fallback
         """
         self.r = redis_client
         self.limit = limit
@@ -33,9 +63,14 @@ class RateLimiter:
         self.bucket_size = bucket_size
         self.num_buckets = window // bucket_size
         self.enabled = enabled
+        self.max_memory_keys = max_memory_keys
+
+        # In-memory fallback storage, least recently used first
+        self._memory_store: "OrderedDict[str, Dict[int, int]]" = OrderedDict()
 
     def _bucket_key(self, key: str, bucket_index: int) -> str:
-        return f"{REDIS_KEY_PREFIX}:ratelimit:{key.lower()}:{bucket_index}"
+        # Hash tag keeps every bucket of a key in one cluster slot for the script
+        return f"{REDIS_KEY_PREFIX}:ratelimit:{{{key.lower()}}}:{bucket_index}"
 
     def _current_bucket(self) -> int:
         return int(time.time()) // self.bucket_size
@@ -43,7 +78,7 @@ class RateLimiter:
     def _redis_available(self) -> bool:
         return self.r is not None
 
-    def is_limited(self, key: str) -> bool:
+    async def is_limited(self, key: str) -> bool:
         """
         Main rate-limit check.
         Gracefully handles missing or failing Redis.
@@ -53,87 +88,89 @@ class RateLimiter:
 
         if self._redis_available():
             try:
-                return self._is_limited_redis(key)
+                return await self._is_limited_redis(key)
             except Exception:
                 return self._is_limited_memory(key)
         else:
             return self._is_limited_memory(key)
 
-    def get_count(self, key: str) -> int:
+    async def get_count(self, key: str) -> int:
         if not self.enabled:
             return 0
 
         if self._redis_available():
             try:
-                return self._get_count_redis(key)
+                return await self._get_count_redis(key)
             except Exception:
                 return self._get_count_memory(key)
         else:
             return self._get_count_memory(key)
 
-    def remaining(self, key: str) -> int:
-        used = self.get_count(key)
+    async def remaining(self, key: str) -> int:
+        used = await self.get_count(key)
         return max(0, self.limit - used)
 
-    def _is_limited_redis(self, key: str) -> bool:
+    async def _run_script(self, key: str, record: bool) -> int:
         now_bucket = self._current_bucket()
-        bucket_key = self._bucket_key(key, now_bucket)
-
-        attempts = self.r.incr(bucket_key)
-        if attempts == 1:
-            self.r.expire(bucket_key, self.window + self.bucket_size)
-
-        # Collect buckets
         buckets = [
             self._bucket_key(key, now_bucket - i) for i in range(self.num_buckets + 1)
         ]
+        args = [self.window + self.bucket_size, 1 if record else 0]
+        try:
+            total = await self.r.evalsha(
+                RATE_LIMIT_SCRIPT_SHA, len(buckets), *buckets, *args
+            )
+        except NoScriptError:
+            # EVAL caches the script, so later calls take the EVALSHA path
+            total = await self.r.eval(RATE_LIMIT_SCRIPT, len(buckets), *buckets, *args)
+        return int(total)
+
+    async def _is_limited_redis(self, key: str) -> bool:
+        return await self._run_script(key, record=True) > self.limit
+
+    async def _get_count_redis(self, key: str) -> int:
+        return await self._run_script(key, record=False)
+
+    def _get_memory_buckets(self, key: str, create: bool) -> Optional[Dict[int, int]]:
+        now_bucket = self._current_bucket()
+        min_bucket = now_bucket - self.num_buckets
 
-        counts = self.r.mget(buckets)
-        total = sum(int(c) for c in counts if c)
+        # Evict keys that were idle for a whole window, oldest first
+        while self._memory_store:
+            oldest_key, oldest = next(iter(self._memory_store.items()))
+            if oldest and max(oldest) >= min_bucket:
+                break
+            del self._memory_store[oldest_key]
+
+        store = self._memory_store.get(key)
+        if store is None:
+            if not create:
+                return None
+            store = self._memory_store[key] = {}
+            while len(self._memory_store) > self.max_memory_keys:
+                self._memory_store.popitem(last=False)
+        self._memory_store.move_to_end(key)
 
-        return total > self.limit
+        # Drop expired buckets
+        expired = [b for b in store if b < min_bucket]
+        for b in expired:
+            del store[b]
 
-    def _get_count_redis(self, key: str) -> int:
-        now_bucket = self._current_bucket()
-        buckets = [
-            self._bucket_key(key, now_bucket - i) for i in range(self.num_buckets + 1)
-        ]
-        counts = self.r.mget(buckets)
-        return sum(int(c) for c in counts if c)
+        return store
 
     def _is_limited_memory(self, key: str) -> bool:
-        now_bucket = self._current_bucket()
-
-        # Init storage
-        if key not in self._memory_store:
-            self._memory_store[key] = {}
-
-        store = self._memory_store[key]
+        store = self._get_memory_buckets(key, create=True)
 
         # Increment bucket
+        now_bucket = self._current_bucket()
         store[now_bucket] = store.get(now_bucket, 0) + 1
 
-        # Drop expired buckets
-        min_bucket = now_bucket - self.num_buckets
-        expired = [b for b in store if b < min_bucket]
-        for b in expired:
-            del store[b]
-
         # Count totals
         total = sum(store.values())
         return total > self.limit
 
     def _get_count_memory(self, key: str) -> int:
-        now_bucket = self._current_bucket()
-        if key not in self._memory_store:
+        store = self._get_memory_buckets(key, create=False)
+        if store is None:
             return 0
-
-        store = self._memory_store[key]
-        min_bucket = now_bucket - self.num_buckets
-
-        # Remove expired
-        expired = [b for b in store if b < min_bucket]
-        for b in expired:
-            del store[b]
-
         return sum(store.values())
@@ -35,7 +35,7 @@ from langchain_core.utils.function_calling import (
 
 
 from open_webui.utils.misc import is_string_allowed
-from open_webui.models.tools import Tools
+from open_webui.models.tools import Tools, get_user_valves_from_settings
 from open_webui.models.users import UserModel
 from open_webui.models.groups import Groups
 from open_webui.utils.plugin import load_tool_module_by_id
@@ -148,6 +148,77 @@ def has_tool_server_access(
     return has_access(user.id, "read", access_control, user_group_ids)
 
 
+# Prepared (normalized) specs per tool id, reused until the tool's version
+# changes. The version covers the row's updated_at (bumped by tool edits and
+# valve updates), the loaded module and the valves themselves, so a stale
+# entry is detected on any worker without explicit invalidation.
+PREPARED_TOOL_SPECS: dict[str, tuple[tuple, list[dict]]] = {}
+
+
+def get_tool_version(tool, module, valves: dict) -> tuple:
+    return (
+        tool.updated_at,
+        id(module),
+        json.dumps(valves, sort_keys=True, default=str),
+    )
+
+
+def prepare_tool_specs(tool_id: str, tool, module, version: tuple) -> list[dict]:
+    """
+    Normalize a tool's specs and parse function descriptions from docstrings.
+
+    Returns the cached result when the tool's version is unchanged.
+    """
+    cached = PREPARED_TOOL_SPECS.get(tool_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    specs = []
+    for spec in copy.deepcopy(tool.specs):
+        # TODO: Fix hack for OpenAI API
+        # Some times breaks OpenAI but others don't. Leaving the comment
+        for val in spec.get("parameters", {}).get("properties", {}).values():
+            if val.get("type") == "str":
+                val["type"] = "string"
+
+        # Remove internal reserved parameters (e.g. __id__, __user__)
+        spec["parameters"]["properties"] = {
+            key: val
+            for key, val in spec["parameters"]["properties"].items()
+            if not key.startswith("__")
+        }
+
+        # TODO: Support Pydantic models as parameters
+        function_name = spec["name"]
+        docstring = getattr(module, function_name).__doc__
+        if docstring and docstring.strip() != "":
+            s = re.split(":(param|return)", docstring, 1)
+            spec["description"] = s[0]
+        else:
+            spec["description"] = function_name
+
+        specs.append(spec)
+
+    PREPARED_TOOL_SPECS[tool_id] = (version, specs)
+    return specs
+
+
+def invalidate_tool_specs(tool_id: str):
+    """Drop the prepared specs for a tool so the next request rebuilds them."""
+    PREPARED_TOOL_SPECS.pop(tool_id, None)
+
+
+async def run_tool_call(
+    coroutine: Awaitable, semaphore: asyncio.Semaphore, timeout: Optional[float]
+):
+    """
+    Await one tool call of a turn, holding a slot of the turn's semaphore.
+    The timeout starts once the slot is acquired; raises asyncio.TimeoutError.
+    """
+    async with semaphore:
+        return await asyncio.wait_for(coroutine, timeout=timeout)
+
+
 async def get_tools(
     request: Request, tool_ids: list[str], user: UserModel, extra_params: dict
 ) -> dict[str, dict]:
@@ -157,8 +228,19 @@ async def get_tools(
     # Get user's group memberships for access control checks
     user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
 
+    # Load every requested tool (with valves) in one query; the user's valves
+    # ride along on the already-loaded user settings
+    tools_with_valves = Tools.get_tools_with_valves_by_ids(
+        [tool_id for tool_id in tool_ids if not tool_id.startswith("server:")]
+    )
+    user_valves = (
+        get_user_valves_from_settings(user.settings)
+        if user.settings is not None
+        else Tools.get_user_valves_by_user_id(user.id)
+    )
+
     for tool_id in tool_ids:
-        tool = Tools.get_tool_by_id(tool_id)
+        tool, valves = tools_with_valves.get(tool_id, (None, None))
         if tool:
             # Check access control for local tools
             if (
@@ -178,29 +260,18 @@ async def get_tools(
                 **extra_params["__user__"],
             }
 
-            # Set valves for the tool
-            if hasattr(module, "valves") and hasattr(module, "Valves"):
-                valves = Tools.get_tool_valves_by_id(tool_id) or {}
-                module.valves = module.Valves(**valves)
+            # Set valves for the tool (only when the tool, module or valves changed)
+            version = get_tool_version(tool, module, valves)
+            cached = PREPARED_TOOL_SPECS.get(tool_id)
+            if cached is None or cached[0] != version:
+                if hasattr(module, "valves") and hasattr(module, "Valves"):
+                    module.valves = module.Valves(**valves)
             if hasattr(module, "UserValves"):
                 __user__["valves"] = module.UserValves(  # type: ignore
-                    **Tools.get_user_valves_by_id_and_user_id(tool_id, user.id)
+                    **user_valves.get(tool_id, {})
                 )
 
-            for spec in tool.specs:
-                # TODO: Fix hack for OpenAI API
-                # Some times breaks OpenAI but others don't. Leaving the comment
-                for val in spec.get("parameters", {}).get("properties", {}).values():
-                    if val.get("type") == "str":
-                        val["type"] = "string"
-
-                # Remove internal reserved parameters (e.g. __id__, __user__)
-                spec["parameters"]["properties"] = {
-                    key: val
-                    for key, val in spec["parameters"]["properties"].items()
-                    if not key.startswith("__")
-                }
-
+            for spec in prepare_tool_specs(tool_id, tool, module, version):
                 # convert to function that takes only model params and inserts custom params
                 function_name = spec["name"]
                 tool_function = getattr(module, function_name)
@@ -213,17 +284,10 @@ async def get_tools(
                     },
                 )
 
-                # TODO: Support Pydantic models as parameters
-                if callable.__doc__ and callable.__doc__.strip() != "":
-                    s = re.split(":(param|return)", callable.__doc__, 1)
-                    spec["description"] = s[0]
-                else:
-                    spec["description"] = function_name
-
                 tool_dict = {
                     "tool_id": tool_id,
                     "callable": callable,
-                    "spec": spec,
+                    "spec": copy.deepcopy(spec),
                     # Misc info
                     "metadata": {
                         "file_handler": hasattr(module, "file_handler")
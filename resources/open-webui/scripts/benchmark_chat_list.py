@@ -0,0 +1,117 @@
+"""
+Benchmark listing chats for a user with many large chats, loading full chat
+rows versus the projection-only list queries used by the sidebar.
+
+Run from the backend directory; by default the chats are written to a
+throwaway SQLite database in a temporary DATA_DIR:
+
+    python ../scripts/benchmark_chat_list.py --chats 2000 --message-kb 200
+
+Set DATABASE_URL to benchmark against another database instead.
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+# Must be set before open_webui reads its environment
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="owui-bench-"))
+
+from open_webui.config import run_migrations
+from open_webui.internal.db import get_db
+from open_webui.models.chats import Chat, ChatModel, Chats
+
+
+def seed(user_id: str, chats: int, messages: int, message_kb: int):
+    content = "lorem ipsum " * (message_kb * 1024 // 12)
+    now = int(time.time())
+    with get_db() as db:
+        for i in range(chats):
+            history = {
+                str(m): {"id": str(m), "role": "user", "content": content}
+                for m in range(messages)
+            }
+            db.add(
+                Chat(
+                    id=str(uuid.uuid4()),
+                    user_id=user_id,
+                    title=f"Chat {i}",
+                    chat={
+                        "title": f"Chat {i}",
+                        "history": {"messages": history},
+                        "messages": list(history.values()),
+                    },
+                    created_at=now + i,
+                    updated_at=now + i,
+                    archived=False,
+                    pinned=False,
+                    meta={},
+                )
+            )
+        db.commit()
+
+
+def list_full_rows(user_id: str, limit: int):
+    # What the list endpoints did before: every column, including chat
+    with get_db() as db:
+        rows = (
+            db.query(Chat)
+            .filter_by(user_id=user_id, archived=False)
+            .order_by(Chat.updated_at.desc())
+            .limit(limit)
+            .all()
+        )
+        return [ChatModel.model_validate(row) for row in rows]
+
+
+def list_projection(user_id: str, limit: int):
+    return Chats.get_chat_list_by_user_id(user_id, limit=limit)
+
+
+def measure(fn, args) -> tuple[list[float], int]:
+    timings = []
+    peak = 0
+    for _ in range(args.runs):
+        tracemalloc.start()
+        start = time.perf_counter()
+        fn(args.user_id, args.limit)
+        timings.append(time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return timings, peak
+
+
+def report(name: str, timings: list[float], peak: int):
+    print(
+        f"{name:<16} runs={len(timings):<4} "
+        f"mean={statistics.mean(timings) * 1000:8.1f}ms "
+        f"median={statistics.median(timings) * 1000:8.1f}ms "
+        f"peak={peak / 1024 / 1024:8.1f}MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chats", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=10)
+    parser.add_argument("--message-kb", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    run_migrations()
+    args.user_id = f"benchmark-{uuid.uuid4().hex}"
+    seed(args.user_id, args.chats, args.messages, args.message_kb)
+    try:
+        report("full rows", *measure(list_full_rows, args))
+        report("projection", *measure(list_projection, args))
+    finally:
+        Chats.delete_chats_by_user_id(args.user_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark code interpreter executions against a Jupyter server, starting a
+fresh kernel per execution versus the warm kernel pool.
+
+Start a local server first, e.g.:
+
+    jupyter server --ServerApp.token=bench --port 8888
+
+then run from the backend directory:
+
+    python ../scripts/benchmark_jupyter_kernel_pool.py --url http://localhost:8888 --token bench
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from open_webui.utils.code_interpreter import (
+    JupyterCodeExecuter,
+    JupyterKernelPool,
+)
+
+
+async def run_fresh(args) -> list[float]:
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        async with JupyterCodeExecuter(
+            args.url, args.code, args.token, args.password, args.timeout
+        ) as executor:
+            result = await executor.run()
+        timings.append(time.perf_counter() - start)
+        assert not result.stderr, result.stderr
+    return timings
+
+
+async def run_pooled(args, chat_id=None) -> list[float]:
+    pool = JupyterKernelPool(
+        args.url, args.token, args.password, max_size=args.pool_size, min_idle=1
+    )
+    # Let the pool pre-start its spare kernels, as it would between requests
+    await pool._replenish()
+
+    timings = []
+    try:
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            result = await pool.execute(args.code, args.timeout, chat_id=chat_id)
+            timings.append(time.perf_counter() - start)
+            assert not result.stderr, result.stderr
+            # Anonymous executions recycle their kernel; give the pool time to
+            # replace it so each run measures a warm start
+            while pool._tasks:
+                await asyncio.gather(*pool._tasks)
+    finally:
+        await pool.close()
+    return timings
+
+
+def report(name: str, timings: list[float]):
+    print(
+        f"{name:<24} runs={len(timings):<4} "
+        f"mean={statistics.mean(timings) * 1000:8.1f}ms "
+        f"median={statistics.median(timings) * 1000:8.1f}ms "
+        f"max={max(timings) * 1000:8.1f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:8888")
+    parser.add_argument("--token", default="")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--code", default="print(sum(range(1000)))")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--timeout", type=int, default=60)
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    report("fresh kernel", await run_fresh(args))
+    report("pooled (recycled)", await run_pooled(args))
+    report("pooled (chat affinity)", await run_pooled(args, chat_id="benchmark"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
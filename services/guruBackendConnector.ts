@@ -103,6 +103,39 @@ export interface GuideResponse {
   nextPrompt: string;
 }
 
+export interface RetrievalPipelineRequest {
+  userId: string;
+  query: string;
+  domain?: string;
+  enableWebSearch?: boolean;
+}
+
+export interface RetrievalPipelineResponse {
+  status: "success" | "gated" | "error";
+  query: string;
+  sourceCount: number;
+  documentsRetrieved: number;
+  coursesRetrieved: number;
+  isGrounded: boolean;
+  groundingConfidence: number;
+  synthesisStrategy?: string;
+  contradictions?: string[];
+  guidedQuestion?: string;
+  nextAction: "respond" | "ask" | "refuse";
+  degradedStages?: string[];
+}
+
+export type RetrievalStage =
+  | "discovery"
+  | "user_context"
+  | "retrieval"
+  | "grounding"
+  | "synthesis";
+
+export type RetrievalStreamEvent =
+  | { event: "stage"; data: { stage: RetrievalStage; [key: string]: any } }
+  | { event: "complete"; data: RetrievalPipelineResponse };
+
 /**
  * Guru Backend Connector
  */
@@ -205,6 +238,63 @@ export class GuruBackendConnector {
     );
   }
 
+  /**
+   * Run the retrieval pipeline, calling onEvent as each agent stage finishes.
+   * Resolves with the final output (same shape as /retrieval/execute).
+   */
+  async streamRetrievalPipeline(
+    request: RetrievalPipelineRequest,
+    onEvent: (event: RetrievalStreamEvent) => void
+  ): Promise<RetrievalPipelineResponse | null> {
+    const res = await fetch(
+      `${this.baseURL}/api/guru/retrieval/execute/stream`,
+      {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+          Accept: "text/event-stream",
+        },
+        body: JSON.stringify(request),
+      }
+    );
+    if (!res.ok || !res.body) {
+      const text = await res.text().catch(() => "");
+      throw new Error(`Guru backend error ${res.status}: ${text}`);
+    }
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let output: RetrievalPipelineResponse | null = null;
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      // SSE frames are separated by a blank line
+      let boundary = buffer.indexOf("\n\n");
+      while (boundary !== -1) {
+        const frame = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf("\n\n");
+
+        let eventName = "message";
+        let data = "";
+        for (const line of frame.split("\n")) {
+          if (line.startsWith("event:")) eventName = line.slice(6).trim();
+          else if (line.startsWith("data:")) data += line.slice(5).trim();
+        }
+        if (!data) continue;
+
+        const event = { event: eventName, data: JSON.parse(data) } as RetrievalStreamEvent;
+        if (event.event === "complete") output = event.data;
+        onEvent(event);
+      }
+    }
+    return output;
+  }
+
   async listDiagnosticDomains(): Promise<any> {
     return await openWebUIAdapter.fetchJson(
       `${this.baseURL}/api/guru/retrieval/domains`,